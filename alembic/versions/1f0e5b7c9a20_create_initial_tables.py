@@ -0,0 +1,94 @@
+"""create initial tables
+
+Revision ID: 1f0e5b7c9a20
+Revises:
+Create Date: 2026-10-17 09:05:31.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f0e5b7c9a20'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [sa.Column('created_at', sa.DateTime(), nullable=True), sa.Column('updated_at', sa.DateTime(), nullable=True)]
+
+
+def upgrade() -> None:
+    # The schema the application created with create_all before migrations were tracked.
+    # Databases created that way already have these tables, which are then left alone.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'kanban_boards' not in existing:
+        op.create_table(
+            'kanban_boards',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            *_timestamps(),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'kanban_statuses' not in existing:
+        op.create_table(
+            'kanban_statuses',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('board_id', sa.Integer(), nullable=False),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(['board_id'], ['kanban_boards.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'projects' not in existing:
+        op.create_table(
+            'projects',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('kanban_board_id', sa.Integer(), nullable=False),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(['kanban_board_id'], ['kanban_boards.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'tickets' not in existing:
+        op.create_table(
+            'tickets',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('priority', sa.String(length=50), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            *_timestamps(),
+            sa.Column('kanban_status_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['kanban_status_id'], ['kanban_statuses.id']),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'history' not in existing:
+        op.create_table(
+            'history',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('entity_type', sa.String(length=50), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('change_type', sa.String(length=50), nullable=False),
+            sa.Column('timestamp', sa.DateTime(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('details', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('history')
+    op.drop_table('tickets')
+    op.drop_table('projects')
+    op.drop_table('kanban_statuses')
+    op.drop_table('kanban_boards')
@@ -0,0 +1,42 @@
+"""add ticket search index
+
+Revision ID: 3b9f0c2d7a41
+Revises: 786d2c881896
+Create Date: 2026-10-17 14:40:02.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db_models.base import TICKET_SEARCH_POSTGRES_DDL, TICKET_SEARCH_SQLITE_DDL, TICKET_SEARCH_TABLE
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f0c2d7a41'
+down_revision: Union[str, None] = '786d2c881896'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in TICKET_SEARCH_SQLITE_DDL:
+            op.execute(statement)
+        # Index the tickets that existed before the triggers
+        op.execute(f"INSERT INTO {TICKET_SEARCH_TABLE}({TICKET_SEARCH_TABLE}) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in TICKET_SEARCH_POSTGRES_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('tickets_fts_ai', 'tickets_fts_ad', 'tickets_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {TICKET_SEARCH_TABLE}")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_tickets_search', table_name='tickets', if_exists=True)
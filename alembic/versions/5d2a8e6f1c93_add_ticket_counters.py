@@ -0,0 +1,39 @@
+"""add ticket counters
+
+Revision ID: 5d2a8e6f1c93
+Revises: 9c4e1a7b2f58
+Create Date: 2026-10-17 15:31:12.640198
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8e6f1c93'
+down_revision: Union[str, None] = '9c4e1a7b2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('ticket_counters'):
+        op.create_table(
+            'ticket_counters',
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('kanban_status_id', sa.Integer(), nullable=False),
+            sa.Column('ticket_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('project_id', 'kanban_status_id'),
+        )
+    # Count the tickets that existed before the counters
+    op.execute("DELETE FROM ticket_counters")
+    op.execute(
+        "INSERT INTO ticket_counters (project_id, kanban_status_id, ticket_count) "
+        "SELECT project_id, kanban_status_id, count(*) FROM tickets GROUP BY project_id, kanban_status_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ticket_counters')
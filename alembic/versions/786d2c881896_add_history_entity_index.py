@@ -0,0 +1,32 @@
+"""add history entity index
+
+Revision ID: 786d2c881896
+Revises: 1f0e5b7c9a20
+Create Date: 2026-10-17 09:12:44.512208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '786d2c881896'
+down_revision: Union[str, None] = '1f0e5b7c9a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_history_entity_timestamp',
+        'history',
+        ['entity_type', 'entity_id', 'timestamp', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_history_entity_timestamp', table_name='history', if_exists=True)
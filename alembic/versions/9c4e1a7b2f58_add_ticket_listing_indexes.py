@@ -0,0 +1,37 @@
+"""add ticket listing indexes
+
+Revision ID: 9c4e1a7b2f58
+Revises: 3b9f0c2d7a41
+Create Date: 2026-10-17 15:02:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1a7b2f58'
+down_revision: Union[str, None] = '3b9f0c2d7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_tickets_project_id': ['project_id', 'id'],
+    'ix_tickets_project_kanban_status': ['project_id', 'kanban_status_id', 'id'],
+    'ix_tickets_kanban_status': ['kanban_status_id', 'id'],
+    'ix_tickets_status': ['status', 'id'],
+    'ix_tickets_priority': ['priority', 'id'],
+    'ix_tickets_updated_at': ['updated_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'tickets', columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name='tickets', if_exists=True)
@@ -0,0 +1,50 @@
+"""add history archive
+
+Revision ID: a4c7d93e5b10
+Revises: e81f4b6a2c07
+Create Date: 2026-10-17 18:20:07.552931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import get_app_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7d93e5b10'
+down_revision: Union[str, None] = 'e81f4b6a2c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # With HISTORY_ARCHIVE_PATH set, the archive lives in its own SQLite file and is created
+    # there at startup instead (app.db_models.schema); a table in the main database would hide it
+    if get_app_settings().history_archive_path:
+        return
+    if not sa.inspect(op.get_bind()).has_table('history_archive'):
+        op.create_table(
+            'history_archive',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('entity_type', sa.String(length=50), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('change_type', sa.String(length=50), nullable=False),
+            sa.Column('timestamp', sa.DateTime(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('details', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_history_archive_entity_timestamp', 'history_archive',
+                    ['entity_type', 'entity_id', 'timestamp', 'id'], if_not_exists=True)
+    op.create_index('ix_history_archive_timestamp', 'history_archive', ['timestamp'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('history_archive'):
+        return
+    op.drop_index('ix_history_archive_timestamp', table_name='history_archive')
+    op.drop_index('ix_history_archive_entity_timestamp', table_name='history_archive')
+    op.drop_table('history_archive')
@@ -0,0 +1,33 @@
+"""add collection versions
+
+Revision ID: c6b2e9d4f317
+Revises: a4c7d93e5b10
+Create Date: 2026-10-17 21:14:03.527190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6b2e9d4f317'
+down_revision: Union[str, None] = 'a4c7d93e5b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('collection_versions'):
+        op.create_table(
+            'collection_versions',
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('name'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
@@ -0,0 +1,34 @@
+"""add import checkpoints
+
+Revision ID: e81f4b6a2c07
+Revises: 5d2a8e6f1c93
+Create Date: 2026-10-17 17:02:45.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f4b6a2c07'
+down_revision: Union[str, None] = '5d2a8e6f1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('import_checkpoints'):
+        op.create_table(
+            'import_checkpoints',
+            sa.Column('job', sa.String(length=255), nullable=False),
+            sa.Column('entity_type', sa.String(length=50), nullable=False),
+            sa.Column('rows_committed', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('job'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('import_checkpoints')
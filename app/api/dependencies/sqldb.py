@@ -1,10 +1,29 @@
-from app.db_models.session import SessionLocal
+from typing import AsyncIterator
+from app.core.config import get_app_settings
+from app.core.metrics import metrics
+from app.db_models.session import AnySession, AsyncSessionLocal, SessionLocal
 
 
 # Dependency to get DB Session
-def get_db():
-    db = SessionLocal()
+async def get_db() -> AsyncIterator[AnySession]:
+    """
+    Yield an AsyncSession when async_database is enabled, otherwise a sync Session.
+
+    Routes wrap either kind in the Async*CRUD classes, which run sync sessions in a worker thread.
+    """
+    count = get_app_settings().metrics_enabled
+    if count:
+        metrics.session_opened()
     try:
-        yield db
+        if AsyncSessionLocal is not None:
+            async with AsyncSessionLocal() as db:
+                yield db
+            return
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
     finally:
-        db.close()
+        if count:
+            metrics.session_closed()
@@ -0,0 +1,70 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values that identify a representation.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def entity_etag(item: Any) -> str:
+    """
+    ETag of a single row, which changes whenever the row is updated.
+    """
+    return make_etag(type(item).__name__, item.id, item.updated_at)
+
+
+def collection_etag(request: Request, version: Any) -> str:
+    """
+    ETag of a list response, from the collection version and the page requested.
+    """
+    return make_etag(request.url.path, str(request.query_params), *version)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match or If-Match header value lists the ETag.
+
+    Tags are compared weakly (ignoring the W/ prefix) for both headers, since every
+    ETag this API issues is weak.
+    """
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client already holds this representation.
+
+    Routes return it as is, so the response model is never built for an unchanged row.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={ETAG_HEADER: etag})
+    return None
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """
+    Reject a write made against a stale representation.
+
+    :raises HTTPException: 412 if an If-Match header does not list the current ETag.
+    """
+    header = request.headers.get("if-match")
+    if header is not None and not etag_matches(header, etag):
+        raise HTTPException(status_code=412, detail="Precondition Failed: resource has been modified")
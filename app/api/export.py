@@ -0,0 +1,16 @@
+from starlette.responses import StreamingResponse
+from sqlalchemy import Select
+from app.db_models.session import AnySession
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_rows
+
+
+def streaming_export(db: AnySession, query: Select, name: str, fmt: str = "ndjson", compress: bool = False) -> StreamingResponse:
+    """
+    Stream the rows of a query as a downloadable NDJSON or CSV file.
+
+    With compress, the body is gzipped on the fly and sent with `Content-Encoding: gzip`.
+    """
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(export_rows(db, query, fmt, compress), media_type=EXPORT_MEDIA_TYPES[fmt], headers=headers)
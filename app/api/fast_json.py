@@ -0,0 +1,92 @@
+import datetime
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Type, Union
+from pydantic import BaseModel
+from starlette.responses import Response
+from app.core.config import get_app_settings
+
+try:
+    import orjson
+except ImportError:  # listed in requirements.txt; the stdlib encoder is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_fallback_logged = False
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact JSON, with orjson when it is installed.
+    """
+    global _fallback_logged
+    if orjson is not None:
+        # UTC datetimes end in "Z", as pydantic writes them
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    if not _fallback_logged:
+        _fallback_logged = True
+        logger.warning("orjson is not installed: fast JSON responses use the slower standard library encoder")
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class ListSerializer:
+    """
+    Turn ORM rows into the JSON-ready dicts of a flat response schema.
+
+    The field names of the schema are read once; rows are then read field by field,
+    without the validation FastAPI runs on response models. Rows come from the database
+    with the column types the schema declares, so the output matches the validated one.
+    """
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+
+    def to_dicts(self, items: Sequence[Any]) -> List[Dict[str, Any]]:
+        fields = self.fields
+        rows = []
+        for item in items:
+            # Loaded column values sit in the instance dict; reading them there skips the
+            # instrumented attributes, which cost most of the time. Others (e.g. expired) use getattr.
+            values = getattr(item, "__dict__", {})
+            rows.append({field: values[field] if field in values else getattr(item, field) for field in fields})
+        return rows
+
+
+@lru_cache(maxsize=None)
+def list_serializer(schema: Type[BaseModel]) -> ListSerializer:
+    return ListSerializer(schema)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_list_response(items: Sequence[Any], schema: Type[BaseModel], response: Response) -> FastJSONResponse:
+    """
+    Build the JSON response of a page of rows directly, keeping the headers set on response.
+    """
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return FastJSONResponse(list_serializer(schema).to_dicts(items), headers=headers)
+
+
+def list_response(items: Sequence[Any], schema: Type[BaseModel], response: Response) -> Union[Sequence[Any], FastJSONResponse]:
+    """
+    Return a page of rows from a list route.
+
+    With the fast_json_responses setting, the page is encoded by fast_list_response;
+    otherwise the rows are returned for FastAPI to validate against the response model.
+    """
+    if get_app_settings().fast_json_responses:
+        return fast_list_response(items, schema, response)
+    return items
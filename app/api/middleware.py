@@ -0,0 +1,126 @@
+import logging
+import re
+import time
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.logging import request_id_var, request_scope_var
+from app.core.metrics import Metrics
+from app.db_models.query_stats import QueryStats, query_stats_var
+
+logger = logging.getLogger(__name__)
+
+# Response headers of the statement count and time of a request, in debug mode
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time"
+
+# Incoming correlation ids are reused only if they look like one
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestContextMiddleware:
+    """
+    Give each request a correlation id, reused from the request header when the client or
+    a proxy sent one, and echo it in the response.
+
+    The id and the request scope are kept in context variables for the log patcher and the
+    request log sampler. A plain ASGI middleware, so streamed responses are not buffered.
+    """
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID"):
+        self.app = app
+        self.header_name = header_name
+        self.scope_header = header_name.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = next((value.decode("latin-1") for key, value in scope["headers"] if key == self.scope_header), None)
+        if request_id is None or not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
+        request_id_token = request_id_var.set(request_id)
+        scope_token = request_scope_var.set(scope)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_scope_var.reset(scope_token)
+            request_id_var.reset(request_id_token)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency of each request by method, route and status, and the requests in flight.
+
+    Requests are labelled with the path template of the matched route (e.g.
+    "/api/tickets/{id}"), or "unmatched", so ids in paths do not create series. An error
+    raised before the response started counts as a 500.
+    """
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe_request(scope["method"], route.path if route is not None else "unmatched", status, duration)
+
+
+class QueryStatsMiddleware:
+    """
+    Collect the SQL statements run while serving each request, and log the N+1 suspects:
+    SQL run at least n_plus_one_threshold times by one request.
+
+    With headers, the statement count and time so far are added to the response.
+    Statements run while the body streams are logged but not in the headers.
+    """
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5, headers: bool = False):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.headers = headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+
+        async def send_with_query_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+                headers[QUERY_TIME_HEADER] = f"{stats.duration * 1000:.2f}"
+            await send(message)
+
+        token = query_stats_var.set(stats)
+        try:
+            await self.app(scope, receive, send_with_query_stats if self.headers else send)
+        finally:
+            query_stats_var.reset(token)
+            route = scope.get("route")
+            for statement, count in stats.repeated(self.n_plus_one_threshold):
+                logger.warning("Possible N+1 in %s %s: statement run %d times: %s", scope["method"],
+                               route.path if route is not None else scope["path"], count, statement)
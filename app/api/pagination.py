@@ -0,0 +1,29 @@
+from typing import Any, Callable, Optional, Sequence
+from starlette.responses import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+def set_cursor_headers(response: Response, next_cursor: Optional[str] = None, prev_cursor: Optional[str] = None) -> None:
+    """
+    Expose keyset pagination cursors as response headers, so list bodies keep their shape.
+    """
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if prev_cursor is not None:
+        response.headers[PREV_CURSOR_HEADER] = prev_cursor
+
+
+def set_page_cursor_headers(response: Response, items: Sequence[Any], limit: int, cursor_for: Callable[[Any], str],
+                            with_prev: bool = False) -> None:
+    """
+    Set the cursors of the pages around a page of items.
+
+    A next cursor is only emitted for a full page, since a short page is the last one. The
+    previous cursor is only emitted with with_prev, for the routes that can page backwards.
+    """
+    if not items:
+        return
+    next_cursor = cursor_for(items[-1]) if len(items) == limit else None
+    set_cursor_headers(response, next_cursor, cursor_for(items[0]) if with_prev else None)
@@ -6,6 +6,7 @@ from app.api.routes import tickets
 from app.api.routes import kanbanboard
 from app.api.routes import kanbanstatus
 from app.api.routes import history
+from app.api.routes import imports
 
 
 router = APIRouter()
@@ -16,3 +17,4 @@ router.include_router(tickets.router, prefix="/tickets", tags=["tickets"])
 router.include_router(kanbanboard.router, prefix="/kanbanboard", tags=["kanbanboard"])
 router.include_router(kanbanstatus.router, prefix="/kanbanstatus", tags=["kanbanstatus"])
 router.include_router(history.router, prefix="/history", tags=["history"])
+router.include_router(imports.router, prefix="/import", tags=["import"])
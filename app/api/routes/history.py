@@ -1,46 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Literal, Optional
 from app.db_models.crud.history_crud import HistoryCRUD
-from app.schemas.history import HistoryCreate, HistoryResponse
+from app.db_models.crud import AsyncHistoryCRUD
+from app.db_models.session import AnySession
+from app.db_models.crud.history_writer import get_history_writer
+from app.schemas.history import HistoryCreate, HistoryResponse, HistoryWriterStats
 from app.api.dependencies import get_db
+from app.api.pagination import set_page_cursor_headers
+from app.api.export import streaming_export
+from app.api.fast_json import list_response
 
 router = APIRouter()
 
 @router.post("/", response_model=HistoryResponse, status_code=201)
-def create_history_entry(history: HistoryCreate, user_id: int = 1, db: Session = Depends(get_db)) -> HistoryResponse:
+async def create_history_entry(history: HistoryCreate, user_id: int = 1, db: AnySession = Depends(get_db)) -> HistoryResponse:
     """
     Create a new history entry.
     """
-    history_crud = HistoryCRUD(db)
-    return history_crud.create(**history.model_dump(), user_id=user_id)
+    history_crud = AsyncHistoryCRUD(db)
+    return await history_crud.create(**history.model_dump(), user_id=user_id)
+
+@router.get("/export")
+async def export_history(fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"), since: Optional[datetime] = None,
+                         entity_type: Optional[str] = None, gzip: bool = False, db: AnySession = Depends(get_db)):
+    """
+    Stream history entries as NDJSON or CSV, in constant memory, oldest first.
+
+    - **format**: `ndjson` (default) or `csv`.
+    - **since**: Only export the entries recorded at or after this time.
+    - **entity_type**: Only export the entries of this entity type.
+    - **gzip**: Compress the body on the fly (`Content-Encoding: gzip`).
+    """
+    return streaming_export(db, HistoryCRUD.export_query(since, entity_type), "history", fmt, gzip)
+
+@router.get("/writer", response_model=HistoryWriterStats)
+async def get_history_writer_stats() -> HistoryWriterStats:
+    """
+    Get the counters of the history write-behind writer, including its lag.
+    """
+    writer = get_history_writer()
+    if writer is None:
+        return HistoryWriterStats(enabled=False)
+    return HistoryWriterStats(enabled=True, **writer.stats())
 
 @router.get("/{entity_type}/{entity_id}", response_model=List[HistoryResponse])
-def get_history_by_entity(entity_type: str, entity_id: int, skip: int = 0, limit: int = 10, db: Session = Depends(get_db)) -> List[HistoryResponse]:
+async def get_history_by_entity(entity_type: str, entity_id: int, response: Response, skip: int = 0, limit: int = 10,
+                                after: Optional[str] = None, before: Optional[str] = None,
+                                db: AnySession = Depends(get_db)) -> List[HistoryResponse]:
     """
-    Get history entries by entity ID.
+    Get history entries by entity ID, newest first.
+
+    Pass the `X-Next-Cursor` response header as `before` to fetch the next (older) page,
+    or `X-Prev-Cursor` as `after` to fetch the previous (newer) page.
     """
-    history_crud = HistoryCRUD(db)
-    return history_crud.get_by_entity_id(entity_type, entity_id, skip, limit)
+    history_crud = AsyncHistoryCRUD(db)
+    try:
+        entries = await history_crud.get_by_entity_id(entity_type, entity_id, skip, limit, after=after, before=before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_cursor_headers(response, entries, limit, HistoryCRUD.cursor_for, with_prev=True)
+    return list_response(entries, HistoryResponse, response)
 
 @router.put("/{id}", response_model=HistoryResponse)
-def update_history_entry(id: int, history: HistoryCreate, db: Session = Depends(get_db)) -> HistoryResponse:
+async def update_history_entry(id: int, history: HistoryCreate, db: AnySession = Depends(get_db)) -> HistoryResponse:
     """
     Update an existing history entry.
     """
-    history_crud = HistoryCRUD(db)
-    updated_entry = history_crud.update(id, **history.model_dump())
+    history_crud = AsyncHistoryCRUD(db)
+    updated_entry = await history_crud.update(id, **history.model_dump())
     if not updated_entry:
         raise HTTPException(status_code=404, detail="History entry not found")
     return updated_entry
 
 @router.delete("/{id}", response_model=HistoryResponse)
-def delete_history_entry(id: int, db: Session = Depends(get_db)) -> HistoryResponse:
+async def delete_history_entry(id: int, db: AnySession = Depends(get_db)) -> HistoryResponse:
     """
     Delete a history entry.
     """
-    history_crud = HistoryCRUD(db)
-    deleted_entry = history_crud.delete(id)
+    history_crud = AsyncHistoryCRUD(db)
+    deleted_entry = await history_crud.delete(id)
     if not deleted_entry:
         raise HTTPException(status_code=404, detail="History entry not found")
     return deleted_entry
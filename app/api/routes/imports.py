@@ -0,0 +1,52 @@
+# Bulk Import Endpoints
+import tempfile
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Literal, Optional
+from loguru import logger
+from app.db_models.crud import AsyncImportCRUD
+from app.db_models.session import AnySession
+from app.schemas.imports import ImportJob, ImportResult
+from app.api.dependencies.sqldb import get_db
+from app.services.import_service import IMPORT_CHUNK_SIZE, ImportFailed, import_upload
+
+router = APIRouter()
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_SIZE = 1024 * 1024
+
+@router.post("/{entity}", response_model=ImportResult)
+async def import_entities(entity: Literal["projects", "tickets", "history"], request: Request,
+                          fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+                          chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10000), job: Optional[str] = None,
+                          skip: int = Query(0, ge=0), db: AnySession = Depends(get_db)) -> ImportResult:
+    """
+    Import projects, tickets or history entries from the NDJSON or CSV request body.
+
+    Rows are validated and committed `chunk_size` at a time. On a bad row the response is a
+    400 whose detail gives the `line` and the number of `rows_committed`; send the file again
+    with the same `job` (or with `skip` set to `rows_committed`) to resume after them.
+
+    - **format**: `ndjson` (default) or `csv`.
+    - **chunk_size**: Rows committed at a time.
+    - **job**: Name under which progress is checkpointed; a rerun resumes from it.
+    - **skip**: Leading rows to skip, for imports without a job.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as upload:
+        async for data in request.stream():
+            upload.write(data)
+        upload.seek(0)
+        try:
+            return await import_upload(db, entity, upload, fmt=fmt, chunk_size=chunk_size, job=job, skip=skip)
+        except ImportFailed as e:
+            logger.warning("Import of {} stopped at line {}: {}", entity, e.line, e)
+            raise HTTPException(status_code=400, detail={"message": str(e), "line": e.line, "rows_committed": e.rows_committed})
+
+@router.get("/jobs/{job}", response_model=ImportJob)
+async def get_import_job(job: str, db: AnySession = Depends(get_db)) -> ImportJob:
+    """
+    Get the progress of an import job: the number of rows committed so far.
+    """
+    checkpoint = await AsyncImportCRUD(db).get_checkpoint(job)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return checkpoint
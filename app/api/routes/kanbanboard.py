@@ -1,45 +1,90 @@
 from fastapi import APIRouter, HTTPException
-from sqlalchemy.orm import Session
-from fastapi import Depends
+from fastapi import Depends, Query, Request, Response
 
-from app.db_models.crud import KanbanBoardCRUD, KanbanStatusCRUD
-from app.api_models.kanbanboard import KanbanBoardCreate, KanbanBoardResponse
+from app.db_models.crud import AsyncKanbanBoardCRUD, AsyncTicketCounterCRUD
+from app.db_models.session import AnySession
+from app.api_models.kanbanboard import KanbanBoardCreate, KanbanBoardResponse, KanbanBoardView
+from app.schemas.stats import KanbanBoardStats
 from app.api.dependencies.sqldb import get_db
+from app.api.etag import ETAG_HEADER, check_if_match, collection_etag, entity_etag, not_modified
+from app.api.fast_json import list_response
 
 
 router = APIRouter()
 
 
 @router.post("/", status_code=201, response_model=KanbanBoardResponse)
-def create_kanban_board(kanban_board: KanbanBoardCreate, db: Session = Depends(get_db)):
-    kanban_board_crud = KanbanBoardCRUD(db)
-    return kanban_board_crud.create(**kanban_board.model_dump())
+async def create_kanban_board(kanban_board: KanbanBoardCreate, db: AnySession = Depends(get_db)):
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    return await kanban_board_crud.create(**kanban_board.model_dump())
 
 
 @router.get("/", status_code=200, response_model=list[KanbanBoardResponse])
-def get_all_kanban_boards(db: Session = Depends(get_db)):
-    kanban_board_crud = KanbanBoardCRUD(db)
-    return kanban_board_crud.get_all()
+async def get_all_kanban_boards(request: Request, response: Response, db: AnySession = Depends(get_db)):
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    etag = collection_etag(request, await kanban_board_crud.version())
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers[ETAG_HEADER] = etag
+    return list_response(await kanban_board_crud.get_all(), KanbanBoardResponse, response)
 
 
 @router.get("/{id}", status_code=200, response_model=KanbanBoardResponse)
-def get_kanban_board(id: int, db: Session = Depends(get_db)):
-    kanban_board_crud = KanbanBoardCRUD(db)
-    kanban_board = kanban_board_crud.get(id)
+async def get_kanban_board(id: int, request: Request, response: Response, db: AnySession = Depends(get_db)):
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    kanban_board = await kanban_board_crud.get(id)
     if not kanban_board:
         raise HTTPException(status_code=404, detail=f"Kanban Board with id {id} not found")
+    etag = entity_etag(kanban_board)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers[ETAG_HEADER] = etag
     return kanban_board
 
 
+@router.get("/{id}/view", status_code=200, response_model=KanbanBoardView)
+async def get_kanban_board_view(id: int, tickets_per_column: int = Query(20, ge=1, le=200),
+                                db: AnySession = Depends(get_db)):
+    """
+    Everything needed to render a board: its statuses, each with its first
+    `tickets_per_column` tickets and its total ticket count.
+    """
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    view = await kanban_board_crud.get_view(id, tickets_per_column)
+    if not view:
+        raise HTTPException(status_code=404, detail=f"Kanban Board with id {id} not found")
+    return view
+
+
+@router.get("/{id}/stats", status_code=200, response_model=KanbanBoardStats)
+async def get_kanban_board_stats(id: int, db: AnySession = Depends(get_db)):
+    """
+    The number of tickets in each status (column) of a board, across projects.
+    """
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    if not await kanban_board_crud.get(id):
+        raise HTTPException(status_code=404, detail=f"Kanban Board with id {id} not found")
+    return await AsyncTicketCounterCRUD(db).board_stats(id)
+
+
 @router.put("/{id}", status_code=200, response_model=KanbanBoardResponse)
-def update_kanban_board(id: int, kanban_board: KanbanBoardCreate, db: Session = Depends(get_db)):
-    kanban_board_crud = KanbanBoardCRUD(db)
-    kanban_board_crud.update(id, **kanban_board.model_dump())
-    return kanban_board_crud.get(id)
+async def update_kanban_board(id: int, kanban_board: KanbanBoardCreate, request: Request, response: Response,
+                              db: AnySession = Depends(get_db)):
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    if "if-match" in request.headers:
+        current = await kanban_board_crud.get(id)
+        if not current:
+            raise HTTPException(status_code=404, detail=f"Kanban Board with id {id} not found")
+        check_if_match(request, entity_etag(current))
+    updated = await kanban_board_crud.update(id, **kanban_board.model_dump())
+    response.headers[ETAG_HEADER] = entity_etag(updated)
+    return updated
 
 
 @router.delete("/{id}", status_code=204)
-def delete_kanban_board(id: int, db: Session = Depends(get_db)):
-    kanban_board_crud = KanbanBoardCRUD(db)
-    kanban_board_crud.delete(id)
+async def delete_kanban_board(id: int, db: AnySession = Depends(get_db)):
+    kanban_board_crud = AsyncKanbanBoardCRUD(db)
+    await kanban_board_crud.delete(id)
     return {"message": "Kanban Board deleted successfully"}
@@ -1,39 +1,40 @@
 from fastapi import APIRouter, HTTPException
-from sqlalchemy.orm import Session
-from fastapi import Depends
+from fastapi import Depends, Response
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.db_models.crud import KanbanStatusCRUD
+from app.db_models.crud import AsyncKanbanStatusCRUD
+from app.db_models.session import AnySession
 from app.api_models.kanbanstatus import KanbanStatusCreate, KanbanStatusResponse
 from app.api.dependencies.sqldb import get_db
+from app.api.fast_json import list_response
 
 
 router = APIRouter()
 
 
 @router.post("/", status_code=201, response_model=KanbanStatusResponse)
-def create_kanban_status(kanban_status: KanbanStatusCreate, db: Session = Depends(get_db)):
+async def create_kanban_status(kanban_status: KanbanStatusCreate, db: AnySession = Depends(get_db)):
     try:
-        kanban_status_crud = KanbanStatusCRUD(db)
-        return kanban_status_crud.create(**kanban_status.model_dump())
+        kanban_status_crud = AsyncKanbanStatusCRUD(db)
+        return await kanban_status_crud.create(**kanban_status.model_dump())
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/", status_code=200, response_model=list[KanbanStatusResponse])
-def get_all_kanban_statuses(db: Session = Depends(get_db)):
+async def get_all_kanban_statuses(response: Response, db: AnySession = Depends(get_db)):
     try:
-        kanban_status_crud = KanbanStatusCRUD(db)
-        return kanban_status_crud.get_all()
+        kanban_status_crud = AsyncKanbanStatusCRUD(db)
+        return list_response(await kanban_status_crud.get_all(), KanbanStatusResponse, response)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{id}", status_code=200, response_model=KanbanStatusResponse)
-def get_kanban_status(id: int, db: Session = Depends(get_db)):
+async def get_kanban_status(id: int, db: AnySession = Depends(get_db)):
     try:
-        kanban_status_crud = KanbanStatusCRUD(db)
-        kanban_status = kanban_status_crud.get(id)
+        kanban_status_crud = AsyncKanbanStatusCRUD(db)
+        kanban_status = await kanban_status_crud.get(id)
         if not kanban_status:
             raise HTTPException(status_code=404, detail=f"Kanban Status with id {id} not found")
         return kanban_status
@@ -42,20 +43,20 @@ def get_kanban_status(id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{id}", status_code=200, response_model=KanbanStatusResponse)
-def update_kanban_status(id: int, kanban_status: KanbanStatusCreate, db: Session = Depends(get_db)):
+async def update_kanban_status(id: int, kanban_status: KanbanStatusCreate, db: AnySession = Depends(get_db)):
     try:
-        kanban_status_crud = KanbanStatusCRUD(db)
-        kanban_status_crud.update(id, **kanban_status.model_dump())
-        return kanban_status_crud.get(id)
+        kanban_status_crud = AsyncKanbanStatusCRUD(db)
+        await kanban_status_crud.update(id, **kanban_status.model_dump())
+        return await kanban_status_crud.get(id)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/{id}", status_code=204)
-def delete_kanban_status(id: int, db: Session = Depends(get_db)):
+async def delete_kanban_status(id: int, db: AnySession = Depends(get_db)):
     try:
-        kanban_status_crud = KanbanStatusCRUD(db)
-        kanban_status_crud.delete(id)
+        kanban_status_crud = AsyncKanbanStatusCRUD(db)
+        await kanban_status_crud.delete(id)
         return {"message": "Kanban Status deleted successfully"}
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=str(e))
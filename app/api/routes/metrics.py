@@ -0,0 +1,44 @@
+from typing import List
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+from app.core.metrics import counter, format_labels, gauge, metrics
+from app.db_models.crud.cache import cache_stats
+from app.db_models.crud.history_writer import get_history_writer
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+
+def cache_lines() -> List[str]:
+    lines = [
+        "# HELP cache_requests_total Lookups of the model caches, by namespace and result.",
+        "# TYPE cache_requests_total counter",
+    ]
+    for namespace, stats in cache_stats().items():
+        for result in ("hits", "misses"):
+            lines.append(f"cache_requests_total{{{format_labels(('namespace', 'result'), (namespace, result))}}} {stats[result]}")
+    return lines
+
+
+def history_writer_lines() -> List[str]:
+    writer = get_history_writer()
+    if writer is None:
+        return []
+    stats = writer.stats()
+    return [
+        *gauge("history_writer_pending", "History entries waiting to be written.", stats["pending"]),
+        *counter("history_writer_written_total", "History entries written in batches.", stats["written"]),
+        *counter("history_writer_failed_flushes_total", "Batches that failed to be written.", stats["failed_flushes"]),
+        *counter("history_writer_spilled_total", "History entries spilled to a file instead of being written.",
+                 stats["spilled"]),
+        *counter("history_writer_dropped_total", "History entries dropped instead of being written.", stats["dropped"]),
+        *gauge("history_writer_lag_seconds", "Age of the oldest pending history entry.", stats["lag_seconds"]),
+    ]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    lines = metrics.render() + cache_lines() + history_writer_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=METRICS_CONTENT_TYPE)
@@ -1,111 +1,177 @@
 # Project Endpoints
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import Optional
 from loguru import logger
 from app.db_models.crud.history_crud import HistoryCRUD
-from app.db_models.crud import ProjectCRUD
+from app.db_models.crud import ProjectCRUD, AsyncProjectCRUD, AsyncHistoryCRUD, AsyncTicketCounterCRUD
+from app.db_models.session import AnySession
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectWithHistory
+from app.schemas.stats import ProjectStats
 from app.api.dependencies.sqldb import get_db
+from app.api.pagination import set_page_cursor_headers
+from app.api.fast_json import list_response
+from app.api.etag import ETAG_HEADER, check_if_match, collection_etag, entity_etag, not_modified
 from app.services.project_service import update_project_status
 
 router = APIRouter()
 
 @router.post("/", status_code=201, response_model=ProjectResponse)
-def create_project(project: ProjectCreate, db: Session = Depends(get_db)) -> ProjectResponse:
+async def create_project(project: ProjectCreate, db: AnySession = Depends(get_db)) -> ProjectResponse:
     """
     Create a new project.
     - **project**: ProjectCreate - The project data to create.
     - **db**: Session - The database session dependency.
     """
-    project_crud = ProjectCRUD(db)
+    project_crud = AsyncProjectCRUD(db)
     logger.info("Creating project with name: {}", project.name)
     if project.kanban_board_id is None:
         raise HTTPException(status_code=400, detail="kanban_board_id must be provided")
     try:
-        return project_crud.create(**project.model_dump())
+        return await project_crud.create(**project.model_dump())
     except Exception as e:
         logger.error("Error creating project: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/", status_code=200, response_model=list[ProjectResponse])
-def get_all_projects(db: Session = Depends(get_db)) -> list[ProjectResponse]:
+async def get_all_projects(request: Request, response: Response, skip: int = 0, limit: int = 10,
+                           cursor: Optional[str] = None, db: AnySession = Depends(get_db)) -> list[ProjectResponse]:
     """
-    Get all projects.
+    Get all projects with pagination.
+    - **skip**: int - Number of projects to skip, ignored when a cursor is given.
+    - **limit**: int - Maximum number of projects to return.
+    - **cursor**: str - The `X-Next-Cursor` header of the previous page.
     - **db**: Session - The database session dependency.
+
+    Answers `304 Not Modified` when `If-None-Match` holds the current collection ETag.
     """
-    project_crud = ProjectCRUD(db)
-    logger.info("Fetching all projects")
+    project_crud = AsyncProjectCRUD(db)
+    logger.info("Fetching all projects with skip: {} and limit: {}", skip, limit)
     try:
-        return project_crud.get_all()
+        etag = collection_etag(request, await project_crud.version())
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        projects = await project_crud.get_all(skip=skip, limit=limit, cursor=cursor)
+        set_page_cursor_headers(response, projects, limit, ProjectCRUD.cursor_for)
+        response.headers[ETAG_HEADER] = etag
+        return list_response(projects, ProjectResponse, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Error fetching projects: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-def _get_project_or_404(project_crud: ProjectCRUD, project_id: int) -> ProjectResponse:
+async def _get_project_or_404(project_crud: AsyncProjectCRUD, project_id: int) -> ProjectResponse:
     """
     Helper function to get a project by ID or raise a 404 error.
-    - **project_crud**: ProjectCRUD - The project CRUD instance.
+    - **project_crud**: AsyncProjectCRUD - The project CRUD instance.
     - **project_id**: int - The ID of the project to retrieve.
     """
-    project = project_crud.get(project_id)
+    project = await project_crud.get(project_id)
     if not project:
         logger.error("Project with id {} not found", project_id)
         raise HTTPException(status_code=404, detail=f"Project with id {project_id} not found")
     return project
 
 @router.get("/{id}", status_code=200, response_model=ProjectResponse)
-def get_project(id: int, db: Session = Depends(get_db)) -> ProjectResponse:
+async def get_project(id: int, request: Request, response: Response, db: AnySession = Depends(get_db)) -> ProjectResponse:
     """
     Get a project by ID.
     - **id**: int - The ID of the project to retrieve.
     - **db**: Session - The database session dependency.
+
+    Answers `304 Not Modified` when `If-None-Match` holds the current ETag.
     """
-    project_crud = ProjectCRUD(db)
+    project_crud = AsyncProjectCRUD(db)
     logger.info("Fetching project with id: {}", id)
     try:
-        project = _get_project_or_404(project_crud, id)
+        project = await _get_project_or_404(project_crud, id)
+        etag = entity_etag(project)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        response.headers[ETAG_HEADER] = etag
         return project
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error fetching project: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/{project_id}/history", response_model=ProjectWithHistory)
-def get_project_with_history(project_id: int, db: Session = Depends(get_db)) -> ProjectWithHistory:
+async def get_project_with_history(project_id: int, response: Response, limit: int = 10, after: Optional[str] = None,
+                                   before: Optional[str] = None, db: AnySession = Depends(get_db)) -> ProjectWithHistory:
     """
-    Get a project by ID along with its history.
+    Get a project by ID along with its history, newest first.
     - **project_id**: int - The ID of the project to retrieve.
+    - **limit**: int - Maximum number of history entries to return.
+    - **after**: str - Cursor of the first entry of a page, to fetch the newer page.
+    - **before**: str - Cursor of the last entry of a page, to fetch the older page.
     - **db**: Session - The database session dependency.
     """
-    project_crud = ProjectCRUD(db)
-    history_crud = HistoryCRUD(db)
+    project_crud = AsyncProjectCRUD(db)
+    history_crud = AsyncHistoryCRUD(db)
     logger.info("Fetching project with id: {} and its history", project_id)
     try:
-        project = _get_project_or_404(project_crud, project_id)
-        history = history_crud.get_by_entity_id('project', project_id)
-        return {"project": project, "history": history}
+        project = await _get_project_or_404(project_crud, project_id)
+        history = await history_crud.get_by_entity_id('project', project_id, limit=limit, after=after, before=before)
+        set_page_cursor_headers(response, history, limit, HistoryCRUD.cursor_for, with_prev=True)
+        return {**ProjectResponse.model_validate(project, from_attributes=True).model_dump(), "history": history}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Error fetching project with history: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+async def get_project_stats(project_id: int, db: AnySession = Depends(get_db)) -> ProjectStats:
+    """
+    Get the number of tickets of a project, per kanban status and in total.
+    - **project_id**: int - The ID of the project.
+    - **db**: Session - The database session dependency.
+    """
+    project_crud = AsyncProjectCRUD(db)
+    counter_crud = AsyncTicketCounterCRUD(db)
+    logger.info("Fetching ticket stats of project with id: {}", project_id)
+    try:
+        await _get_project_or_404(project_crud, project_id)
+        return await counter_crud.project_stats(project_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error fetching project stats: {}", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
 @router.put("/{id}", status_code=200, response_model=ProjectResponse)
-def update_project(id: int, project: ProjectCreate, db: Session = Depends(get_db)) -> ProjectResponse:
+async def update_project(id: int, project: ProjectCreate, request: Request, response: Response,
+                         db: AnySession = Depends(get_db)) -> ProjectResponse:
     """
     Update a project by ID.
     - **id**: int - The ID of the project to update.
     - **project**: ProjectCreate - The project data to update.
     - **db**: Session - The database session dependency.
+
+    With `If-Match`, the update is refused with `412 Precondition Failed` unless the header
+    holds the current ETag.
     """
-    project_crud = ProjectCRUD(db)
+    project_crud = AsyncProjectCRUD(db)
     logger.info("Updating project with id: {}", id)
     try:
-        project_crud.update(id, **project.model_dump())
-        return project_crud.get(id)
+        if "if-match" in request.headers:
+            check_if_match(request, entity_etag(await _get_project_or_404(project_crud, id)))
+        updated = await project_crud.update(id, **project.model_dump())
+        response.headers[ETAG_HEADER] = entity_etag(updated)
+        return updated
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error updating project: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.put("/{project_id}/status", response_model=ProjectResponse)
-def change_project_status(project_id: int, new_status: str, user_id: int, db: Session = Depends(get_db)) -> ProjectResponse:
+async def change_project_status(project_id: int, new_status: str, user_id: int, db: AnySession = Depends(get_db)) -> ProjectResponse:
     """
     Change the status of a project by ID.
     - **project_id**: int - The ID of the project to update.
@@ -115,7 +181,7 @@ def change_project_status(project_id: int, new_status: str, user_id: int, db: Se
     """
     logger.info("Changing status of project with id: {} to {}", project_id, new_status)
     try:
-        project = update_project_status(project_id, new_status, user_id, db)
+        project = await update_project_status(project_id, new_status, user_id, db)
         return project
     except ValueError as e:
         logger.error("Error changing project status: {}", e)
@@ -125,16 +191,16 @@ def change_project_status(project_id: int, new_status: str, user_id: int, db: Se
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.delete("/{id}", status_code=204)
-def delete_project(id: int, db: Session = Depends(get_db)) -> None:
+async def delete_project(id: int, db: AnySession = Depends(get_db)) -> None:
     """
     Delete a project by ID.
     - **id**: int - The ID of the project to delete.
     - **db**: Session - The database session dependency.
     """
-    project_crud = ProjectCRUD(db)
+    project_crud = AsyncProjectCRUD(db)
     logger.info("Deleting project with id: {}", id)
     try:
-        project_crud.delete(id)
+        await project_crud.delete(id)
     except Exception as e:
         logger.error("Error deleting project: {}", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,100 +1,227 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from datetime import datetime
+from typing import List, Literal, Optional
 from loguru import logger
 from sqlalchemy.exc import SQLAlchemyError
-from app.db_models.crud import TicketCRUD
+from app.db_models.crud import TicketCRUD, AsyncTicketCRUD, AsyncHistoryCRUD
+from app.db_models.session import AnySession
 from app.db_models.crud.history_crud import HistoryCRUD
-from app.schemas.ticket import TicketCreate, TicketResponse, TicketWithHistory
+from app.schemas.ticket import (
+    TicketCreate, TicketResponse, TicketWithHistory, TicketSearchResult, TicketBulkStatusUpdate, TicketBulkStatusResult,
+)
 from app.api.dependencies.sqldb import get_db
+from app.api.pagination import set_page_cursor_headers
+from app.api.export import streaming_export
+from app.api.fast_json import list_response
+from app.api.etag import ETAG_HEADER, check_if_match, collection_etag, entity_etag, not_modified
 from app.services.ticket_service import update_ticket_status
 
 router = APIRouter()
 
 @router.post("/", status_code=201, response_model=TicketResponse)
-def create_ticket(ticket: TicketCreate, db: Session = Depends(get_db)) -> TicketResponse:
+async def create_ticket(ticket: TicketCreate, db: AnySession = Depends(get_db)) -> TicketResponse:
     """
     Create a new ticket.
     """
-    ticket_crud = TicketCRUD(db)
+    ticket_crud = AsyncTicketCRUD(db)
     logger.info("Creating ticket with title: {}", ticket.title)
     if ticket.kanban_status_id is None:
         raise HTTPException(status_code=400, detail="kanban_status_id must be provided")
     try:
-        return ticket_crud.create(**ticket.model_dump())
+        return await ticket_crud.create(**ticket.model_dump())
     except SQLAlchemyError as e:
         logger.error("Error creating ticket: {}", str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/bulk", status_code=201, response_model=list[TicketResponse])
+async def create_tickets_bulk(tickets: List[TicketCreate], db: AnySession = Depends(get_db)) -> list[TicketResponse]:
+    """
+    Create many tickets in one transaction, e.g. to import a sprint.
+    """
+    ticket_crud = AsyncTicketCRUD(db)
+    logger.info("Bulk creating {} tickets", len(tickets))
+    try:
+        return await ticket_crud.bulk_create([ticket.model_dump() for ticket in tickets])
+    except ValueError as e:
+        logger.error("Error bulk creating tickets: {}", str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        logger.error("Error bulk creating tickets: {}", str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/", status_code=200, response_model=list[TicketResponse])
-def get_all_tickets(db: Session = Depends(get_db), skip: int = 0, limit: int = 10) -> list[TicketResponse]:
+async def get_all_tickets(request: Request, response: Response, db: AnySession = Depends(get_db), skip: int = 0,
+                          limit: int = 10, cursor: Optional[str] = None, project_id: Optional[int] = None,
+                          kanban_status_id: Optional[int] = None, priority: Optional[str] = None,
+                          status: Optional[str] = None,
+                          sort: Literal["id", "-id", "updated_at", "-updated_at"] = "id") -> list[TicketResponse]:
     """
-    Retrieve all tickets with pagination.
+    Retrieve tickets with optional filters, ordering and pagination.
+
+    Pass the `X-Next-Cursor` response header as `cursor` to fetch the next page, with the
+    same filters and `sort`. The ETag covers the whole ticket collection, so any ticket
+    write invalidates every page.
     """
-    ticket_crud = TicketCRUD(db)
+    ticket_crud = AsyncTicketCRUD(db)
     logger.info("Fetching all tickets with skip: {} and limit: {}", skip, limit)
     try:
-        return ticket_crud.get_all(skip=skip, limit=limit)
+        etag = collection_etag(request, await ticket_crud.version())
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        tickets = await ticket_crud.get_all(skip=skip, limit=limit, cursor=cursor, project_id=project_id,
+                                            kanban_status_id=kanban_status_id, priority=priority, status=status,
+                                            sort=sort)
+        set_page_cursor_headers(response, tickets, limit, lambda ticket: TicketCRUD.cursor_for(ticket, sort))
+        response.headers[ETAG_HEADER] = etag
+        return list_response(tickets, TicketResponse, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except SQLAlchemyError as e:
         logger.error("Error fetching tickets: {}", str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/export", status_code=200)
+async def export_tickets(fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"), since: Optional[datetime] = None,
+                         gzip: bool = False, db: AnySession = Depends(get_db)):
+    """
+    Stream every ticket as NDJSON or CSV, in constant memory.
+
+    - **format**: `ndjson` (default) or `csv`.
+    - **since**: Only export the tickets updated at or after this time.
+    - **gzip**: Compress the body on the fly (`Content-Encoding: gzip`).
+    """
+    logger.info("Exporting tickets as {} since {}", fmt, since)
+    return streaming_export(db, TicketCRUD.export_query(since), "tickets", fmt, gzip)
+
+@router.get("/search", status_code=200, response_model=list[TicketSearchResult])
+async def search_tickets(response: Response, q: str = Query(..., min_length=1), limit: int = 10,
+                         cursor: Optional[str] = None, db: AnySession = Depends(get_db)) -> list[TicketSearchResult]:
+    """
+    Full-text search over ticket titles and descriptions, best matches first.
+
+    Pass the `X-Next-Cursor` response header as `cursor` to fetch the next page.
+    """
+    ticket_crud = AsyncTicketCRUD(db)
+    logger.info("Searching tickets for: {}", q)
+    try:
+        rows = await ticket_crud.search(q, limit=limit, cursor=cursor)
+        set_page_cursor_headers(response, rows, limit, TicketCRUD.search_cursor_for)
+        return [
+            {**TicketResponse.model_validate(row.Ticket, from_attributes=True).model_dump(),
+             "score": row.score, "snippet": row.snippet}
+            for row in rows
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        logger.error("Error searching tickets: {}", str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/{id}", status_code=200, response_model=TicketResponse)
-def get_ticket(id: int, db: Session = Depends(get_db)) -> TicketResponse:
+async def get_ticket(id: int, request: Request, response: Response, db: AnySession = Depends(get_db)) -> TicketResponse:
     """
     Retrieve a ticket by its ID.
+
+    Answers `304 Not Modified` when `If-None-Match` holds the current ETag.
     """
-    ticket_crud = TicketCRUD(db)
+    ticket_crud = AsyncTicketCRUD(db)
     try:
-        ticket = ticket_crud.get(id)
+        ticket = await ticket_crud.get(id)
         if not ticket:
             logger.error("Ticket with id {} not found", id)
             raise HTTPException(status_code=404, detail=f"Ticket with id {id} not found")
         logger.info("Fetching ticket with id: {}", id)
+        etag = entity_etag(ticket)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        response.headers[ETAG_HEADER] = etag
         return ticket
     except SQLAlchemyError as e:
         logger.error("Error fetching ticket: {}", str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{id}/history", response_model=TicketWithHistory)
-def get_ticket_with_history(id: int, db: Session = Depends(get_db)) -> TicketWithHistory:
+async def get_ticket_with_history(id: int, response: Response, limit: int = 10, after: Optional[str] = None,
+                                  before: Optional[str] = None, db: AnySession = Depends(get_db)) -> TicketWithHistory:
     """
-    Retrieve a ticket along with its history by its ID.
+    Retrieve a ticket along with its history by its ID, newest first.
     """
-    ticket_crud = TicketCRUD(db)
-    history_crud = HistoryCRUD(db)
+    ticket_crud = AsyncTicketCRUD(db)
+    history_crud = AsyncHistoryCRUD(db)
 
     logger.info("Fetching ticket with history for id: {}", id)
-    ticket = ticket_crud.get(id)
+    ticket = await ticket_crud.get(id)
     if not ticket:
         logger.error("Ticket with id {} not found", id)
         raise HTTPException(status_code=404, detail="Ticket not found")
 
-    history = history_crud.get_by_entity_id('ticket', id)
+    try:
+        history = await history_crud.get_by_entity_id('ticket', id, limit=limit, after=after, before=before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_cursor_headers(response, history, limit, HistoryCRUD.cursor_for, with_prev=True)
 
     return {"ticket": ticket, "history": history}
 
 @router.put("/{id}", status_code=200, response_model=TicketResponse)
-def update_ticket(id: int, ticket: TicketCreate, db: Session = Depends(get_db)) -> TicketResponse:
+async def update_ticket(id: int, ticket: TicketCreate, request: Request, response: Response,
+                        db: AnySession = Depends(get_db)) -> TicketResponse:
     """
     Update an existing ticket.
+
+    With `If-Match`, the update is refused with `412 Precondition Failed` unless the
+    header holds the current ETag.
     """
-    ticket_crud = TicketCRUD(db)
+    ticket_crud = AsyncTicketCRUD(db)
     logger.info("Updating ticket with id: {}", id)
     try:
-        ticket_crud.update(id, **ticket.model_dump())
-        return ticket_crud.get(id)
+        if "if-match" in request.headers:
+            current = await ticket_crud.get(id)
+            if not current:
+                raise HTTPException(status_code=404, detail=f"Ticket with id {id} not found")
+            check_if_match(request, entity_etag(current))
+        updated = await ticket_crud.update(id, **ticket.model_dump())
+        response.headers[ETAG_HEADER] = entity_etag(updated)
+        return updated
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except SQLAlchemyError as e:
         logger.error("Error updating ticket: {}", str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.put("/status/bulk", response_model=TicketBulkStatusResult)
+async def change_tickets_status_bulk(change: TicketBulkStatusUpdate, db: AnySession = Depends(get_db)) -> TicketBulkStatusResult:
+    """
+    Change the status of many tickets, e.g. a whole kanban column, in one transaction.
+    """
+    ticket_crud = AsyncTicketCRUD(db)
+    logger.info("Bulk changing status of tickets to {}", change.new_status)
+    try:
+        updated = await ticket_crud.bulk_update_status(
+            change.new_status,
+            change.user_id,
+            ticket_ids=change.ticket_ids,
+            kanban_status_id=change.kanban_status_id,
+            new_kanban_status_id=change.new_kanban_status_id,
+        )
+        return {"updated": updated}
+    except ValueError as e:
+        logger.error("Error bulk changing ticket status: {}", str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        logger.error("Error bulk changing ticket status: {}", str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.put("/{ticket_id}/status", response_model=TicketResponse)
-def change_ticket_status(ticket_id: int, new_status: str, user_id: int, db: Session = Depends(get_db)) -> TicketResponse:
+async def change_ticket_status(ticket_id: int, new_status: str, user_id: int, db: AnySession = Depends(get_db)) -> TicketResponse:
     """
     Change the status of an existing ticket.
     """
     logger.info("Changing status of ticket with id: {} to {}", ticket_id, new_status)
     try:
-        ticket = update_ticket_status(ticket_id, new_status, user_id, db)
+        ticket = await update_ticket_status(ticket_id, new_status, user_id, db)
         return ticket
     except ValueError as e:
         logger.error("Error changing ticket status: {}", str(e))
@@ -104,10 +231,10 @@ def change_ticket_status(ticket_id: int, new_status: str, user_id: int, db: Sess
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.delete("/{id}", status_code=204)
-def delete_ticket(id: int, db: Session = Depends(get_db)):
-    ticket_crud = TicketCRUD(db)
-    ticket = ticket_crud.get(id)
+async def delete_ticket(id: int, db: AnySession = Depends(get_db)):
+    ticket_crud = AsyncTicketCRUD(db)
+    ticket = await ticket_crud.get(id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    ticket_crud.delete(id)
+    await ticket_crud.delete(id)
     return None  # Ensure no response body is returned
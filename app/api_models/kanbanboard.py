@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from app.api_models.kanbanstatus import KanbanStatusResponse
+from app.schemas.ticket import TicketResponse
 
 
 class KanbanBoardBase(BaseModel):
@@ -26,3 +28,14 @@ class KanbanBoardInDB(KanbanBoardBase):
 
 class KanbanBoardResponse(KanbanBoardInDB):
     pass
+
+
+class KanbanColumnView(BaseModel):
+    status: KanbanStatusResponse
+    tickets: List[TicketResponse]
+    ticket_count: int
+
+
+class KanbanBoardView(BaseModel):
+    board: KanbanBoardResponse
+    columns: List[KanbanColumnView]
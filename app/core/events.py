@@ -1,86 +1,117 @@
+import time
+from contextlib import contextmanager
 from fastapi import FastAPI
 from loguru import logger
-from typing import Callable, Optional
+from typing import Callable, Iterator, List, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from dotenv import load_dotenv, find_dotenv
-import os
 
-from app.db_models.base import *
+from app.db_models.base import KanbanBoard, KanbanStatus
 from app.db_models.session import engine, SessionLocal
+from app.db_models.schema import ensure_schema
+from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.crud.kanban_board_crud import kanban_board_cache
+from app.db_models.crud.kanban_status_crud import kanban_status_cache
+from app.db_models.crud.unit_of_work import UnitOfWork
+from app.db_models.crud.history_writer import create_history_writer, get_history_writer, set_history_writer
+from app.services.archive_service import HistoryArchiver
 
-def create_default_statuses(db: Session, user_id: int = 1) -> None:
-    statuses = [
-        KanbanStatus(name="Backlog", description="Backlog Status", board_id=1),
-        KanbanStatus(name="To Do", description="To Do Status", board_id=1),
-        KanbanStatus(name="In Progress", description="In Progress Status", board_id=1),
-        KanbanStatus(name="Done", description="Done Status", board_id=1)
-    ]
-    db.add_all(statuses)
-    db.commit()
+DEFAULT_BOARD_NAME = "Default Board"
+DEFAULT_STATUS_NAMES = ("Backlog", "To Do", "In Progress", "Done")
 
-    # Create default history entries for the statuses
-    for status in statuses:
-        history_entry = History(
-            entity_type="kanban_status",
-            entity_id=status.id,
-            change_type="create",
-            user_id=user_id,  # Dynamic user ID
-            details=f"Default Kanban Status '{status.name}' created"
-        )
-        db.add(history_entry)
-    db.commit()
+def create_kanban_defaults(db: Session, user_id: int = 1) -> int:
+    """
+    Create the default kanban board and its statuses, with their history entries, if missing.
 
-def create_default_board(db: Session) -> None:
-    board = KanbanBoard(name="Default Board", description="Default Kanban Board")
-    db.add(board)
-    db.commit()
-    db.refresh(board)
+    Safe to run on every start: existing defaults are left alone, and whatever is missing
+    is created in one transaction. Returns the number of rows created.
+    """
+    history_crud = HistoryCRUD(db)
+    created = 0
+    with UnitOfWork(db):
+        board = db.execute(
+            select(KanbanBoard).where(KanbanBoard.name == DEFAULT_BOARD_NAME).order_by(KanbanBoard.id).limit(1)
+        ).scalar_one_or_none()
+        if board is None:
+            board = KanbanBoard(name=DEFAULT_BOARD_NAME, description="Default Kanban Board")
+            db.add(board)
+            db.flush()
+            history_crud.record(entity_type="kanban_board", entity_id=board.id, change_type="create",
+                                user_id=user_id, details="Default Kanban Board created")
+            created += 1
+        existing = set(db.execute(select(KanbanStatus.name).where(KanbanStatus.board_id == board.id)).scalars())
+        statuses = [KanbanStatus(name=name, description=f"{name} Status", board_id=board.id)
+                    for name in DEFAULT_STATUS_NAMES if name not in existing]
+        db.add_all(statuses)
+        db.flush()
+        for status in statuses:
+            history_crud.record(entity_type="kanban_status", entity_id=status.id, change_type="create",
+                                user_id=user_id, details=f"Default Kanban Status '{status.name}' created")
+        created += len(statuses)
+    if created:
+        kanban_board_cache.invalidate()
+        kanban_status_cache.invalidate()
+    return created
 
-    # Create default history entry for the board
-    history_entry = History(
-        entity_type="kanban_board",
-        entity_id=board.id,
-        change_type="create",
-        user_id=1,  # Assuming user ID 1 is the admin or system user
-        details="Default Kanban Board created"
-    )
-    db.add(history_entry)
-    db.commit()
+class StartupTimer:
+    """
+    Time the phases of the application start, for a one-line breakdown in the logs.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
 
-def create_kanban_defaults(db: Session, create_defaults: Optional[str] = True) -> None:
-    logger.debug(f"create_kanban_defaults called with create_defaults={create_defaults}")
-    if create_defaults and create_defaults.lower() == 'true':
-        logger.info("Creating default Kanban Board and Statuses")
-        logger.info("To set off, add env variable CREATE_DEFAULTS=False")
-        create_default_board(db)
-        create_default_statuses(db)
-    elif create_defaults and create_defaults.lower() == 'false':
-        logger.info("Create defaults is set to False, not creating default Kanban Board and Statuses")
-    else:
-        logger.info("No CREATE_DEFAULTS env variable set, not creating default Kanban Board and Statuses")
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.phases)
+        return f"{(time.perf_counter() - self.started) * 1000:.1f}ms ({phases})"
 
 def create_start_app_handler(app: FastAPI) -> Callable:
     async def start_app() -> None:
         settings = app.state.settings
         logger.info(f"Starting [{settings.app_env.value}] Application")
-        # Start up Events
-        load_dotenv(find_dotenv())
-        logger.debug("Environment variables loaded")
-
-        # Create tables
-        Base.metadata.create_all(bind=engine)
-        logger.debug("Database tables created")
+        timer = StartupTimer()
 
-        # Create a new session
-        session = SessionLocal()
-        logger.debug("Database session created")
+        # Bring the schema to the code's revision; no DDL when it is there already
+        with timer.phase("schema"):
+            schema = ensure_schema(engine, settings.database_auto_migrate)
+        logger.debug(f"Database schema {schema}")
 
         # Create default Kanban Board and Statuses
-        create_kanban_defaults(session, os.getenv('CREATE_DEFAULTS'))
+        if settings.create_defaults:
+            with timer.phase("defaults"):
+                db = SessionLocal()
+                try:
+                    created = create_kanban_defaults(db)
+                finally:
+                    db.close()
+            logger.info(f"Default Kanban Board and Statuses checked, {created} rows created")
+
+        # Write history entries behind requests, in batches
+        if settings.history_write_behind:
+            with timer.phase("history_writer"):
+                writer = create_history_writer(engine)
+                writer.start()
+                set_history_writer(writer)
+            logger.info("History write-behind enabled")
+
+        # Move old history to the archive on a schedule
+        if settings.history_retention_days is not None:
+            with timer.phase("history_archiver"):
+                app.state.history_archiver = HistoryArchiver(settings.history_retention_days,
+                                                             settings.history_archive_interval,
+                                                             settings.history_archive_batch_size)
+                app.state.history_archiver.start()
+            logger.info(f"History archival enabled, keeping {settings.history_retention_days} days")
 
-        # Close session
-        session.close()
-        logger.debug("Database session closed")
+        logger.info(f"Application started in {timer.summary()}")
 
     return start_app
 
@@ -89,6 +120,18 @@ def create_stop_app_handler(app: FastAPI) -> Callable:
     async def stop_app() -> None:
         settings = app.state.settings
         logger.info(f"Stopping [{settings.app_env.value}] application")
+        # Stop archiving history
+        archiver = getattr(app.state, "history_archiver", None)
+        if archiver is not None:
+            archiver.stop()
+        # Write the history entries still buffered
+        writer = get_history_writer()
+        if writer is not None:
+            set_history_writer(None)
+            writer.stop()
+            logger.info(f"History writer stopped: {writer.stats()}")
         # Shut down events
         logger.debug("Application shutdown events completed")
+        # Wait for the enqueued log records to be written
+        await logger.complete()
     return stop_app
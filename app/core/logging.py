@@ -1,10 +1,27 @@
+import json
 import logging
-from types import FrameType
-from typing import cast
+import random
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, MutableMapping, Optional
 
 from loguru import logger
 
+# Correlation id of the request being served, and its ASGI scope, set by RequestContextMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+request_scope_var: ContextVar[Optional[MutableMapping[str, Any]]] = ContextVar("request_scope", default=None)
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {extra[request_id]} | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
 class InterceptHandler(logging.Handler):
+    """
+    Forward stdlib log records to loguru.
+
+    Records keep the logger name, function and line of the stdlib record, so no stack
+    frames are walked. Give the handler a level to drop records before they reach loguru.
+    """
     def emit(self, record: logging.LogRecord) -> None:
         # Get corresponding Loguru level if it exists
         try:
@@ -12,10 +29,67 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
-        # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = cast(FrameType, frame.f_back)
-            depth += 1
+        def origin(loguru_record: Dict[str, Any]) -> None:
+            loguru_record.update(name=record.name, function=record.funcName, line=record.lineno)
+
+        logger.patch(origin).opt(exception=record.exc_info).log(level, record.getMessage())
+
+def add_request_id(record: Dict[str, Any]) -> None:
+    """
+    Loguru patcher stamping every record with the correlation id of the current request.
+    """
+    record["extra"].setdefault("request_id", request_id_var.get() or "-")
+
+def json_formatter(record: Dict[str, Any]) -> str:
+    """
+    Loguru format function writing each record as one line of JSON.
+    """
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    entry.pop("json", None)
+    if record["exception"] is not None:
+        entry["exception"] = "".join(logging.Formatter().formatException(
+            (record["exception"].type, record["exception"].value, record["exception"].traceback)))
+    record["extra"]["json"] = json.dumps(entry, default=str)
+    return "{extra[json]}\n"
+
+class RequestLogSampler:
+    """
+    Loguru filter keeping a sample of the info and debug records logged while serving requests.
+
+    The decision is taken once per request, from the rate of the matched route (its path
+    template, e.g. "/api/tickets/{id}") or the default rate, so a request is logged either
+    completely or not at all. Warnings and errors, and records logged outside requests,
+    always pass.
+    """
+    SCOPE_KEY = "log_sampled"
+
+    def __init__(self, default_rate: float = 1.0, route_rates: Optional[Dict[str, float]] = None,
+                 random: Callable[[], float] = random.random):
+        self.default_rate = default_rate
+        self.route_rates = route_rates or {}
+        self.random = random
+        self.warning_no = logger.level("WARNING").no
 
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
\ No newline at end of file
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if record["level"].no >= self.warning_no:
+            return True
+        scope = request_scope_var.get()
+        if scope is None:
+            return True
+        sampled = scope.get(self.SCOPE_KEY)
+        if sampled is None:
+            route = scope.get("route")
+            if route is None:
+                # Not routed yet
+                return True
+            rate = self.route_rates.get(route.path, self.default_rate)
+            sampled = scope[self.SCOPE_KEY] = rate >= 1 or self.random() < rate
+        return sampled
@@ -0,0 +1,122 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Request latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RouteKey = Tuple[str, str]  # (method, route)
+LatencyKey = Tuple[str, str, str]  # (method, route, status)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+class Histogram:
+    """
+    Counts of observations per bucket, preallocated; made cumulative only when rendered.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class Metrics:
+    """
+    Request and database metrics of the process, rendered in the Prometheus text format.
+
+    Series are keyed by tuples of label values, so recording a request allocates nothing
+    once its (method, route, status) series exists. Request metrics are recorded on the
+    event loop; the database counters are also updated from worker threads, under a lock.
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.latency: Dict[LatencyKey, Histogram] = {}
+        self.errors: Dict[RouteKey, int] = {}
+        self.in_flight = 0
+        self.db_sessions = 0
+        self.db_sessions_open = 0
+        self.db_checkouts = 0
+        self.db_checked_out = 0
+        self._lock = threading.Lock()
+
+    def observe_request(self, method: str, route: str, status: int, duration: float) -> None:
+        key = (method, route, str(status))
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(self.buckets)
+        histogram.observe(duration)
+        if status >= 500:
+            self.errors[key[:2]] = self.errors.get(key[:2], 0) + 1
+
+    def session_opened(self) -> None:
+        with self._lock:
+            self.db_sessions += 1
+            self.db_sessions_open += 1
+
+    def session_closed(self) -> None:
+        with self._lock:
+            self.db_sessions_open -= 1
+
+    def connection_checked_out(self) -> None:
+        with self._lock:
+            self.db_checkouts += 1
+            self.db_checked_out += 1
+
+    def connection_checked_in(self) -> None:
+        with self._lock:
+            self.db_checked_out -= 1
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by method, route and status.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in list(self.latency.items()):
+            lines.extend(histogram.render("http_request_duration_seconds",
+                                          format_labels(("method", "route", "status"), (method, route, status))))
+        lines += [
+            "# HELP http_request_errors_total Responses with a 5xx status, or unhandled errors.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        for (method, route), count in list(self.errors.items()):
+            lines.append(f"http_request_errors_total{{{format_labels(('method', 'route'), (method, route))}}} {count}")
+        lines += gauge("http_requests_in_flight", "Requests being served.", self.in_flight)
+        lines += counter("db_sessions_total", "Database sessions opened for requests.", self.db_sessions)
+        lines += gauge("db_sessions_open", "Database sessions currently open.", self.db_sessions_open)
+        lines += counter("db_pool_checkouts_total", "Connections checked out of the pool.", self.db_checkouts)
+        lines += gauge("db_pool_checked_out", "Connections currently checked out of the pool.", self.db_checked_out)
+        return lines
+
+
+def gauge(name: str, help: str, value: float) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+def counter(name: str, help: str, value: float) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} counter", f"{name} {value}"]
+
+
+metrics = Metrics()
@@ -1,10 +1,15 @@
 import logging
+import os
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from loguru import logger
 
 from app.core.settings.base import BaseAppSettings
-from app.core.logging import InterceptHandler
+from app.core.logging import TEXT_FORMAT, InterceptHandler, RequestLogSampler, add_request_id, json_formatter
+
+# Default to the SQLite database file within the app/ folder
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(APP_DIR, 'project_management.db')}"
 
 class AppSettings(BaseAppSettings):
     debug: bool = False
@@ -20,6 +25,81 @@ class AppSettings(BaseAppSettings):
     
     logging_level: int = logging.INFO
     loggers: Tuple[str, str] = ("uvicorn.asgi", "uvicorn.access")
+    # Records are written by a background thread (enqueue), as JSON lines with log_json.
+    # Info and debug records of requests are kept at log_sample_rate, or at the rate of
+    # the route path template in log_route_sample_rates, e.g. {"/api/tickets/{id}": 0.01}.
+    log_json: bool = False
+    log_enqueue: bool = True
+    log_sample_rate: float = 1.0
+    log_route_sample_rates: Dict[str, float] = {}
+    request_id_header: str = "X-Request-ID"
+
+    database_url: str = DEFAULT_DATABASE_URL
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    database_pool_recycle: int = 1800
+    # Upgrade the schema at startup when it is behind the code, instead of refusing to start
+    database_auto_migrate: bool = False
+    # Create the default kanban board and statuses at startup when they are missing
+    create_defaults: bool = False
+
+    # Serve requests from an AsyncSession instead of a threadpool-bound Session.
+    # The async URL defaults to database_url with an async driver (aiosqlite, asyncpg).
+    async_database: bool = False
+    async_database_url: Optional[str] = None
+
+    # Applied to every new SQLite connection, ignored for other engines
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_busy_timeout: int = 5000  # milliseconds
+    sqlite_cache_size: int = -64000  # negative values are KiB, i.e. 64 MiB per connection
+    sqlite_mmap_size: int = 268435456  # 256 MiB
+    sqlite_foreign_keys: bool = True
+
+    # Read-through cache of kanban boards and statuses. cache_backend is "memory" for a
+    # per-process TTL/LRU cache, or "module:Class" for a shared backend.
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_ttl: int = 60  # seconds
+    cache_max_entries: int = 1024
+
+    # Encode list responses straight from the rows with orjson, skipping response model validation
+    fast_json_responses: bool = False
+
+    # Write-behind of the history entries recorded by status changes: buffered in memory,
+    # or in an append-only spool file when history_spool_path is set, and inserted in batches.
+    # Entries past history_max_pending, and batches that can never be written (e.g. integrity
+    # errors), are appended to history_spill_path, or dropped and counted without one. Batches
+    # failing on locks or disconnects are retried with backoff. Spooled entries spill next to
+    # the spool by default.
+    history_write_behind: bool = False
+    history_spool_path: Optional[str] = None
+    history_spill_path: Optional[str] = None
+    history_batch_size: int = 500
+    history_flush_interval: float = 1.0  # seconds
+    history_max_pending: int = 10000
+
+    # Retention of the history table: rows older than history_retention_days are moved to
+    # history_archive every history_archive_interval seconds. history_archive_path keeps the
+    # archive in a separate SQLite file instead of the main database.
+    history_retention_days: Optional[int] = None
+    history_archive_interval: int = 3600  # seconds
+    history_archive_batch_size: int = 10000
+    history_archive_path: Optional[str] = None
+
+    # Request latency, error and database session metrics, served at /metrics in the Prometheus text format
+    metrics_enabled: bool = False
+
+    # Count and time the SQL statements of each request. Statements slower than
+    # sql_slow_query_threshold seconds are logged with their parameters and plan, and SQL run
+    # sql_n_plus_one_threshold times in one request is logged as an N+1 suspect. With debug,
+    # responses carry X-DB-Query-Count and X-DB-Query-Time (milliseconds).
+    sql_instrumentation: bool = False
+    sql_slow_query_threshold: Optional[float] = 0.5  # seconds
+    sql_explain_slow_queries: bool = True
+    sql_n_plus_one_threshold: int = 5
     
     class Config:
         validate_assignment = True
@@ -36,10 +116,19 @@ class AppSettings(BaseAppSettings):
         }
     
     def configure_logging(self) -> None:
-        logging.getLogger().handlers = [InterceptHandler()]
+        logging.getLogger().handlers = [InterceptHandler(level=self.logging_level)]
         for logger_name in self.loggers:
             logging_logger = logging.getLogger(logger_name)
             logging_logger.handlers = [InterceptHandler(level=self.logging_level)]
 
-        logger.configure(handlers=[{"sink": sys.stderr, "level": self.logging_level}])
+        logger.configure(
+            handlers=[{
+                "sink": sys.stderr,
+                "level": self.logging_level,
+                "format": json_formatter if self.log_json else TEXT_FORMAT,
+                "filter": RequestLogSampler(self.log_sample_rate, self.log_route_sample_rates),
+                "enqueue": self.log_enqueue,
+            }],
+            patcher=add_request_id,
+        )
             
\ No newline at end of file
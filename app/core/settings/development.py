@@ -5,6 +5,7 @@ class DevAppSettings(AppSettings):
     debug: bool = True
     title: str = "Dev - Alfred AI FastAPI Application"
     logging_level: int = logging.DEBUG
+    database_auto_migrate: bool = True
     
     class Config(AppSettings.Config):
         env_file = "dev.env"
\ No newline at end of file
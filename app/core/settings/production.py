@@ -1,5 +1,7 @@
 from app.core.settings.app import AppSettings
 
 class ProdAppSettings(AppSettings):
+    log_json: bool = True
+
     class Config(AppSettings.Config):
         env_file = "prod.env"
\ No newline at end of file
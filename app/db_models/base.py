@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, MetaData
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, MetaData, Index, DDL, event
 from sqlalchemy.orm import relationship, declarative_base, foreign
 
 Base = declarative_base()
@@ -20,6 +20,15 @@ class Project(Base):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Serve the equality filters of the ticket listing in id (keyset) order
+        Index("ix_tickets_project_id", "project_id", "id"),
+        Index("ix_tickets_project_kanban_status", "project_id", "kanban_status_id", "id"),
+        Index("ix_tickets_kanban_status", "kanban_status_id", "id"),
+        Index("ix_tickets_status", "status", "id"),
+        Index("ix_tickets_priority", "priority", "id"),
+        Index("ix_tickets_updated_at", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(255), nullable=False)
@@ -59,9 +68,60 @@ class KanbanStatus(Base):
     def __repr__(self):
         return f"<KanbanStatus(id={self.id}, name={self.name})>"
 
+class TicketCounter(Base):
+    """
+    Number of tickets per (project, kanban status), maintained by TicketCRUD in the same
+    transaction as every ticket write. TicketCounterCRUD.rebuild() recomputes it.
+    """
+    __tablename__ = "ticket_counters"
+
+    # No foreign keys: counters are derived data and must not block deleting a project or status
+    project_id = Column(Integer, primary_key=True)
+    kanban_status_id = Column(Integer, primary_key=True)
+    ticket_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TicketCounter(project_id={self.project_id}, kanban_status_id={self.kanban_status_id}, ticket_count={self.ticket_count})>"
+
+class ImportCheckpoint(Base):
+    """
+    Progress of a named bulk import: the number of input rows committed so far.
+
+    Written in the same transaction as each imported chunk, so a failed import resumes
+    exactly after the last chunk that reached the database.
+    """
+    __tablename__ = "import_checkpoints"
+
+    job = Column(String(255), primary_key=True)
+    entity_type = Column(String(50), nullable=False)
+    rows_committed = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), onupdate=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def __repr__(self):
+        return f"<ImportCheckpoint(job={self.job}, entity_type={self.entity_type}, rows_committed={self.rows_committed})>"
+
+class CollectionVersion(Base):
+    """
+    Version of a whole table, bumped in the same transaction as every write to it.
+
+    Read by primary key to build the ETag of list endpoints without scanning the table.
+    """
+    __tablename__ = "collection_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<CollectionVersion(name={self.name}, version={self.version})>"
+
 class History(Base):
     __tablename__ = "history"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Serves entity lookups and keyset pagination ordered by (timestamp, id)
+        Index("ix_history_entity_timestamp", "entity_type", "entity_id", "timestamp", "id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     entity_type = Column(String(50), nullable=False)  # "Project" or "Ticket"
@@ -74,14 +134,41 @@ class History(Base):
     def __repr__(self):
         return f"<History(id={self.id}, entity_type={self.entity_type}, entity_id={self.entity_id}, change_type={self.change_type})>"
 
+# History rows older than the retention period are moved here by HistoryCRUD.archive().
+# With history_archive_path set (SQLite only), the table lives in that file instead, attached
+# to every connection as the "archive" schema (app.db_models.session) and created there at
+# startup (app.db_models.schema). The main database then has no table of that name, so
+# SQLite resolves the unqualified name to the archive.
+HISTORY_ARCHIVE_SCHEMA = "archive"
+
+class HistoryArchive(Base):
+    __tablename__ = "history_archive"
+    __table_args__ = (
+        Index("ix_history_archive_entity_timestamp", "entity_type", "entity_id", "timestamp", "id"),
+        # Serves the archive watermark, max(timestamp)
+        Index("ix_history_archive_timestamp", "timestamp"),
+    )
+
+    # Rows keep the id they had in the history table
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    change_type = Column(String(50), nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    details = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<HistoryArchive(id={self.id}, entity_type={self.entity_type}, entity_id={self.entity_id}, change_type={self.change_type})>"
+
 def add_relationships():
     Project.tickets = relationship("Ticket", back_populates="project")
     Project.kanban_board = relationship("KanbanBoard", back_populates="projects")
-    Project.history = relationship("History", back_populates="project", primaryjoin="and_(Project.id==foreign(History.entity_id), History.entity_type=='project')", overlaps="ticket")
+    Project.history = relationship("History", back_populates="project", primaryjoin="and_(Project.id==foreign(History.entity_id), History.entity_type=='project')", overlaps="ticket", viewonly=True)
 
     Ticket.project = relationship("Project", back_populates="tickets")
     Ticket.kanban_status = relationship('KanbanStatus', back_populates='tickets')
-    Ticket.history = relationship("History", back_populates="ticket", primaryjoin="and_(Ticket.id==foreign(History.entity_id), History.entity_type=='ticket')", overlaps="project")
+    Ticket.history = relationship("History", back_populates="ticket", primaryjoin="and_(Ticket.id==foreign(History.entity_id), History.entity_type=='ticket')", overlaps="project", viewonly=True)
 
     KanbanBoard.projects = relationship('Project', back_populates='kanban_board')
     KanbanBoard.statuses = relationship('KanbanStatus', back_populates='kanban_board')
@@ -93,3 +180,37 @@ def add_relationships():
     History.ticket = relationship("Ticket", back_populates="history", primaryjoin="and_(foreign(History.entity_id)==Ticket.id, History.entity_type=='ticket')", viewonly=True)
 
 add_relationships()
+
+# Full-text search over ticket titles and descriptions.
+# SQLite: an external content FTS5 table kept in sync by triggers, so every write path
+# (ORM, bulk inserts, set-based updates) updates the index.
+# Postgres: a GIN index over the same tsvector expression the search query uses.
+TICKET_SEARCH_TABLE = "tickets_fts"
+TICKET_SEARCH_CONFIG = "english"
+TICKET_SEARCH_VECTOR = f"to_tsvector('{TICKET_SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+TICKET_SEARCH_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TICKET_SEARCH_TABLE} USING fts5("
+    "title, description, content='tickets', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN "
+    f"INSERT INTO {TICKET_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN "
+    f"INSERT INTO {TICKET_SEARCH_TABLE}({TICKET_SEARCH_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN "
+    f"INSERT INTO {TICKET_SEARCH_TABLE}({TICKET_SEARCH_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {TICKET_SEARCH_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+TICKET_SEARCH_POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_tickets_search ON tickets USING GIN ({TICKET_SEARCH_VECTOR})",
+]
+
+def add_search_index():
+    for statement in TICKET_SEARCH_SQLITE_DDL:
+        event.listen(Ticket.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(Ticket.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {TICKET_SEARCH_TABLE}").execute_if(dialect="sqlite"))
+    for statement in TICKET_SEARCH_POSTGRES_DDL:
+        event.listen(Ticket.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+add_search_index()
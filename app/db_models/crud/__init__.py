@@ -3,3 +3,16 @@ from .project_crud import ProjectCRUD
 from .ticket_crud import TicketCRUD
 from .kanban_board_crud import KanbanBoardCRUD
 from .kanban_status_crud import KanbanStatusCRUD
+from .ticket_counter_crud import TicketCounterCRUD
+from .collection_version_crud import CollectionVersionCRUD
+from .import_crud import ImportCRUD
+from .async_crud import (
+    AsyncBaseCRUD,
+    AsyncProjectCRUD,
+    AsyncTicketCRUD,
+    AsyncKanbanBoardCRUD,
+    AsyncKanbanStatusCRUD,
+    AsyncHistoryCRUD,
+    AsyncTicketCounterCRUD,
+    AsyncImportCRUD,
+)
@@ -0,0 +1,212 @@
+from typing import Any, Dict, List, Optional
+import anyio
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db_models.base import History, ImportCheckpoint, Project, Ticket
+from app.db_models.session import AnySession
+from app.db_models.crud.base_crud import BaseCRUD
+from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.crud.import_crud import ImportCRUD
+from app.db_models.crud.kanban_board_crud import KanbanBoardCRUD
+from app.db_models.crud.kanban_status_crud import KanbanStatusCRUD
+from app.db_models.crud.project_crud import ProjectCRUD
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+
+
+class AsyncBaseCRUD:
+    """
+    Awaitable counterpart of BaseCRUD.
+
+    Each call runs the matching sync CRUD method, so both stacks share one implementation.
+    With an AsyncSession the method runs through ``run_sync`` on the async driver and never
+    blocks the event loop; with a plain Session it is offloaded to a worker thread.
+    """
+    crud_class = BaseCRUD
+
+    def __init__(self, db: AnySession, model=None):
+        self.db = db
+        self.model = model
+
+    def _sync_crud(self, session: Session):
+        if self.model is not None:
+            return self.crud_class(session, self.model)
+        return self.crud_class(session)
+
+    async def _call(self, method: str, *args, **kwargs) -> Any:
+        def call(session: Session) -> Any:
+            return getattr(self._sync_crud(session), method)(*args, **kwargs)
+
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(call)
+        return await anyio.to_thread.run_sync(call, self.db)
+
+    async def create(self, **kwargs):
+        """
+        Create a new record.
+        """
+        return await self._call("create", **kwargs)
+
+    async def get(self, id: int):
+        """
+        Retrieve a record by its ID.
+        """
+        return await self._call("get", id)
+
+    async def get_all(self, *args, **kwargs):
+        """
+        Retrieve all records, with the pagination arguments of the sync CRUD class.
+        """
+        return await self._call("get_all", *args, **kwargs)
+
+    async def version(self) -> tuple:
+        """
+        Return the row count and latest updated_at of the table.
+        """
+        return await self._call("version")
+
+    async def update(self, id: int, **kwargs):
+        """
+        Update an existing record.
+        """
+        return await self._call("update", id, **kwargs)
+
+    async def delete(self, id: int):
+        """
+        Delete a record by its ID.
+        """
+        return await self._call("delete", id)
+
+
+class AsyncProjectCRUD(AsyncBaseCRUD):
+    """
+    Awaitable CRUD operations for Project model.
+    """
+    crud_class = ProjectCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def update_status(self, project_id: int, new_status: str, user_id: int) -> Project:
+        """
+        Update the status of a project and create a history entry.
+        """
+        return await self._call("update_status", project_id, new_status, user_id)
+
+
+class AsyncTicketCRUD(AsyncBaseCRUD):
+    """
+    Awaitable CRUD operations for Ticket model.
+    """
+    crud_class = TicketCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def update_status(self, ticket_id: int, new_status: str, user_id: int) -> Optional[Ticket]:
+        """
+        Update the status of a ticket and create a history entry.
+        """
+        return await self._call("update_status", ticket_id, new_status, user_id)
+
+    async def search(self, q: str, limit: int = 10, cursor: Optional[str] = None) -> List[Row]:
+        """
+        Full-text search over ticket titles and descriptions, best matches first.
+        """
+        return await self._call("search", q, limit, cursor)
+
+    async def bulk_create(self, tickets: List[Dict[str, Any]]) -> List[Row]:
+        """
+        Create many tickets in a single transaction.
+        """
+        return await self._call("bulk_create", tickets)
+
+    async def bulk_update_status(self, new_status: str, user_id: int, ticket_ids: Optional[List[int]] = None,
+                                 kanban_status_id: Optional[int] = None, new_kanban_status_id: Optional[int] = None) -> int:
+        """
+        Update the status of many tickets and record a history entry for each.
+        """
+        return await self._call("bulk_update_status", new_status, user_id, ticket_ids=ticket_ids,
+                                kanban_status_id=kanban_status_id, new_kanban_status_id=new_kanban_status_id)
+
+
+class AsyncKanbanBoardCRUD(AsyncBaseCRUD):
+    """
+    Awaitable CRUD operations for KanbanBoard model.
+    """
+    crud_class = KanbanBoardCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def get_view(self, id: int, tickets_per_column: int = 20) -> Optional[Dict[str, Any]]:
+        """
+        Load a board with its statuses and the first tickets of each status, by ID.
+        """
+        return await self._call("get_view", id, tickets_per_column)
+
+
+class AsyncKanbanStatusCRUD(AsyncBaseCRUD):
+    """
+    Awaitable CRUD operations for KanbanStatus model.
+    """
+    crud_class = KanbanStatusCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+
+class AsyncHistoryCRUD(AsyncBaseCRUD):
+    """
+    Awaitable CRUD operations for History model.
+    """
+    crud_class = HistoryCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def get_by_entity_id(self, entity_type: str, entity_id: int, skip: int = 0, limit: int = 10,
+                               after: Optional[str] = None, before: Optional[str] = None) -> List[History]:
+        """
+        Retrieve history entries by entity type and entity ID, newest first.
+        """
+        return await self._call("get_by_entity_id", entity_type, entity_id, skip, limit, after=after, before=before)
+
+
+class AsyncTicketCounterCRUD(AsyncBaseCRUD):
+    """
+    Awaitable access to the ticket counters.
+    """
+    crud_class = TicketCounterCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def project_stats(self, project_id: int) -> Dict[str, Any]:
+        """
+        Ticket counts of a project, per kanban status and in total.
+        """
+        return await self._call("project_stats", project_id)
+
+    async def board_stats(self, board_id: int) -> Dict[str, Any]:
+        """
+        Ticket counts of every status (column) of a board, across projects, and in total.
+        """
+        return await self._call("board_stats", board_id)
+
+
+class AsyncImportCRUD(AsyncBaseCRUD):
+    """
+    Awaitable access to the checkpoints of import jobs.
+    """
+    crud_class = ImportCRUD
+
+    def __init__(self, db: AnySession):
+        super().__init__(db)
+
+    async def get_checkpoint(self, job: str) -> Optional[ImportCheckpoint]:
+        """
+        Retrieve the checkpoint of an import job, if it has committed any chunk.
+        """
+        return await self._call("get_checkpoint", job)
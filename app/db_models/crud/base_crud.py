@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from app.db_models.crud.collection_version_crud import CollectionVersionCRUD
+from app.db_models.crud.unit_of_work import UnitOfWork
 from abc import ABC, abstractmethod
 
 class CRUDInterface(ABC):
@@ -34,14 +36,22 @@ class BaseCRUD(CRUDInterface):
         self.db = db
         self.model = model
 
+    def session_scope(self) -> UnitOfWork:
+        """
+        Provide a transactional scope around a series of operations.
+
+        Only the outermost scope on a session commits, so writes made by several CRUD
+        helpers inside it are committed once.
+        """
+        return UnitOfWork(self.db)
+
     def create(self, **kwargs):
         """
         Create a new record.
         """
-        item = self.model(**kwargs)
-        self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        with self.session_scope():
+            item = self.model(**kwargs)
+            self.db.add(item)
         return item
 
     def get(self, id: int):
@@ -56,21 +66,28 @@ class BaseCRUD(CRUDInterface):
         """
         return self.db.query(self.model).all()
 
+    def version(self) -> tuple:
+        """
+        Return the version of the whole table, read from its collection_versions row.
+
+        Every committed insert, update and delete made through a session changes it.
+        """
+        return CollectionVersionCRUD(self.db).get(self.model.__tablename__)
+
     def update(self, id: int, **kwargs):
         """
         Update an existing record.
         """
-        item = self.get(id)
-        for key, value in kwargs.items():
-            setattr(item, key, value)
-        self.db.commit()
-        self.db.refresh(item)
+        with self.session_scope():
+            item = self.get(id)
+            for key, value in kwargs.items():
+                setattr(item, key, value)
         return item
 
     def delete(self, id: int):
         """
         Delete a record by its ID.
         """
-        item = self.get(id)
-        self.db.delete(item)
-        self.db.commit()
+        with self.session_scope():
+            item = self.get(id)
+            self.db.delete(item)
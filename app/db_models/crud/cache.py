@@ -0,0 +1,227 @@
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.config import get_app_settings
+
+PENDING_INVALIDATIONS_KEY = "pending_cache_invalidations"
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached rows.
+
+    Values are plain dicts of column values, so a shared backend (e.g. Redis or memcached)
+    only needs to serialize them to be used by several workers.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> None:
+        """
+        Drop every key starting with prefix.
+        """
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Process-local cache with per-entry TTL and LRU eviction.
+    """
+    def __init__(self, ttl: float = 60, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    Build the backend named by the cache_backend setting.
+
+    "memory" selects MemoryCacheBackend; any other value is imported as "module:Class" and
+    called with the ttl and max_entries settings.
+    """
+    settings = get_app_settings()
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend(settings.cache_ttl, settings.cache_max_entries)
+    module_name, _, class_name = settings.cache_backend.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(ttl=settings.cache_ttl, max_entries=settings.cache_max_entries)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_cache_backend()
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Replace the backend shared by all model caches, e.g. with a multi-worker one.
+    """
+    global _backend
+    _backend = backend
+
+
+_caches: Dict[str, "ModelCache"] = {}
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Hit and miss counters of every model cache, by namespace.
+    """
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+class ModelCache:
+    """
+    Read-through cache of the rows of one model.
+
+    Rows are stored as column dicts and handed back attached to the caller's session
+    without a query. Writes must call invalidate() with their session, which drops every
+    cached row and list of the model once the transaction ends.
+    """
+    def __init__(self, model, namespace: str):
+        self.model = model
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        _caches[namespace] = self
+
+    @property
+    def enabled(self) -> bool:
+        return get_app_settings().cache_enabled
+
+    def _key(self, *parts: Any) -> str:
+        return ":".join([self.namespace, *map(str, parts)])
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _to_values(self, item) -> Dict[str, Any]:
+        return {attr.key: getattr(item, attr.key) for attr in inspect(self.model).column_attrs}
+
+    def _to_instance(self, db: Session, values: Dict[str, Any]):
+        item = self.model(**values)
+        make_transient_to_detached(item)
+        return db.merge(item, load=False)
+
+    def get(self, db: Session, id: int, load: Callable[[], Any]):
+        """
+        Return the row with the given ID, calling load() on a miss.
+        """
+        if not self.enabled:
+            return load()
+        backend = get_cache_backend()
+        values = backend.get(self._key("id", id))
+        self._count(values is not None)
+        if values is not None:
+            return self._to_instance(db, values)
+        item = load()
+        if item is not None:
+            backend.set(self._key("id", id), self._to_values(item))
+        return item
+
+    def get_list(self, db: Session, key: tuple, load: Callable[[], List[Any]]) -> List[Any]:
+        """
+        Return a list of rows cached under key, calling load() on a miss.
+        """
+        if not self.enabled:
+            return load()
+        backend = get_cache_backend()
+        rows = backend.get(self._key("list", *key))
+        self._count(rows is not None)
+        if rows is not None:
+            return [self._to_instance(db, values) for values in rows]
+        items = load()
+        backend.set(self._key("list", *key), [self._to_values(item) for item in items])
+        return items
+
+    def get_value(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """
+        Return a plain value derived from the rows, e.g. their version, calling load() on a miss.
+        """
+        if not self.enabled:
+            return load()
+        backend = get_cache_backend()
+        value = backend.get(self._key("value", *key))
+        self._count(value is not None)
+        if value is None:
+            value = load()
+            backend.set(self._key("value", *key), value)
+        return value
+
+    def invalidate(self, db: Optional[Session] = None) -> None:
+        """
+        Drop every cached row and list of the model.
+
+        Inside a transaction on db, they are dropped after it commits or rolls back: dropped
+        earlier, a concurrent reader could cache the rows being replaced again.
+        """
+        if db is not None and db.in_transaction():
+            db.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(self._key(""))
+            return
+        get_cache_backend().clear(self._key(""))
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_pending_invalidations(session: Session) -> None:
+    # Also on rollback, as reads in the transaction may have cached the rows it changed
+    prefixes = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if prefixes:
+        backend = get_cache_backend()
+        for prefix in prefixes:
+            backend.clear(prefix)
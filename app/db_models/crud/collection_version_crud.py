@@ -0,0 +1,84 @@
+import datetime
+from typing import Iterable, Optional
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.db_models.base import CollectionVersion
+
+# Tables whose list endpoints are versioned
+VERSIONED_TABLES = frozenset({"projects", "tickets", "kanban_boards"})
+
+PENDING_VERSION_BUMPS_KEY = "pending_collection_version_bumps"
+
+
+class CollectionVersionCRUD:
+    """
+    Versions of whole tables, one row per table.
+
+    Every session write to a table of VERSIONED_TABLES, flushed or executed as an insert,
+    update or delete statement, bumps its version once per transaction, just before the
+    commit. Writes that bypass the session (raw connections, text SQL) must call bump().
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def version_query(name: str) -> Select:
+        return select(CollectionVersion.version, CollectionVersion.updated_at).where(CollectionVersion.name == name)
+
+    def get(self, name: str) -> tuple:
+        """
+        Return the version number and the time of the last bump of a table, (0, None) if never written.
+        """
+        row = self.db.execute(self.version_query(name)).one_or_none()
+        return tuple(row) if row is not None else (0, None)
+
+    def bump(self, names: Iterable[str]) -> None:
+        """
+        Increment the versions of the given tables, creating missing ones, in the current transaction.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [{"name": name, "version": 1, "updated_at": now} for name in sorted(names)]
+        if not rows:
+            return
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(CollectionVersion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CollectionVersion.name],
+            set_={"version": CollectionVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+        )
+        self.db.execute(stmt, rows)
+
+
+def _record_writes(session: Session, tables: Iterable[Optional[str]]) -> None:
+    written = VERSIONED_TABLES.intersection(tables)
+    if written:
+        session.info.setdefault(PENDING_VERSION_BUMPS_KEY, set()).update(written)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_writes(session: Session, flush_context) -> None:
+    _record_writes(session, (getattr(item, "__tablename__", None)
+                             for item in (*session.new, *session.dirty, *session.deleted)))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_executed_writes(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _record_writes(orm_execute_state.session, [getattr(table, "name", None)])
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_written_versions(session: Session) -> None:
+    # Flush first: the commit flushes after this hook, too late to record the writes
+    session.flush()
+    names = session.info.pop(PENDING_VERSION_BUMPS_KEY, None)
+    if names:
+        CollectionVersionCRUD(session).bump(names)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_bumps(session: Session) -> None:
+    session.info.pop(PENDING_VERSION_BUMPS_KEY, None)
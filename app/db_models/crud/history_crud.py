@@ -1,34 +1,40 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, tuple_, union_all
+from sqlalchemy.sql import CompoundSelect, Select
 from sqlalchemy.exc import SQLAlchemyError
-from app.db_models.base import History
-from typing import List, Optional, Generator
+from app.db_models.base import History, HistoryArchive
+from app.db_models.crud.cache import get_cache_backend
+from app.db_models.crud.pagination import encode_cursor, decode_cursor, parse_cursor_datetime
+from app.db_models.crud.unit_of_work import UnitOfWork
+from app.db_models.crud.history_writer import PENDING_HISTORY_KEY, get_history_writer
+from typing import Any, Dict, List, Optional
+import datetime
 import logging
-from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+ARCHIVE_WATERMARK_KEY = "history_archive:watermark"
+
 class HistoryCRUD:
     """
     CRUD operations for History model.
+
+    Reads fall back to the history_archive table only when the entries asked for may have
+    been archived, i.e. reach back to the archive watermark (its newest timestamp). The
+    cached watermark is read again before a short page or a missing entry is returned.
     """
     def __init__(self, db: Session):
         self.db = db
 
-    @contextmanager
-    def session_scope(self) -> Generator[None, None, None]:
+    def session_scope(self) -> UnitOfWork:
         """
         Provide a transactional scope around a series of operations.
+
+        Inside an enclosing scope, e.g. a ticket status change, it only flushes, so the entry
+        is committed together with the change it records.
         """
-        try:
-            yield
-            self.db.commit()
-        except SQLAlchemyError as e:
-            self.db.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            self.db.close()
+        return UnitOfWork(self.db)
 
     def create(self, **kwargs) -> History:
         """
@@ -39,30 +45,192 @@ class HistoryCRUD:
         with self.session_scope():
             item = History(**kwargs)
             self.db.add(item)
-            self.db.flush()  # Ensure the item is flushed to the session
-            self.db.refresh(item)
-            return item
+        return item
+
+    def record(self, **kwargs) -> None:
+        """
+        Record a history entry of a change made in the current transaction.
+
+        Without a history writer this is create(). With one, the entry is handed to the
+        writer when the transaction commits, and dropped if it rolls back.
+        """
+        self.record_many([kwargs])
+
+    def record_many(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Record many history entries, with one batched INSERT when written synchronously.
+        """
+        if any(entry.get('entity_id') is None for entry in entries):
+            raise ValueError("entity_id cannot be None")
+        writer = get_history_writer()
+        if writer is None:
+            with self.session_scope():
+                if len(entries) == 1:
+                    self.db.add(History(**entries[0]))
+                else:
+                    self.db.execute(insert(History), entries)
+            return
+        # Stamped now: the writer inserts them later
+        now = datetime.datetime.now(datetime.timezone.utc)
+        entries = [{"timestamp": now, **entry} for entry in entries]
+        if self.db.in_transaction():
+            self.db.info.setdefault(PENDING_HISTORY_KEY, []).extend(entries)
+        else:
+            writer.submit(entries)
 
     def get(self, id: int) -> Optional[History]:
         """
         Retrieve a history entry by its ID.
         """
         try:
-            return self.db.query(History).filter(History.id == id).one_or_none()
+            item = self.db.query(History).filter(History.id == id).one_or_none()
+            if item is None and self.archive_watermark(refresh=True) is not None:
+                item = self.db.get(HistoryArchive, id)
+            return item
         except SQLAlchemyError as e:
             logger.error(f"Database error: {e}")
             raise
 
-    def get_by_entity_id(self, entity_type: str, entity_id: int, skip: int = 0, limit: int = 10) -> List[History]:
+    def get_by_entity_id(self, entity_type: str, entity_id: int, skip: int = 0, limit: int = 10,
+                         after: Optional[str] = None, before: Optional[str] = None) -> List[History]:
         """
-        Retrieve history entries by entity type and entity ID with pagination.
+        Retrieve history entries by entity type and entity ID, newest first.
+
+        Pages are served from the (entity_type, entity_id, timestamp, id) index. Pass the
+        cursor of the last entry as ``before`` to get the next (older) page, or the cursor of
+        the first entry as ``after`` to get the previous (newer) page; ``skip`` is ignored
+        when a cursor is given. Archived entries are merged in when the page reaches back
+        to the archive watermark.
+
+        :raises ValueError: If both cursors are given or a cursor is malformed.
         """
+        if after is not None and before is not None:
+            raise ValueError("Only one of 'after' and 'before' can be given")
+        after_key = self._decode_cursor(after) if after is not None else None
+        before_key = self._decode_cursor(before) if before is not None else None
+        offset = skip if after_key is None and before_key is None else 0
         try:
-            return self.db.query(History).filter(History.entity_type == entity_type, History.entity_id == entity_id).offset(skip).limit(limit).all()
+            hot = self._entity_query(History, entity_type, entity_id, after_key, before_key)
+            entries = self.db.execute(hot.offset(offset).limit(limit)).scalars().all()
+            if self._needs_archive(entries, limit, after_key):
+                archived = self._entity_query(HistoryArchive, entity_type, entity_id, after_key, before_key)
+                window = offset + limit
+                entries = sorted(
+                    [*self.db.execute(hot.limit(window)).scalars(), *self.db.execute(archived.limit(window)).scalars()],
+                    key=lambda entry: (entry.timestamp, entry.id), reverse=after_key is None,
+                )[offset:window]
+            return list(reversed(entries)) if after_key is not None else entries
         except SQLAlchemyError as e:
             logger.error(f"Database error: {e}")
             raise
 
+    @staticmethod
+    def _entity_query(model, entity_type: str, entity_id: int, after_key: Optional[tuple], before_key: Optional[tuple]) -> Select:
+        query = select(model).where(model.entity_type == entity_type, model.entity_id == entity_id)
+        sort_key = tuple_(model.timestamp, model.id)
+        if after_key is not None:
+            return query.where(sort_key > tuple_(*after_key)).order_by(model.timestamp.asc(), model.id.asc())
+        if before_key is not None:
+            query = query.where(sort_key < tuple_(*before_key))
+        return query.order_by(model.timestamp.desc(), model.id.desc())
+
+    def _needs_archive(self, entries: List[History], limit: int, after_key: Optional[tuple]) -> bool:
+        if self._reaches_archive(entries, limit, after_key, self.archive_watermark()):
+            return True
+        # The cached watermark may predate an archive run of another worker. Archived entries
+        # are older than the entries left, so only a short page or a newer page can reach them.
+        if after_key is None and len(entries) == limit:
+            return False
+        return self._reaches_archive(entries, limit, after_key, self.archive_watermark(refresh=True))
+
+    @staticmethod
+    def _reaches_archive(entries: List[History], limit: int, after_key: Optional[tuple],
+                         watermark: Optional[datetime.datetime]) -> bool:
+        if watermark is None:
+            return False
+        if after_key is not None:
+            # Archived entries are no newer than the watermark
+            return after_key[0] <= watermark
+        return len(entries) < limit or entries[-1].timestamp <= watermark
+
+    def archive_watermark(self, refresh: bool = False) -> Optional[datetime.datetime]:
+        """
+        Timestamp of the newest archived entry, or None if nothing was archived.
+
+        Kept in the cache backend, so full pages of recent history do not touch the archive.
+        With refresh, it is read from the database again: the cache may be local to this
+        process and stale after another process archived entries.
+        """
+        backend = get_cache_backend()
+        cached = None if refresh else backend.get(ARCHIVE_WATERMARK_KEY)
+        if cached is None:
+            cached = {"watermark": self.db.scalar(select(func.max(HistoryArchive.timestamp)))}
+            backend.set(ARCHIVE_WATERMARK_KEY, cached)
+        return cached["watermark"]
+
+    def archive(self, older_than: datetime.datetime, batch_size: int = 10000) -> int:
+        """
+        Move the entries recorded before older_than to the history_archive table.
+
+        Entries move batch_size at a time, each batch copied and deleted in one short
+        transaction, so writers are never blocked for long.
+
+        :param older_than: Archive the entries with an earlier timestamp.
+        :param batch_size: Number of entries moved per transaction.
+        :return: The number of entries archived.
+        """
+        columns = [column.name for column in History.__table__.columns]
+        archived = 0
+        while True:
+            ids = select(History.id).where(History.timestamp < older_than).order_by(History.id).limit(batch_size)
+            with self.session_scope():
+                batch = self.db.scalars(ids).all()
+                if batch:
+                    self.db.execute(insert(HistoryArchive).from_select(
+                        columns, select(*History.__table__.columns).where(History.id.in_(batch))))
+                    self.db.execute(delete(History).where(History.id.in_(batch)))
+            if not batch:
+                break
+            archived += len(batch)
+            get_cache_backend().clear(ARCHIVE_WATERMARK_KEY)
+            if len(batch) < batch_size:
+                break
+        logger.info(f"Archived {archived} history entries older than {older_than}")
+        return archived
+
+    @staticmethod
+    def export_query(since: Optional[datetime.datetime] = None, entity_type: Optional[str] = None) -> CompoundSelect:
+        """
+        Build the query of a history export: plain history columns, archived entries
+        included, in ID order.
+
+        :param since: Only export the entries recorded at or after this time.
+        :param entity_type: Only export the entries of this entity type.
+        """
+        queries = []
+        for model in (History, HistoryArchive):
+            query = select(*model.__table__.columns)
+            if since is not None:
+                query = query.where(model.timestamp >= since)
+            if entity_type is not None:
+                query = query.where(model.entity_type == entity_type)
+            queries.append(query)
+        return union_all(*queries).order_by("id")
+
+    @staticmethod
+    def cursor_for(entry: History) -> str:
+        """
+        Build the pagination cursor pointing at a history entry.
+        """
+        return encode_cursor(entry.timestamp, entry.id)
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        timestamp, id = decode_cursor(cursor, 2)
+        if not isinstance(id, int):
+            raise ValueError("Invalid cursor")
+        return parse_cursor_datetime(timestamp), id
+
     def update(self, id: int, **kwargs) -> History:
         """
         Update an existing history entry.
@@ -73,9 +241,7 @@ class HistoryCRUD:
                 raise ValueError(f"History entry with id {id} does not exist")
             for key, value in kwargs.items():
                 setattr(item, key, value)
-            self.db.flush()  # Ensure the item is flushed to the session
-            self.db.refresh(item)
-            return item
+        return item
 
     def delete(self, id: int) -> Optional[History]:
         """
@@ -86,5 +252,4 @@ class HistoryCRUD:
             if item is None:
                 raise ValueError(f"History entry with id {id} does not exist")
             self.db.delete(item)
-            self.db.flush()  # Ensure the item is flushed to the session
-            return item
+        return item
@@ -0,0 +1,405 @@
+import datetime
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import get_app_settings
+from app.db_models.base import History
+import logging
+
+logger = logging.getLogger(__name__)
+
+PENDING_HISTORY_KEY = "pending_history"
+
+# Errors a batch gets every time it is written; others (locks, disconnects) are retried
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+# Longest wait between two writes of a batch that keeps failing, in seconds
+MAX_RETRY_DELAY = 60.0
+
+
+class HistoryBuffer(ABC):
+    """
+    Entries waiting to be written by the HistoryWriter.
+
+    take() hands out a batch, which stays in the buffer until commit() (written) or
+    rollback() (retried by the next take()).
+    """
+
+    @abstractmethod
+    def append(self, entries: List[Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def take(self, limit: int) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryHistoryBuffer(HistoryBuffer):
+    """
+    In-process buffer; entries not yet written are lost if the process dies.
+    """
+    def __init__(self):
+        self._entries: deque = deque()
+        self._taken: List[Dict[str, Any]] = []
+
+    def append(self, entries: List[Dict[str, Any]]) -> None:
+        self._entries.extend(entries)
+
+    def take(self, limit: int) -> List[Dict[str, Any]]:
+        if not self._taken:
+            self._taken = [self._entries.popleft() for _ in range(min(limit, len(self._entries)))]
+        return self._taken
+
+    def commit(self) -> None:
+        self._taken = []
+
+    def rollback(self) -> None:
+        # Kept in _taken, so the same batch is retried first
+        pass
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._taken)
+
+
+class SpoolHistoryBuffer(HistoryBuffer):
+    """
+    Append-only NDJSON spool file, which survives a crash of the process.
+
+    take() renames the spool to a segment file and starts a new spool, then hands out the
+    segment limit entries at a time; commit() removes the entries taken from the segment,
+    and deletes it once it is empty. A segment or spool left behind by a crash is written
+    at the next start.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.segment_path = f"{path}.flushing"
+        self._count = self._count_lines(path) + self._count_lines(self.segment_path)
+        self._taken: List[Dict[str, Any]] = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as spool:
+            return sum(1 for line in spool if line.strip())
+
+    def append(self, entries: List[Dict[str, Any]]) -> None:
+        self._file.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+        self._file.flush()
+        self._count += len(entries)
+
+    def take(self, limit: int) -> List[Dict[str, Any]]:
+        if self._taken:
+            return self._taken
+        if not os.path.exists(self.segment_path):
+            self._file.close()
+            os.replace(self.path, self.segment_path)
+            self._file = open(self.path, "a", encoding="utf-8")
+        with open(self.segment_path, encoding="utf-8") as segment:
+            self._taken = [self._parse(line) for line in islice((line for line in segment if line.strip()), limit)]
+        if not self._taken:
+            os.remove(self.segment_path)
+        return self._taken
+
+    @staticmethod
+    def _parse(line: str) -> Dict[str, Any]:
+        entry = json.loads(line)
+        entry["timestamp"] = datetime.datetime.fromisoformat(entry["timestamp"])
+        return entry
+
+    def commit(self) -> None:
+        with open(self.segment_path, encoding="utf-8") as segment:
+            rest = list(islice((line for line in segment if line.strip()), len(self._taken), None))
+        if rest:
+            # Replaced atomically, so a crash leaves either the old or the new segment
+            with open(f"{self.segment_path}.tmp", "w", encoding="utf-8") as remaining:
+                remaining.writelines(rest)
+            os.replace(f"{self.segment_path}.tmp", self.segment_path)
+        else:
+            os.remove(self.segment_path)
+        self._count -= len(self._taken)
+        self._taken = []
+
+    def rollback(self) -> None:
+        self._taken = []
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class HistoryWriter:
+    """
+    Write-behind writer of history entries.
+
+    Entries are buffered and inserted by a background thread with one executemany INSERT
+    per batch, once batch_size entries are pending or flush_interval seconds have passed.
+    submit() never blocks on the database: past max_pending buffered entries, new entries
+    are spilled to the NDJSON file at spill_path, or dropped and counted without one.
+
+    A batch that fails with a lock, connection or other transient error stays in the
+    buffer and is retried, waiting twice as long after each failure (up to MAX_RETRY_DELAY).
+    A batch that can never be written (PERMANENT_ERRORS) is spilled (or dropped) the same
+    way as overflowing entries, so it cannot hold up the entries behind it. It only leaves
+    the buffer once spilled, or dropped when there is no spill_path.
+    """
+    def __init__(self, engine: Engine, buffer: Optional[HistoryBuffer] = None, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_pending: int = 10000, spill_path: Optional[str] = None):
+        self.engine = engine
+        self.buffer = buffer if buffer is not None else MemoryHistoryBuffer()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spill_path = spill_path
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._oldest_pending_at: Optional[float] = time.monotonic() if len(self.buffer) else None
+        self._batch_failures = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.last_flush_lag = 0.0
+        self.max_flush_lag = 0.0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread and write every pending entry.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        while len(self.buffer) and self.flush():
+            pass
+        if len(self.buffer):
+            logger.error(f"{len(self.buffer)} history entries could not be written at shutdown")
+        if isinstance(self.buffer, SpoolHistoryBuffer):
+            self.buffer.close()
+
+    def submit(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Queue entries for writing without waiting, spilling them if the buffer is full.
+
+        Called from commit hooks, which may run on the event loop. Entries without a
+        timestamp are stamped now, not when they are written.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        entries = [{"timestamp": now, **entry} for entry in entries]
+        with self._condition:
+            if len(self.buffer) + len(entries) <= self.max_pending:
+                if self._oldest_pending_at is None:
+                    self._oldest_pending_at = time.monotonic()
+                self.buffer.append(entries)
+                if len(self.buffer) >= self.batch_size:
+                    self._condition.notify_all()
+                return
+        self._spill(entries, "History buffer full")
+
+    def _spill(self, entries: List[Dict[str, Any]], reason: str, keep_on_error: bool = False) -> bool:
+        """
+        Append entries that will not be written to the spill file, or drop them without one.
+
+        The spill file is NDJSON, which the history import reads as it is.
+
+        :param keep_on_error: Keep the entries rather than drop them when the spill file
+            cannot be written, e.g. because they are still in the buffer.
+        :return: False if the entries were kept.
+        """
+        if self.spill_path is not None:
+            try:
+                with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as spill:
+                    spill.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+            except OSError as e:
+                logger.error(f"Error spilling history entries to {self.spill_path}: {e}")
+                if keep_on_error:
+                    return False
+            else:
+                with self._condition:
+                    self.spilled += len(entries)
+                logger.warning(f"{reason}: {len(entries)} history entries spilled to {self.spill_path}")
+                return True
+        with self._condition:
+            self.dropped += len(entries)
+        logger.error(f"{reason}: {len(entries)} history entries dropped: "
+                     f"{json.dumps(entries, default=str)}")
+        return True
+
+    def _insert(self, entries: List[Dict[str, Any]]) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(insert(History), entries)
+
+    def flush(self) -> int:
+        """
+        Write one batch of pending entries.
+
+        :return: The number of entries written; 0 if none were pending or the write failed.
+            A batch that failed on a transient error is retried at the next flush; one
+            that can never be written is spilled.
+        """
+        with self._flush_lock:
+            with self._condition:
+                entries = list(self.buffer.take(self.batch_size))
+                oldest_pending_at = self._oldest_pending_at
+            if not entries:
+                return 0
+            try:
+                self._insert(entries)
+            except PERMANENT_ERRORS as e:
+                logger.error(f"Giving up on {len(entries)} history entries, which cannot be written: {e}")
+                removed = self._spill(entries, "History batch failed", keep_on_error=True)
+                self._failed(removed)
+                return 0
+            except SQLAlchemyError as e:
+                logger.error(f"Error writing {len(entries)} history entries, retrying: {e}")
+                self._failed(False)
+                return 0
+            with self._condition:
+                self.buffer.commit()
+                now = time.monotonic()
+                self.last_flush_lag = now - oldest_pending_at if oldest_pending_at is not None else 0.0
+                self.max_flush_lag = max(self.max_flush_lag, self.last_flush_lag)
+                self._oldest_pending_at = now if len(self.buffer) else None
+                self._batch_failures = 0
+                self.written += len(entries)
+                self.flushes += 1
+                self._condition.notify_all()
+            return len(entries)
+
+    def _failed(self, removed: bool) -> None:
+        """
+        Account for a failed batch, removed from the buffer (spilled or dropped) or kept for a retry.
+        """
+        with self._condition:
+            self.failed_flushes += 1
+            if removed:
+                self.buffer.commit()
+                self._batch_failures = 0
+                self._oldest_pending_at = time.monotonic() if len(self.buffer) else None
+                self._condition.notify_all()
+            else:
+                self.buffer.rollback()
+                self._batch_failures += 1
+
+    def retry_delay(self) -> float:
+        """
+        Seconds to wait before writing again: flush_interval, doubled after each failure in a row.
+        """
+        return min(self.flush_interval * 2 ** min(self._batch_failures, 16), max(self.flush_interval, MAX_RETRY_DELAY))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # After a failed write, back off even when a full batch is pending
+                if self._batch_failures:
+                    deadline = time.monotonic() + self.retry_delay()
+                    while not self._stopping and time.monotonic() < deadline:
+                        self._condition.wait(deadline - time.monotonic())
+                elif not self._stopping and len(self.buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters of the writer, and how far behind it is.
+
+        lag_seconds is the age of the oldest pending entry, 0 when nothing is pending.
+        """
+        with self._condition:
+            oldest_pending_at = self._oldest_pending_at
+            return {
+                "pending": len(self.buffer),
+                "max_pending": self.max_pending,
+                "written": self.written,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "spilled": self.spilled,
+                "dropped": self.dropped,
+                "lag_seconds": time.monotonic() - oldest_pending_at if oldest_pending_at is not None else 0.0,
+                "last_flush_lag_seconds": self.last_flush_lag,
+                "max_flush_lag_seconds": self.max_flush_lag,
+            }
+
+
+def create_history_writer(engine: Engine) -> HistoryWriter:
+    """
+    Build a writer from the history_* settings, spooling to a file when history_spool_path is set.
+
+    Spooled entries are never dropped: without history_spill_path, they spill next to the spool.
+    """
+    settings = get_app_settings()
+    spill_path = settings.history_spill_path
+    if settings.history_spool_path:
+        buffer = SpoolHistoryBuffer(settings.history_spool_path)
+        spill_path = spill_path or f"{settings.history_spool_path}.spill"
+    else:
+        buffer = MemoryHistoryBuffer()
+    return HistoryWriter(engine, buffer, settings.history_batch_size, settings.history_flush_interval,
+                         settings.history_max_pending, spill_path)
+
+
+_writer: Optional[HistoryWriter] = None
+
+
+def get_history_writer() -> Optional[HistoryWriter]:
+    return _writer
+
+
+def set_history_writer(writer: Optional[HistoryWriter]) -> None:
+    """
+    Install the writer used by HistoryCRUD.record, or None to write history synchronously.
+    """
+    global _writer
+    _writer = writer
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending_history(session: Session) -> None:
+    # Entries are only handed to the writer once the change they record is committed
+    entries = session.info.pop(PENDING_HISTORY_KEY, None)
+    writer = get_history_writer()
+    if entries and writer is not None:
+        writer.submit(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_history(session: Session) -> None:
+    session.info.pop(PENDING_HISTORY_KEY, None)
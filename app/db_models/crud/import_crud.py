@@ -0,0 +1,101 @@
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+from app.db_models.base import History, ImportCheckpoint, Project, Ticket
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.crud.unit_of_work import UnitOfWork
+import logging
+
+logger = logging.getLogger(__name__)
+
+IMPORT_MODELS = {"projects": Project, "tickets": Ticket, "history": History}
+
+
+class ImportCRUD:
+    """
+    Chunked inserts of the bulk importer, and the checkpoints of named import jobs.
+
+    insert_chunk() writes the rows of a chunk and the checkpoint of its job in a single
+    transaction, so the checkpoint always matches what was committed.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.ticket_crud = TicketCRUD(db)
+
+    def session_scope(self) -> UnitOfWork:
+        """
+        Provide a transactional scope around a series of operations.
+        """
+        return UnitOfWork(self.db)
+
+    def get_checkpoint(self, job: str) -> Optional[ImportCheckpoint]:
+        """
+        Retrieve the checkpoint of an import job, if it has committed any chunk.
+        """
+        return self.db.get(ImportCheckpoint, job)
+
+    def rows_committed(self, job: str) -> int:
+        """
+        Number of input rows of an import job already committed.
+        """
+        checkpoint = self.get_checkpoint(job)
+        return checkpoint.rows_committed if checkpoint is not None else 0
+
+    def reset_checkpoint(self, job: str) -> None:
+        """
+        Forget the progress of an import job, so that it starts over from the first row.
+        """
+        with self.session_scope():
+            checkpoint = self.get_checkpoint(job)
+            if checkpoint is not None:
+                self.db.delete(checkpoint)
+
+    def existing_ids(self, model, ids: Iterable[int]) -> Set[int]:
+        """
+        Return the subset of ids that exist in the table of model, with one query.
+        """
+        return set(self.db.scalars(select(model.id).where(model.id.in_(set(ids)))))
+
+    def insert_chunk(self, entity: str, rows: List[Dict[str, Any]], job: Optional[str] = None,
+                     rows_committed: int = 0) -> List[int]:
+        """
+        Insert a chunk of validated rows and commit it together with the job checkpoint.
+
+        Tickets go through TicketCRUD.bulk_create so the ticket counters stay in step.
+
+        :param entity: "projects", "tickets" or "history".
+        :param rows: Column values of each row; rows may carry their own id.
+        :param job: The import job to checkpoint, if any.
+        :param rows_committed: Input rows of the job committed once this chunk is.
+        :return: The ids of the inserted rows, in the order given.
+        :raises SQLAlchemyError: If the chunk cannot be written; nothing of it is committed.
+        """
+        model = IMPORT_MODELS[entity]
+        table = model.__table__
+        ids = []
+        with self.session_scope():
+            # executemany needs the same columns in every row: insert runs of rows alike
+            for _, group in groupby(rows, key=tuple):
+                group = list(group)
+                if model is Ticket:
+                    result = self.ticket_crud.bulk_create(group, validate=False)
+                else:
+                    result = self.db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), group).all()
+                ids.extend(row.id for row in result)
+            if any("id" in row for row in rows):
+                self.sync_id_sequence(model)
+            if job is not None:
+                self.db.merge(ImportCheckpoint(job=job, entity_type=entity, rows_committed=rows_committed))
+        logger.info(f"Imported {len(ids)} {entity}")
+        return ids
+
+    def sync_id_sequence(self, model) -> None:
+        """
+        Move the Postgres id sequence past ids inserted explicitly; SQLite needs nothing.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        max_id = self.db.scalar(select(func.max(model.id)))
+        self.db.execute(text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :max_id)"),
+                        {"table": model.__tablename__, "max_id": max_id})
@@ -1,10 +1,94 @@
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased, selectinload
 from app.db_models.crud.base_crud import BaseCRUD
-from app.db_models.base import KanbanBoard
+from app.db_models.crud.cache import ModelCache
+from app.db_models.base import KanbanBoard, Ticket
+
+kanban_board_cache = ModelCache(KanbanBoard, "kanban_board")
 
 class KanbanBoardCRUD(BaseCRUD):
     """
     CRUD operations for KanbanBoard model.
+
+    Reads go through kanban_board_cache and every write invalidates it when its transaction
+    ends. Writes load the board from the database, never from the cache.
     """
+    cache = kanban_board_cache
+
     def __init__(self, db: Session):
         super().__init__(db, KanbanBoard)
+
+    def _load(self, id: int):
+        return super().get(id)
+
+    def get(self, id: int):
+        return self.cache.get(self.db, id, lambda: self._load(id))
+
+    def get_all(self):
+        return self.cache.get_list(self.db, ("all",), lambda: super(KanbanBoardCRUD, self).get_all())
+
+    def version(self) -> tuple:
+        return self.cache.get_value(("version",), lambda: super(KanbanBoardCRUD, self).version())
+
+    def get_view(self, id: int, tickets_per_column: int = 20) -> Optional[Dict[str, Any]]:
+        """
+        Load a board with its statuses and the first tickets of each status, by ID.
+
+        Runs three queries whatever the number of columns: the board, its statuses through
+        selectinload, and one windowed query that keeps the first tickets_per_column
+        tickets of every status and counts them all.
+
+        :param id: The ID of the board.
+        :param tickets_per_column: The maximum number of tickets returned per status, at least 1.
+        :return: The board, with a "columns" list of statuses and their tickets, or None.
+        """
+        board = self.db.execute(
+            select(KanbanBoard).options(selectinload(KanbanBoard.statuses)).where(KanbanBoard.id == id)
+        ).scalars().one_or_none()
+        if board is None:
+            return None
+        statuses = sorted(board.statuses, key=lambda status: status.id)
+
+        columns = {status.id: {"tickets": [], "ticket_count": 0} for status in statuses}
+        if columns:
+            ranked = select(
+                Ticket,
+                func.row_number().over(partition_by=Ticket.kanban_status_id, order_by=Ticket.id).label("position"),
+                func.count().over(partition_by=Ticket.kanban_status_id).label("ticket_count"),
+            ).where(Ticket.kanban_status_id.in_(columns)).subquery()
+            ticket = aliased(Ticket, ranked)
+            rows = self.db.execute(
+                select(ticket, ranked.c.ticket_count)
+                .where(ranked.c.position <= tickets_per_column)
+                .order_by(ranked.c.kanban_status_id, ranked.c.position)
+            ).all()
+            for item, ticket_count in rows:
+                column = columns[item.kanban_status_id]
+                column["tickets"].append(item)
+                column["ticket_count"] = ticket_count
+
+        return {
+            "board": board,
+            "columns": [{"status": status, **columns[status.id]} for status in statuses],
+        }
+
+    def create(self, **kwargs):
+        with self.session_scope():
+            item = super().create(**kwargs)
+            self.cache.invalidate(self.db)
+        return item
+
+    def update(self, id: int, **kwargs):
+        with self.session_scope():
+            item = self._load(id)
+            for key, value in kwargs.items():
+                setattr(item, key, value)
+            self.cache.invalidate(self.db)
+        return item
+
+    def delete(self, id: int):
+        with self.session_scope():
+            item = self._load(id)
+            self.db.delete(item)
+            self.cache.invalidate(self.db)
@@ -1,39 +1,59 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.db_models.crud.base_crud import BaseCRUD
+from app.db_models.crud.cache import ModelCache
 from app.db_models.base import KanbanStatus
 
+kanban_status_cache = ModelCache(KanbanStatus, "kanban_status")
+
 class KanbanStatusCRUD(BaseCRUD):
+    """
+    CRUD operations for KanbanStatus model.
+
+    Reads go through kanban_status_cache and every write invalidates it when its transaction
+    ends. Writes load the status from the database, never from the cache.
+    """
+    cache = kanban_status_cache
+
     def __init__(self, db: Session):
         super().__init__(db, KanbanStatus)
 
     def get_all(self, skip: int = 0, limit: int = 10):
-        result = self.db.execute(
-            select(KanbanStatus).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
+        def load():
+            result = self.db.execute(
+                select(KanbanStatus).offset(skip).limit(limit)
+            )
+            return result.scalars().all()
+        return self.cache.get_list(self.db, (skip, limit), load)
 
-    def get(self, id: int):
+    def _load(self, id: int):
         result = self.db.execute(
             select(KanbanStatus).filter(KanbanStatus.id == id)
         )
         return result.scalars().one_or_none()
 
+    def get(self, id: int):
+        return self.cache.get(self.db, id, lambda: self._load(id))
+
     def create(self, **kwargs):
-        return super().create(**kwargs)
+        with self.session_scope():
+            item = super().create(**kwargs)
+            self.cache.invalidate(self.db)
+        return item
 
     def update(self, id: int, **kwargs):
-        db_kanban_status = self.get(id)
-        if db_kanban_status:
-            for key, value in kwargs.items():
-                setattr(db_kanban_status, key, value)
-            self.db.commit()
-            self.db.refresh(db_kanban_status)
+        with self.session_scope():
+            db_kanban_status = self._load(id)
+            if db_kanban_status:
+                for key, value in kwargs.items():
+                    setattr(db_kanban_status, key, value)
+            self.cache.invalidate(self.db)
         return db_kanban_status
 
     def delete(self, id: int):
-        db_kanban_status = self.get(id)
-        if db_kanban_status:
-            self.db.delete(db_kanban_status)
-            self.db.commit()
+        with self.session_scope():
+            db_kanban_status = self._load(id)
+            if db_kanban_status:
+                self.db.delete(db_kanban_status)
+            self.cache.invalidate(self.db)
         return db_kanban_status
@@ -0,0 +1,62 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    :param values: The sort key values, e.g. (timestamp, id).
+    :return: URL-safe cursor string.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime.datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    :param cursor: The opaque cursor string.
+    :param size: The number of values the cursor is expected to hold.
+    :return: The decoded sort key values.
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime.datetime:
+    """
+    Parse a datetime sort key stored in a cursor.
+
+    :raises ValueError: If the value is not an ISO formatted datetime.
+    """
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Decode a cursor over the primary key.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    (id,) = decode_cursor(cursor, 1)
+    if not isinstance(id, int):
+        raise ValueError("Invalid cursor")
+    return id
@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any
 from app.db_models.crud.base_crud import BaseCRUD
 from app.db_models.base import Project, History
 from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.crud.pagination import encode_cursor, decode_id_cursor
 
 class ProjectCRUD(BaseCRUD):
     """
@@ -19,19 +20,31 @@ class ProjectCRUD(BaseCRUD):
         super().__init__(db, Project)
         self.history_crud = HistoryCRUD(db)
 
-    def get_all(self, skip: int = 0, limit: int = 10) -> List[Project]:
+    def get_all(self, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[Project]:
         """
-        Retrieve all projects with pagination.
+        Retrieve all projects ordered by ID with pagination.
 
-        :param skip: Number of records to skip.
+        :param skip: Number of records to skip, ignored when a cursor is given.
         :param limit: Maximum number of records to return.
+        :param cursor: Cursor of the last project of the previous page, see cursor_for.
         :return: List of Project objects.
+        :raises ValueError: If the cursor is malformed.
         """
-        result = self.db.execute(
-            select(Project).offset(skip).limit(limit)
-        )
+        query = select(Project).order_by(Project.id).limit(limit)
+        if cursor is not None:
+            query = query.where(Project.id > decode_id_cursor(cursor))
+        else:
+            query = query.offset(skip)
+        result = self.db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    def cursor_for(project: Project) -> str:
+        """
+        Build the pagination cursor pointing at a project.
+        """
+        return encode_cursor(project.id)
+
     def get(self, id: int) -> Optional[Project]:
         """
         Retrieve a project by its ID.
@@ -66,13 +79,12 @@ class ProjectCRUD(BaseCRUD):
         :return: Updated Project object.
         :raises ValueError: If the project is not found.
         """
-        db_project = self.get(id)
-        if not db_project:
-            raise ValueError("Project not found")
-        for key, value in kwargs.items():
-            setattr(db_project, key, value)
-        self.db.commit()
-        self.db.refresh(db_project)
+        with self.session_scope():
+            db_project = self.get(id)
+            if not db_project:
+                raise ValueError("Project not found")
+            for key, value in kwargs.items():
+                setattr(db_project, key, value)
         return db_project
 
     def delete(self, id: int) -> Optional[Project]:
@@ -83,16 +95,16 @@ class ProjectCRUD(BaseCRUD):
         :return: Deleted Project object or None if not found.
         :raises ValueError: If the project is not found.
         """
-        db_project = self.get(id)
-        if not db_project:
-            raise ValueError("Project not found")
-        self.db.delete(db_project)
-        self.db.commit()
+        with self.session_scope():
+            db_project = self.get(id)
+            if not db_project:
+                raise ValueError("Project not found")
+            self.db.delete(db_project)
         return db_project
 
     def update_status(self, project_id: int, new_status: str, user_id: int) -> Project:
         """
-        Update the status of a project and create a history entry.
+        Update the status of a project and create a history entry, committed together.
 
         :param project_id: The ID of the project to update.
         :param new_status: The new status of the project.
@@ -101,22 +113,20 @@ class ProjectCRUD(BaseCRUD):
         :raises SQLAlchemyError: If there is an error during the update process.
         """
         try:
-            project = self.get(project_id)
-            if not project:
-                raise ValueError("Project not found")
-            project.status = new_status
-            self.db.commit()
-            self.db.refresh(project)
-
-            # Add to history
-            self.history_crud.create(
-                entity_type="project",
-                entity_id=project_id,
-                change_type="status_change",
-                user_id=user_id,
-                details=f"Status changed to {new_status}"
-            )
+            with self.session_scope():
+                project = self.get(project_id)
+                if not project:
+                    raise ValueError("Project not found")
+                project.status = new_status
+
+                # Add to history
+                self.history_crud.record(
+                    entity_type="project",
+                    entity_id=project_id,
+                    change_type="status_change",
+                    user_id=user_id,
+                    details=f"Status changed to {new_status}"
+                )
             return project
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise SQLAlchemyError("Error updating project status") from e
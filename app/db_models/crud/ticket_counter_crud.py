@@ -0,0 +1,119 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.db_models.base import KanbanStatus, Ticket, TicketCounter
+from app.db_models.crud.unit_of_work import UnitOfWork
+import logging
+
+logger = logging.getLogger(__name__)
+
+CounterKey = Tuple[int, int]
+
+
+class TicketCounterCRUD:
+    """
+    Ticket counts per (project, kanban status).
+
+    TicketCRUD calls adjust() inside the unit of work of every ticket write, so the counters
+    commit or roll back together with the tickets they count.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def session_scope(self) -> UnitOfWork:
+        """
+        Provide a transactional scope around a series of operations.
+        """
+        return UnitOfWork(self.db)
+
+    @staticmethod
+    def count_keys(tickets: Iterable[Any]) -> Counter:
+        """
+        Count tickets, given as dicts or objects, by (project_id, kanban_status_id).
+        """
+        keys = Counter()
+        for ticket in tickets:
+            if isinstance(ticket, dict):
+                keys[(ticket["project_id"], ticket["kanban_status_id"])] += 1
+            else:
+                keys[(ticket.project_id, ticket.kanban_status_id)] += 1
+        return keys
+
+    def adjust(self, deltas: Dict[CounterKey, int]) -> None:
+        """
+        Add deltas to the counters, creating missing ones, with one batched upsert.
+
+        :param deltas: The change of each counter, by (project_id, kanban_status_id).
+        """
+        rows = [
+            {"project_id": project_id, "kanban_status_id": kanban_status_id, "ticket_count": delta}
+            for (project_id, kanban_status_id), delta in deltas.items() if delta
+        ]
+        if not rows:
+            return
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(TicketCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TicketCounter.project_id, TicketCounter.kanban_status_id],
+            set_={"ticket_count": TicketCounter.ticket_count + stmt.excluded.ticket_count},
+        )
+        with self.session_scope():
+            self.db.execute(stmt, rows)
+
+    def project_stats(self, project_id: int) -> Dict[str, Any]:
+        """
+        Ticket counts of a project, per kanban status and in total.
+        """
+        rows = self.db.execute(
+            select(KanbanStatus.id, KanbanStatus.name, TicketCounter.ticket_count)
+            .join(TicketCounter, TicketCounter.kanban_status_id == KanbanStatus.id)
+            .where(TicketCounter.project_id == project_id)
+            .order_by(KanbanStatus.id)
+        ).all()
+        return self._stats({"project_id": project_id}, rows)
+
+    def board_stats(self, board_id: int) -> Dict[str, Any]:
+        """
+        Ticket counts of every status (column) of a board, across projects, and in total.
+        """
+        rows = self.db.execute(
+            select(KanbanStatus.id, KanbanStatus.name, func.coalesce(func.sum(TicketCounter.ticket_count), 0))
+            .outerjoin(TicketCounter, TicketCounter.kanban_status_id == KanbanStatus.id)
+            .where(KanbanStatus.board_id == board_id)
+            .group_by(KanbanStatus.id, KanbanStatus.name)
+            .order_by(KanbanStatus.id)
+        ).all()
+        return self._stats({"board_id": board_id}, rows)
+
+    @staticmethod
+    def _stats(key: Dict[str, int], rows) -> Dict[str, Any]:
+        statuses = [
+            {"kanban_status_id": kanban_status_id, "name": name, "ticket_count": ticket_count}
+            for kanban_status_id, name, ticket_count in rows
+        ]
+        return {**key, "ticket_count": sum(status["ticket_count"] for status in statuses), "statuses": statuses}
+
+    def rebuild(self, project_id: Optional[int] = None) -> int:
+        """
+        Recompute the counters from the tickets table, e.g. after writes that bypassed TicketCRUD.
+
+        :param project_id: Only rebuild the counters of this project.
+        :return: The number of counters written.
+        """
+        clear = delete(TicketCounter)
+        counts = (
+            select(Ticket.project_id, Ticket.kanban_status_id, func.count())
+            .group_by(Ticket.project_id, Ticket.kanban_status_id)
+        )
+        if project_id is not None:
+            clear = clear.where(TicketCounter.project_id == project_id)
+            counts = counts.where(Ticket.project_id == project_id)
+        with self.session_scope():
+            self.db.execute(clear)
+            result = self.db.execute(
+                insert(TicketCounter).from_select(["project_id", "kanban_status_id", "ticket_count"], counts)
+            )
+        logger.info(f"Rebuilt {result.rowcount} ticket counters")
+        return result.rowcount
@@ -1,11 +1,20 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, literal_column, or_, select, table, tuple_, column, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
 from app.db_models.crud.base_crud import BaseCRUD
-from app.db_models.base import Ticket, History
+from app.db_models.base import (
+    Ticket, Project, KanbanStatus, TICKET_SEARCH_CONFIG, TICKET_SEARCH_TABLE, TICKET_SEARCH_VECTOR,
+)
 from app.db_models.crud.history_crud import HistoryCRUD
-from typing import List, Optional
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+from app.db_models.crud.pagination import encode_cursor, decode_cursor, decode_id_cursor, parse_cursor_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+import datetime
 import logging
+import re
 
 # Configure logger
 logging.basicConfig(level=logging.INFO)
@@ -16,7 +25,8 @@ class TicketCRUD(BaseCRUD):
     CRUD operations for Ticket model.
 
     This class provides methods to perform Create, Read, Update, and Delete (CRUD) operations
-    on the Ticket model. It also includes functionality to log changes to ticket status in the history.
+    on the Ticket model. It also includes functionality to log changes to ticket status in the history,
+    and keeps the ticket counters in step with every write.
     """
     def __init__(self, db: Session):
         """
@@ -26,23 +36,308 @@ class TicketCRUD(BaseCRUD):
         """
         super().__init__(db, Ticket)
         self.history_crud = HistoryCRUD(db)
+        self.counter_crud = TicketCounterCRUD(db)
 
-    def get_all(self, skip: int = 0, limit: int = 10) -> List[Ticket]:
+    def create(self, **kwargs) -> Ticket:
         """
-        Retrieve all tickets with optional pagination.
+        Create a new ticket and count it.
+        """
+        with self.session_scope():
+            ticket = super().create(**kwargs)
+            self.counter_crud.adjust({(ticket.project_id, ticket.kanban_status_id): 1})
+        return ticket
+
+    def update(self, id: int, **kwargs) -> Ticket:
+        """
+        Update an existing ticket, moving its count if its project or kanban status changes.
+
+        :raises ValueError: If the ticket does not exist.
+        """
+        with self.session_scope():
+            ticket = self.get(id)
+            if not ticket:
+                raise ValueError("Ticket not found")
+            old_key = (ticket.project_id, ticket.kanban_status_id)
+            for key, value in kwargs.items():
+                setattr(ticket, key, value)
+            new_key = (ticket.project_id, ticket.kanban_status_id)
+            if new_key != old_key:
+                self.counter_crud.adjust({old_key: -1, new_key: 1})
+        return ticket
+
+    def delete(self, id: int) -> None:
+        """
+        Delete a ticket and uncount it.
 
-        :param skip: Number of records to skip (default is 0).
+        :raises ValueError: If the ticket does not exist.
+        """
+        with self.session_scope():
+            ticket = self.get(id)
+            if not ticket:
+                raise ValueError("Ticket not found")
+            self.db.delete(ticket)
+            self.counter_crud.adjust({(ticket.project_id, ticket.kanban_status_id): -1})
+
+    SORT_COLUMNS = {"id": Ticket.id, "updated_at": Ticket.updated_at}
+
+    def get_all(self, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, project_id: Optional[int] = None,
+                kanban_status_id: Optional[int] = None, priority: Optional[str] = None, status: Optional[str] = None,
+                sort: str = "id") -> List[Ticket]:
+        """
+        Retrieve tickets with optional filters, ordering and pagination.
+
+        Every filter is an equality served by one of the ticket indexes, see Ticket.__table_args__.
+
+        :param skip: Number of records to skip (default is 0), ignored when a cursor is given.
         :param limit: Maximum number of records to return (default is 10).
+        :param cursor: Cursor of the last ticket of the previous page, see cursor_for.
+        :param project_id: Only return the tickets of this project.
+        :param kanban_status_id: Only return the tickets in this kanban status (column).
+        :param priority: Only return the tickets with this priority.
+        :param status: Only return the tickets with this status.
+        :param sort: "id" or "updated_at", prefixed with "-" for descending order (default is "id").
         :return: List of Ticket objects.
+        :raises ValueError: If the sort is unknown or the cursor is malformed.
         """
-        result = self.db.execute(
-            select(Ticket).offset(skip).limit(limit)
-        )
+        name = sort[1:] if sort.startswith("-") else sort
+        if name not in self.SORT_COLUMNS:
+            raise ValueError(f"Unknown sort: {sort}")
+        descending = sort.startswith("-")
+        sort_columns = (Ticket.id,) if name == "id" else (self.SORT_COLUMNS[name], Ticket.id)
+
+        query = select(Ticket)
+        filters = {"project_id": project_id, "kanban_status_id": kanban_status_id, "priority": priority, "status": status}
+        for column, value in filters.items():
+            if value is not None:
+                query = query.where(getattr(Ticket, column) == value)
+        if cursor is not None:
+            sort_key = tuple_(*sort_columns)
+            last = tuple_(*self._decode_sort_cursor(cursor, name))
+            query = query.where(sort_key < last if descending else sort_key > last)
+        else:
+            query = query.offset(skip)
+        query = query.order_by(*(column.desc() if descending else column.asc() for column in sort_columns))
+        result = self.db.execute(query.limit(limit))
         return result.scalars().all()
 
+    @staticmethod
+    def cursor_for(ticket: Ticket, sort: str = "id") -> str:
+        """
+        Build the pagination cursor pointing at a ticket, for a listing ordered by sort.
+        """
+        if sort.lstrip("-") == "updated_at":
+            return encode_cursor(ticket.updated_at, ticket.id)
+        return encode_cursor(ticket.id)
+
+    @staticmethod
+    def _decode_sort_cursor(cursor: str, name: str) -> tuple:
+        if name == "id":
+            return (decode_id_cursor(cursor),)
+        value, id = decode_cursor(cursor, 2)
+        if not isinstance(id, int):
+            raise ValueError("Invalid cursor")
+        return parse_cursor_datetime(value), id
+
+    @staticmethod
+    def export_query(since: Optional[datetime.datetime] = None) -> Select:
+        """
+        Build the query of a ticket export: plain ticket columns in ID order.
+
+        :param since: Only export the tickets updated at or after this time.
+        """
+        query = select(Ticket.__table__).order_by(Ticket.id)
+        if since is not None:
+            query = query.where(Ticket.updated_at >= since)
+        return query
+
+    def search(self, q: str, limit: int = 10, cursor: Optional[str] = None) -> List[Row]:
+        """
+        Full-text search over ticket titles and descriptions, best matches first.
+
+        SQLite databases use the FTS5 index and bm25 ranking, Postgres databases the GIN
+        tsvector index and ts_rank.
+
+        :param q: The words to search for. Every word must match; the last one may be a prefix.
+        :param limit: Maximum number of results to return (default is 10).
+        :param cursor: Cursor of the last result of the previous page, see search_cursor_for.
+        :return: Rows of (Ticket, score, snippet), ordered by descending score then ID.
+        :raises ValueError: If the query has no words or the cursor is malformed.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            query, score, snippet = self._postgres_search(q)
+        else:
+            query, score, snippet = self._sqlite_search(q)
+        query = query.add_columns(score.label("score"), snippet.label("snippet"))
+        if cursor is not None:
+            last_score, last_id = decode_cursor(cursor, 2)
+            if not isinstance(last_score, (int, float)) or not isinstance(last_id, int):
+                raise ValueError("Invalid cursor")
+            query = query.where(or_(score < last_score, and_(score == last_score, Ticket.id > last_id)))
+        return self.db.execute(query.order_by(score.desc(), Ticket.id).limit(limit)).all()
+
+    @staticmethod
+    def search_cursor_for(row: Row) -> str:
+        """
+        Build the pagination cursor pointing at a search result.
+        """
+        return encode_cursor(row.score, row.Ticket.id)
+
+    @staticmethod
+    def _search_words(q: str) -> List[str]:
+        words = re.findall(r"\w+", q)
+        if not words:
+            raise ValueError("Search query must contain at least one word")
+        return words
+
+    def _sqlite_search(self, q: str) -> Tuple[Any, Any, Any]:
+        words = self._search_words(q)
+        # Quote every word so user input is never parsed as FTS5 syntax
+        match = " ".join(f'"{word}"' for word in words) + "*"
+        fts = table(TICKET_SEARCH_TABLE, column("rowid"))
+        fts_column = literal_column(TICKET_SEARCH_TABLE)
+        query = (
+            select(Ticket)
+            .join(fts, fts.c.rowid == Ticket.id)
+            .where(fts_column.op("MATCH")(match))
+        )
+        # bm25 is lower for better matches
+        score = -func.bm25(fts_column)
+        snippet = func.snippet(fts_column, -1, "<mark>", "</mark>", "…", 12)
+        return query, score, snippet
+
+    def _postgres_search(self, q: str) -> Tuple[Any, Any, Any]:
+        self._search_words(q)
+        vector = literal_column(TICKET_SEARCH_VECTOR)
+        tsquery = func.websearch_to_tsquery(TICKET_SEARCH_CONFIG, q)
+        query = select(Ticket).where(vector.op("@@")(tsquery))
+        score = func.ts_rank(vector, tsquery)
+        snippet = func.ts_headline(
+            TICKET_SEARCH_CONFIG,
+            func.coalesce(Ticket.title, "") + " " + func.coalesce(Ticket.description, ""),
+            tsquery,
+            "StartSel=<mark>, StopSel=</mark>, MaxWords=12, MinWords=4",
+        )
+        return query, score, snippet
+
+    def bulk_create(self, tickets: List[Dict[str, Any]], validate: bool = True) -> List[Row]:
+        """
+        Create many tickets in a single transaction.
+
+        References are validated with one query per referenced table, then all rows are
+        inserted with a single executemany INSERT ... RETURNING and committed once, together
+        with one batched update of the ticket counters.
+
+        :param tickets: The attributes of each ticket to create.
+        :param validate: Check the references first; callers that already did may skip it.
+        :return: The created ticket rows, in the order given.
+        :raises ValueError: If a ticket references a missing project or kanban status.
+        :raises SQLAlchemyError: If there is an error during the creation process.
+        """
+        if not tickets:
+            return []
+        if validate:
+            self._validate_references(tickets)
+        table = Ticket.__table__
+        try:
+            with self.session_scope():
+                rows = self.db.execute(
+                    insert(table).returning(*table.c, sort_by_parameter_order=True),
+                    tickets
+                ).all()
+                self.counter_crud.adjust(self.counter_crud.count_keys(rows))
+            logger.info(f"Bulk created {len(rows)} tickets")
+            return rows
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk creating tickets: {e}")
+            raise e
+
+    def _validate_references(self, tickets: List[Dict[str, Any]],
+                             columns: tuple = ("project_id", "kanban_status_id")) -> None:
+        """
+        Check that every referenced project and kanban status exists.
+
+        :raises ValueError: Listing the missing IDs.
+        """
+        models = {"project_id": Project, "kanban_status_id": KanbanStatus}
+        for column in columns:
+            model = models[column]
+            ids = {ticket[column] for ticket in tickets}
+            found = set(self.db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+            missing = ids - found
+            if missing:
+                raise ValueError(f"Unknown {column}: {', '.join(map(str, sorted(missing)))}")
+
+    def bulk_update_status(self, new_status: str, user_id: int, ticket_ids: Optional[List[int]] = None,
+                           kanban_status_id: Optional[int] = None, new_kanban_status_id: Optional[int] = None) -> int:
+        """
+        Update the status of many tickets and record a history entry for each.
+
+        Runs one set-based UPDATE ... RETURNING and one batched INSERT into history, and
+        commits them together with the counters of the tickets moved to another status.
+
+        :param new_status: The new status of the tickets.
+        :param user_id: The ID of the user making the change.
+        :param ticket_ids: Only update these tickets.
+        :param kanban_status_id: Only update the tickets in this kanban status (column).
+        :param new_kanban_status_id: Also move the tickets to this kanban status.
+        :return: The number of updated tickets.
+        :raises ValueError: If no filter is given or the target kanban status does not exist.
+        :raises SQLAlchemyError: If there is an error during the update process.
+        """
+        if ticket_ids is None and kanban_status_id is None:
+            raise ValueError("ticket_ids or kanban_status_id must be provided")
+        if new_kanban_status_id is not None:
+            self._validate_references([{"kanban_status_id": new_kanban_status_id}], ("kanban_status_id",))
+
+        values = {"status": new_status}
+        if new_kanban_status_id is not None:
+            values["kanban_status_id"] = new_kanban_status_id
+        filters = []
+        if ticket_ids is not None:
+            filters.append(Ticket.id.in_(ticket_ids))
+        if kanban_status_id is not None:
+            filters.append(Ticket.kanban_status_id == kanban_status_id)
+        stmt = update(Ticket).values(**values).where(*filters).returning(Ticket.id)
+        try:
+            with self.session_scope():
+                if new_kanban_status_id is not None:
+                    self._move_counters(filters, new_kanban_status_id)
+                updated_ids = self.db.execute(stmt).scalars().all()
+                if updated_ids:
+                    self.history_crud.record_many([
+                        {
+                            "entity_type": "ticket",
+                            "entity_id": ticket_id,
+                            "change_type": "status_change",
+                            "user_id": user_id,
+                            "details": f"Status changed to {new_status}",
+                        }
+                        for ticket_id in updated_ids
+                    ])
+            logger.info(f"{len(updated_ids)} tickets status updated to {new_status} by user ID {user_id}")
+            return len(updated_ids)
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk updating ticket status: {e}")
+            raise e
+
+    def _move_counters(self, filters: list, new_kanban_status_id: int) -> None:
+        """
+        Move the counts of the tickets matching filters to new_kanban_status_id.
+        """
+        moved = self.db.execute(
+            select(Ticket.project_id, Ticket.kanban_status_id, func.count())
+            .where(*filters, Ticket.kanban_status_id != new_kanban_status_id)
+            .group_by(Ticket.project_id, Ticket.kanban_status_id)
+        ).all()
+        deltas = Counter()
+        for project_id, old_kanban_status_id, count in moved:
+            deltas[(project_id, old_kanban_status_id)] -= count
+            deltas[(project_id, new_kanban_status_id)] += count
+        self.counter_crud.adjust(deltas)
+
     def update_status(self, ticket_id: int, new_status: str, user_id: int) -> Optional[Ticket]:
         """
-        Update the status of a ticket and create a history entry.
+        Update the status of a ticket and create a history entry, committed together.
 
         :param ticket_id: The ID of the ticket to update.
         :param new_status: The new status of the ticket.
@@ -51,26 +346,24 @@ class TicketCRUD(BaseCRUD):
         :raises SQLAlchemyError: If there is an error during the update process.
         """
         try:
-            ticket = self.get(ticket_id)
-            if not ticket:
-                logger.error(f"Ticket with ID {ticket_id} not found")
-                raise ValueError("Ticket not found")
-            ticket.status = new_status
-            self.db.commit()
-            self.db.refresh(ticket)
-
-            # Add to history
-            self.history_crud.create(
-                entity_type="ticket",
-                entity_id=ticket_id,
-                change_type="status_change",
-                user_id=user_id,
-                details=f"Status changed to {new_status}"
-            )
+            with self.session_scope():
+                ticket = self.get(ticket_id)
+                if not ticket:
+                    logger.error(f"Ticket with ID {ticket_id} not found")
+                    raise ValueError("Ticket not found")
+                ticket.status = new_status
+
+                # Add to history
+                self.history_crud.record(
+                    entity_type="ticket",
+                    entity_id=ticket_id,
+                    change_type="status_change",
+                    user_id=user_id,
+                    details=f"Status changed to {new_status}"
+                )
             logger.info(f"Ticket ID {ticket_id} status updated to {new_status} by user ID {user_id}")
             return ticket
         except SQLAlchemyError as e:
-            self.db.rollback()
             logger.error(f"Error updating ticket ID {ticket_id}: {e}")
             raise e
         except ValueError as ve:
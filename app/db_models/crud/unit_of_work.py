@@ -0,0 +1,49 @@
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """
+    Transactional scope shared by all CRUD helpers working on one session.
+
+    Scopes nest: only the outermost scope commits, or rolls back on error, while inner scopes
+    just flush. An entity change and the history entries written alongside it therefore reach
+    the database together and are committed once. The session is never closed here; it
+    belongs to whoever created it (e.g. the get_db dependency).
+
+    Usage::
+
+        with UnitOfWork(db):
+            ticket_crud.update_status(...)
+            project_crud.update(...)
+    """
+    DEPTH_KEY = "unit_of_work_depth"
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._outermost = False
+
+    def __enter__(self) -> "UnitOfWork":
+        depth = self.db.info.get(self.DEPTH_KEY, 0)
+        self.db.info[self.DEPTH_KEY] = depth + 1
+        self._outermost = depth == 0
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.db.info[self.DEPTH_KEY] -= 1
+        if not self._outermost:
+            if exc_type is None:
+                self.db.flush()
+            return False
+        if exc_type is not None:
+            self.db.rollback()
+            return False
+        try:
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            self.db.rollback()
+            raise
+        return False
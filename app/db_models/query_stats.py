@@ -0,0 +1,82 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Statements whose query plan can be asked for without running them again
+EXPLAIN_PREFIXES = ("select", "with")
+
+
+class QueryStats:
+    """
+    Statements run while serving one request: how many, how long, and how often each SQL text ran.
+
+    The same SQL text run many times with different parameters is the signature of an N+1
+    pattern, e.g. loading a relationship row by row in a loop.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Statements run at least threshold times, most repeated first.
+        """
+        return sorted(((statement, count) for statement, count in self.statements.items() if count >= threshold),
+                      key=lambda item: -item[1])
+
+
+# Statistics of the request being served, set by QueryStatsMiddleware. Sync sessions run
+# in worker threads, which get a copy of the context holding the same QueryStats object.
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def explain(connection: Any, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Query plan of a statement, read on a raw cursor of the connection so no events fire.
+    """
+    if not statement.lstrip().lower().startswith(EXPLAIN_PREFIXES):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+    except Exception as exc:
+        return f"unavailable: {exc}"
+    finally:
+        cursor.close()
+
+
+def install_query_instrumentation(engine: Engine, slow_query_threshold: Optional[float],
+                                  explain_slow_queries: bool = True) -> None:
+    """
+    Time every statement run by the engine and add it to the QueryStats of the current request.
+
+    Statements slower than slow_query_threshold seconds are logged with their parameters,
+    and with their query plan when explain_slow_queries is set.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._query_start_time
+        stats = query_stats_var.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if slow_query_threshold is not None and duration >= slow_query_threshold:
+            plan = explain(connection, statement, parameters) if explain_slow_queries and not executemany else None
+            logger.warning("Slow query (%.3fs): %s\nParameters: %r%s", duration, statement, parameters,
+                           f"\nPlan:\n{plan}" if plan else "")
@@ -0,0 +1,100 @@
+import os
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Connection, Engine
+from app.db_models.base import HISTORY_ARCHIVE_SCHEMA, Base, HistoryArchive
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ALEMBIC_INI = os.path.join(ROOT_DIR, "alembic.ini")
+ALEMBIC_DIR = os.path.join(ROOT_DIR, "alembic")
+
+
+class SchemaOutOfDate(RuntimeError):
+    """
+    The database schema is at another revision than the code, and migrating it at startup is off.
+    """
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Alembic configuration of the project, running migrations on connection when given.
+    """
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def create_archive_table(connection: Connection) -> bool:
+    """
+    Create history_archive in the archive database attached with history_archive_path, if missing.
+
+    :return: Whether an archive database is attached.
+    """
+    inspector = inspect(connection)
+    if HISTORY_ARCHIVE_SCHEMA not in inspector.get_schema_names():
+        return False
+    if inspector.has_table(HistoryArchive.__tablename__):
+        logger.warning("The main database has a history_archive table, which hides the one in "
+                       "HISTORY_ARCHIVE_PATH; drop it once it is empty")
+    HistoryArchive.__table__.to_metadata(MetaData(), schema=HISTORY_ARCHIVE_SCHEMA).create(connection, checkfirst=True)
+    return True
+
+
+def create_tables(connection: Connection) -> None:
+    """
+    Create the missing tables of the models, history_archive in the archive database when one is attached.
+    """
+    if create_archive_table(connection):
+        archive = HistoryArchive.__table__
+        Base.metadata.create_all(connection, tables=[table for table in Base.metadata.sorted_tables if table is not archive])
+    else:
+        Base.metadata.create_all(connection)
+
+
+def ensure_schema(engine: Engine, auto_migrate: bool = False) -> str:
+    """
+    Bring the database schema to the revision of the code, running DDL only when it is not there yet.
+
+    - At the head revision: nothing is done, which is the common case of a restart.
+    - Empty database: the tables are created from the models and stamped with the head revision.
+    - Another revision, or tables without a revision (created by create_all before migrations
+      were tracked): upgraded to the head with auto_migrate, else SchemaOutOfDate. The
+      migrations skip the tables and indexes that exist already.
+
+    An attached archive database is not versioned: its table is created whenever it is missing.
+
+    :return: "current", "created" or "upgraded".
+    :raises SchemaOutOfDate: If the schema is at another revision and auto_migrate is off.
+    """
+    head = head_revision()
+    with engine.begin() as connection:
+        current = current_revision(connection)
+        if current is None and not inspect(connection).get_table_names():
+            create_tables(connection)
+            command.stamp(alembic_config(connection), "head")
+            return "created"
+        create_archive_table(connection)
+        if current == head:
+            return "current"
+        if not auto_migrate:
+            raise SchemaOutOfDate(f"Database schema is at revision {current or '(none)'}, the code expects {head}: "
+                                  f"run `alembic upgrade head` or set DATABASE_AUTO_MIGRATE=true")
+        command.upgrade(alembic_config(connection), "head")
+        return "upgraded"
@@ -1,13 +1,130 @@
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-import os
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, Dict, Union
 
-# Define the path to the database file within the app/ folder
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'project_management.db')}"
+from app.core.config import get_app_settings
+from app.core.metrics import metrics
+from app.db_models.base import HISTORY_ARCHIVE_SCHEMA
+from app.db_models.query_stats import install_query_instrumentation
+from app.core.settings.app import AppSettings
+
+# Async drivers substituted for the configured driver when no async URL is set
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+# Either kind of session handed out by the get_db dependency
+AnySession = Union[Session, AsyncSession]
+
+
+def _set_sqlite_pragmas(dbapi_connection, settings: AppSettings) -> None:
+    """
+    Tune a new SQLite connection.
+
+    WAL lets readers proceed while a writer holds the database, and synchronous=NORMAL
+    only fsyncs the WAL at checkpoints. The database stays consistent, but the last commits
+    can be lost on a power failure or OS crash; set sqlite_synchronous=FULL where every
+    commit must survive (e.g. audit history).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}")
+    if settings.history_archive_path:
+        cursor.execute(f"ATTACH DATABASE ? AS {HISTORY_ARCHIVE_SCHEMA}", (settings.history_archive_path,))
+    cursor.close()
+
+
+def _engine_kwargs(url: URL, settings: AppSettings) -> Dict[str, Any]:
+    engine_kwargs: Dict[str, Any] = {"echo": settings.database_echo}
+    if url.get_backend_name() == "sqlite":
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        engine_kwargs["pool_pre_ping"] = True
+    # In-memory SQLite databases use a single-connection pool which takes no sizing options
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        engine_kwargs.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+        )
+    return engine_kwargs
+
+
+def _install_sqlite_pragmas(engine: Engine, settings: AppSettings) -> None:
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _set_sqlite_pragmas(dbapi_connection, settings)
+
+
+def _install_pool_metrics(engine: Engine) -> None:
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.connection_checked_out()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.connection_checked_in()
+
+
+def create_db_engine(settings: AppSettings) -> Engine:
+    """
+    Create the SQLAlchemy engine described by the application settings.
+    """
+    url = make_url(settings.database_url)
+    engine = create_engine(url, **_engine_kwargs(url, settings))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine, settings)
+    if settings.metrics_enabled:
+        _install_pool_metrics(engine)
+    if settings.sql_instrumentation:
+        install_query_instrumentation(engine, settings.sql_slow_query_threshold, settings.sql_explain_slow_queries)
+    return engine
+
+
+def get_async_database_url(settings: AppSettings) -> URL:
+    """
+    Resolve the URL of the async engine, swapping in an async driver when needed.
+    """
+    if settings.async_database_url:
+        return make_url(settings.async_database_url)
+    url = make_url(settings.database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def create_async_db_engine(settings: AppSettings) -> AsyncEngine:
+    """
+    Create the async SQLAlchemy engine described by the application settings.
+    """
+    url = get_async_database_url(settings)
+    engine = create_async_engine(url, **_engine_kwargs(url, settings))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine.sync_engine, settings)
+    if settings.metrics_enabled:
+        _install_pool_metrics(engine.sync_engine)
+    if settings.sql_instrumentation:
+        install_query_instrumentation(engine.sync_engine, settings.sql_slow_query_threshold,
+                                      settings.sql_explain_slow_queries)
+    return engine
+
+
+settings = get_app_settings()
+DATABASE_URL = settings.database_url
 
 # Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(settings)
 
 # Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Created only when enabled, so the async driver is an optional dependency.
+# Objects are not expired on commit: they are serialized after the session's greenlet returns.
+async_engine = create_async_db_engine(settings) if settings.async_database else None
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
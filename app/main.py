@@ -8,9 +8,16 @@ from app.api.errors.http_error import http_error_handler
 from app.api.errors.validation_error import http422_error_handler
 from app.api.routes.api import router as api_router
 from app.api.routes.home import router as home_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes import history
+from app.api.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
+from app.api.etag import ETAG_HEADER
+from app.api.middleware import (
+    QUERY_COUNT_HEADER, QUERY_TIME_HEADER, MetricsMiddleware, QueryStatsMiddleware, RequestContextMiddleware,
+)
 from app.core.config import get_app_settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
+from app.core.metrics import metrics
 
 def get_application() -> FastAPI:
     settings = get_app_settings()
@@ -27,7 +34,15 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, ETAG_HEADER, settings.request_id_header,
+                        QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
     )
+    if settings.sql_instrumentation:
+        application.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=settings.sql_n_plus_one_threshold,
+                                   headers=settings.debug)
+    application.add_middleware(RequestContextMiddleware, header_name=settings.request_id_header)
+    if settings.metrics_enabled:
+        application.add_middleware(MetricsMiddleware, metrics=metrics)
 
     application.add_event_handler("startup", create_start_app_handler(application))
     application.add_event_handler("shutdown", create_stop_app_handler(application))
@@ -35,6 +50,8 @@ def get_application() -> FastAPI:
     application.add_exception_handler(RequestValidationError, http422_error_handler)
 
     application.include_router(home_router)
+    if settings.metrics_enabled:
+        application.include_router(metrics_router)
     application.include_router(api_router, prefix=settings.api_prefix)
     application.include_router(history.router, prefix="/history", tags=["history"])
 
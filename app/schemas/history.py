@@ -73,3 +73,25 @@ class HistoryResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class HistoryWriterStats(BaseModel):
+    """
+    Schema for the counters of the history write-behind writer.
+
+    Attributes:
+        enabled (bool): Whether history is written behind requests.
+        pending (int): Entries buffered and not written yet.
+        lag_seconds (float): Age of the oldest pending entry.
+        last_flush_lag_seconds (float): Age of the oldest entry of the last batch written.
+    """
+    enabled: bool
+    pending: int = 0
+    max_pending: int = 0
+    written: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    spilled: int = 0
+    dropped: int = 0
+    lag_seconds: float = 0.0
+    last_flush_lag_seconds: float = 0.0
+    max_flush_lag_seconds: float = 0.0
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.schemas.history import HistoryCreate
+from app.schemas.project import ProjectCreate
+from app.schemas.ticket import TicketCreate
+
+
+class ProjectImport(ProjectCreate):
+    """Schema for an imported project; the id and timestamps of the source are kept when given."""
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class TicketImport(TicketCreate):
+    """Schema for an imported ticket; the id and timestamps of the source are kept when given."""
+    id: Optional[int] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class HistoryImport(HistoryCreate):
+    """Schema for an imported history entry; the id and timestamp of the source are kept when given."""
+    id: Optional[int] = None
+    timestamp: Optional[datetime] = None
+
+
+class ImportResult(BaseModel):
+    """Schema for the outcome of a bulk import."""
+    entity: str
+    job: Optional[str] = None
+    resumed_from: int = 0
+    chunks: int = 0
+    rows_imported: int = 0
+    rows_committed: int = 0
+
+
+class ImportJob(BaseModel):
+    """Schema for the progress of a named import job."""
+    job: str
+    entity_type: str
+    rows_committed: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class StatusTicketCount(BaseModel):
+    """Schema for the number of tickets in one kanban status."""
+    kanban_status_id: int
+    name: str
+    ticket_count: int
+
+
+class ProjectStats(BaseModel):
+    """Schema for the ticket counts of a project."""
+    project_id: int
+    ticket_count: int
+    statuses: List[StatusTicketCount]
+
+
+class KanbanBoardStats(BaseModel):
+    """Schema for the ticket counts of the columns of a kanban board."""
+    board_id: int
+    ticket_count: int
+    statuses: List[StatusTicketCount]
@@ -44,6 +44,37 @@ class TicketResponse(Ticket):
     """
     pass
 
+class TicketSearchResult(TicketResponse):
+    """
+    Schema for a ticket matching a full-text search.
+
+    ``snippet`` is an excerpt of the matching text with the matched words wrapped in
+    ``<mark>`` tags; higher ``score`` values are better matches.
+    """
+    score: float
+    snippet: str
+
+class TicketBulkStatusUpdate(BaseModel):
+    """
+    Schema for changing the status of many tickets at once.
+
+    Tickets are selected by ``ticket_ids``, ``kanban_status_id`` or both.
+    """
+    new_status: str
+    user_id: int
+    ticket_ids: Optional[List[int]] = None
+    kanban_status_id: Optional[int] = None
+    new_kanban_status_id: Optional[int] = None
+
+    def __repr__(self):
+        return f"<TicketBulkStatusUpdate(new_status={self.new_status}, kanban_status_id={self.kanban_status_id})>"
+
+class TicketBulkStatusResult(BaseModel):
+    """
+    Schema for the result of a bulk status change.
+    """
+    updated: int
+
 class TicketWithHistory(BaseModel):
     """
     Schema for representing a ticket with its history.
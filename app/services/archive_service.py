@@ -0,0 +1,92 @@
+import argparse
+import datetime
+import threading
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.core.config import get_app_settings
+from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.session import SessionLocal
+import logging
+
+def configure_logger():
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logging.basicConfig(level=logging.INFO)
+    return logger
+
+logger = configure_logger()
+
+def archive_history(db: Session, retention_days: int, batch_size: int = 10000) -> int:
+    """
+    Move the history entries older than the retention period to the archive.
+
+    Args:
+        db (Session): The database session.
+        retention_days (int): Number of days of history kept in the history table.
+        batch_size (int): Number of entries moved per transaction.
+
+    Returns:
+        int: The number of entries archived.
+    """
+    # Timestamps are stored as naive UTC
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return HistoryCRUD(db).archive(now - datetime.timedelta(days=retention_days), batch_size)
+
+class HistoryArchiver:
+    """
+    Background thread archiving old history entries every interval seconds.
+    """
+    def __init__(self, retention_days: int, interval: float = 3600, batch_size: int = 10000,
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self.retention_days = retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="history-archiver", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return archive_history(db, self.retention_days, self.batch_size)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error archiving history: {e}")
+            self._stop.wait(self.interval)
+
+def main() -> None:
+    settings = get_app_settings()
+    parser = argparse.ArgumentParser(description="Move history entries older than the retention period to the archive.")
+    parser.add_argument("--days", type=int, default=settings.history_retention_days, help="Days of history to keep")
+    parser.add_argument("--batch-size", type=int, default=settings.history_archive_batch_size, help="Entries moved per transaction")
+    args = parser.parse_args()
+    if args.days is None:
+        parser.error("--days is required when HISTORY_RETENTION_DAYS is not set")
+
+    db = SessionLocal()
+    try:
+        count = archive_history(db, args.days, args.batch_size)
+        logger.info(f"History entries archived: {count}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
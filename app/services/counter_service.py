@@ -0,0 +1,27 @@
+import argparse
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+from app.db_models.session import SessionLocal
+import logging
+
+def configure_logger():
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logging.basicConfig(level=logging.INFO)
+    return logger
+
+logger = configure_logger()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the ticket counters from the tickets table.")
+    parser.add_argument("--project-id", type=int, default=None, help="Only rebuild the counters of this project")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = TicketCounterCRUD(db).rebuild(args.project_id)
+        logger.info(f"Ticket counters rebuilt: {count}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
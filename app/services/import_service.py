@@ -0,0 +1,223 @@
+import argparse
+import csv
+import io
+import json
+import os
+from collections import defaultdict
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+import anyio
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db_models.base import KanbanBoard, KanbanStatus, Project
+from app.db_models.crud.import_crud import ImportCRUD
+from app.db_models.session import AnySession, SessionLocal
+from app.schemas.imports import HistoryImport, ImportResult, ProjectImport, TicketImport
+import logging
+
+def configure_logger():
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logging.basicConfig(level=logging.INFO)
+    return logger
+
+logger = configure_logger()
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_SCHEMAS = {"projects": ProjectImport, "tickets": TicketImport, "history": HistoryImport}
+# Columns checked against the rows they reference, by entity
+IMPORT_REFERENCES = {
+    "projects": {"kanban_board_id": KanbanBoard},
+    "tickets": {"project_id": Project, "kanban_status_id": KanbanStatus},
+    "history": {},
+}
+
+Record = Tuple[int, Dict[str, Any]]
+
+
+class ImportFailed(ValueError):
+    """
+    An import stopped on a bad row or chunk.
+
+    Every chunk before it is committed: rows_committed is where the import resumes.
+    """
+    def __init__(self, message: str, line: int, rows_committed: int = 0):
+        super().__init__(message)
+        self.line = line
+        self.rows_committed = rows_committed
+
+
+def read_records(stream: IO, fmt: str = "ndjson") -> Iterator[Record]:
+    """
+    Parse NDJSON or CSV records one at a time from a text or binary stream.
+
+    Yields (line number, record) pairs. Empty CSV fields are read as missing values.
+
+    Raises:
+        ImportFailed: If a line is not a JSON object.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, {key: value for key, value in record.items() if value != ""}
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ImportFailed(f"Line {line_number}: invalid JSON: {e}", line_number) from e
+        if not isinstance(record, dict):
+            raise ImportFailed(f"Line {line_number}: expected a JSON object", line_number)
+        yield line_number, record
+
+
+def _chunks(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+class ReferenceCache:
+    """
+    IDs known to exist, per referenced model, shared by all the chunks of an import.
+
+    Only IDs not seen before are looked up, with one query per model and chunk, so boards
+    and statuses are usually queried once for a whole import.
+    """
+    def __init__(self, import_crud: ImportCRUD):
+        self.import_crud = import_crud
+        self.known: Dict[Any, Set[int]] = defaultdict(set)
+
+    def add(self, model, ids) -> None:
+        self.known[model].update(ids)
+
+    def missing(self, model, ids: Set[int]) -> Set[int]:
+        unknown = ids - self.known[model]
+        if unknown:
+            self.known[model] |= self.import_crud.existing_ids(model, unknown)
+        return unknown - self.known[model]
+
+
+def _validate_chunk(entity: str, chunk: List[Record], references: ReferenceCache) -> List[Dict[str, Any]]:
+    schema = IMPORT_SCHEMAS[entity]
+    rows = []
+    for line_number, record in chunk:
+        try:
+            rows.append(schema.model_validate(record).model_dump(exclude_none=True))
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(map(str, error["loc"]))
+            raise ImportFailed(f"Line {line_number}: {field}: {error['msg']}", line_number) from e
+    for column, model in IMPORT_REFERENCES[entity].items():
+        missing = references.missing(model, {row[column] for row in rows})
+        if missing:
+            line_number, row = next((line, row) for (line, _), row in zip(chunk, rows) if row[column] in missing)
+            raise ImportFailed(f"Line {line_number}: {column} {row[column]} does not exist", line_number)
+    return rows
+
+
+def import_records(db: Session, entity: str, stream: IO, fmt: str = "ndjson", chunk_size: int = IMPORT_CHUNK_SIZE,
+                   job: Optional[str] = None, skip: int = 0) -> ImportResult:
+    """
+    Import projects, tickets or history entries from an NDJSON or CSV stream, in constant memory.
+
+    Records are parsed incrementally and handled chunk_size at a time: each chunk is
+    validated (schema, then references against a cache of known IDs) and inserted with
+    one executemany per table, then committed. A named job records how many rows are
+    committed in the same transaction, and a later run of the same job skips them.
+
+    Args:
+        db (Session): The database session.
+        entity (str): "projects", "tickets" or "history".
+        stream (IO): The input, text or binary.
+        fmt (str): "ndjson" or "csv".
+        chunk_size (int): Number of rows validated and committed at a time.
+        job (Optional[str]): Name of the job to checkpoint and resume.
+        skip (int): Number of leading rows to skip, for imports without a job.
+
+    Returns:
+        ImportResult: The number of chunks and rows imported by this run.
+
+    Raises:
+        ImportFailed: On an invalid row or a chunk the database rejects, with the number
+            of rows committed so far.
+    """
+    if entity not in IMPORT_SCHEMAS:
+        raise ValueError(f"Unknown import entity: {entity}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    import_crud = ImportCRUD(db)
+    start = import_crud.rows_committed(job) if job is not None else skip
+    result = ImportResult(entity=entity, job=job, resumed_from=start, rows_committed=start)
+    references = ReferenceCache(import_crud)
+    if start:
+        logger.info(f"Resuming import of {entity} after row {start}")
+    try:
+        for chunk in _chunks(islice(read_records(stream, fmt), start, None), chunk_size):
+            rows = _validate_chunk(entity, chunk, references)
+            try:
+                ids = import_crud.insert_chunk(entity, rows, job, result.rows_committed + len(rows))
+            except SQLAlchemyError as e:
+                line_number = chunk[0][0]
+                raise ImportFailed(f"Chunk starting at line {line_number} failed: {e}", line_number) from e
+            if entity == "projects":
+                references.add(Project, ids)
+            result.chunks += 1
+            result.rows_imported += len(rows)
+            result.rows_committed += len(rows)
+            logger.info(f"Import of {entity}: chunk {result.chunks} committed, {result.rows_committed} rows in total")
+    except ImportFailed as e:
+        e.rows_committed = result.rows_committed
+        logger.error(f"Import of {entity} failed after {result.rows_committed} rows: {e}")
+        raise
+    return result
+
+
+async def import_upload(db: AnySession, entity: str, stream: IO, **kwargs) -> ImportResult:
+    """
+    Run import_records on a sync or async session without blocking the event loop.
+    """
+    def run(session: Session) -> ImportResult:
+        return import_records(session, entity, stream, **kwargs)
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(run)
+    return await anyio.to_thread.run_sync(run, db)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import projects, tickets or history entries from an NDJSON or CSV file.")
+    parser.add_argument("entity", choices=sorted(IMPORT_SCHEMAS), help="What the file contains")
+    parser.add_argument("path", help="The file to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows committed at a time")
+    parser.add_argument("--job", default=None, help="Checkpoint name, defaults to the entity and file name")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and import from the first row")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    job = args.job or f"{args.entity}:{os.path.basename(args.path)}"
+    db = SessionLocal()
+    try:
+        if args.restart:
+            ImportCRUD(db).reset_checkpoint(job)
+        with open(args.path, "rb") as stream:
+            result = import_records(db, args.entity, stream, fmt, args.chunk_size, job)
+        logger.info(f"Imported {result.rows_imported} {args.entity} in {result.chunks} chunks "
+                    f"({result.rows_committed} rows committed for job {job})")
+    except ImportFailed as e:
+        logger.error(f"{e}; rerun to resume after row {e.rows_committed}")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app.db_models.crud.project_crud import ProjectCRUD
+from app.db_models.crud.async_crud import AsyncProjectCRUD
+from app.db_models.session import AnySession
 import logging
 
 def configure_logger():
@@ -11,10 +11,10 @@ def configure_logger():
 
 logger = configure_logger()
 
-def update_project_status(project_id: int, new_status: str, user_id: int, db: Session) -> bool:
+async def update_project_status(project_id: int, new_status: str, user_id: int, db: AnySession) -> bool:
     try:
-        project_crud = ProjectCRUD(db)
-        result = project_crud.update_status(project_id, new_status, user_id)
+        project_crud = AsyncProjectCRUD(db)
+        result = await project_crud.update_status(project_id, new_status, user_id)
         logger.info(f"Project {project_id} status updated to {new_status} by user {user_id}")
         return result
     except SQLAlchemyError as e:  # Use a more specific exception
@@ -0,0 +1,316 @@
+import argparse
+import datetime
+import math
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+from app.db_models.base import (
+    TICKET_SEARCH_SQLITE_DDL, TICKET_SEARCH_TABLE, History, KanbanBoard, KanbanStatus, Project, Ticket,
+)
+from app.db_models.crud.import_crud import ImportCRUD
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+from app.db_models.crud.unit_of_work import UnitOfWork
+from app.db_models.session import SessionLocal
+import logging
+
+def configure_logger():
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logging.basicConfig(level=logging.INFO)
+    return logger
+
+logger = configure_logger()
+
+# Columns of the seeded boards, left to right; boards with more columns repeat the middle ones
+STATUS_NAMES = ("Backlog", "To Do", "In Progress", "Review", "Done")
+TICKET_PRIORITIES = ("low", "medium", "high", "critical")
+# Share of each kind of history entry
+HISTORY_CHANGE_TYPES = (("status_change", 0.7), ("comment", 0.2), ("update", 0.1))
+
+@dataclass
+class DatasetSpec:
+    """
+    Size and shape of a synthetic dataset.
+
+    Skews are Zipf exponents (0 is uniform; around 1 is typical of real workloads):
+    project_skew concentrates tickets in a few hot projects, history_skew gives a few
+    tickets most of the history and a long tail little, and status_skew concentrates
+    tickets and status changes in a few columns, Done first.
+    """
+    boards: int = 5
+    statuses_per_board: int = 5
+    projects: int = 100
+    tickets: int = 100_000
+    history: int = 500_000
+    project_skew: float = 1.1
+    history_skew: float = 1.0
+    status_skew: float = 1.0
+    days: int = 365
+    seed: int = 1
+    batch_size: int = 10_000
+
+class Zipf:
+    """
+    Ranks 1..n drawn with probability roughly proportional to 1 / rank ** skew.
+
+    Draws invert the CDF of the continuous distribution, so they take constant time and
+    memory however large n is.
+    """
+    def __init__(self, n: int, skew: float):
+        self.n = n
+        self.skew = skew
+        self._span = (n + 1) ** (1 - skew) - 1 if skew != 1 else math.log(n + 1)
+
+    def rank(self, rng: random.Random) -> int:
+        u = rng.random()
+        if self.skew == 1:
+            x = math.exp(u * self._span)
+        else:
+            x = (1 + u * self._span) ** (1 / (1 - self.skew))
+        return min(self.n, int(x))
+
+class Scatter:
+    """
+    Permutation of 1..n spreading consecutive ranks over the id range, so the hottest
+    rows are not all the oldest ones.
+    """
+    def __init__(self, n: int, rng: random.Random):
+        self.n = n
+        self.offset = rng.randrange(n)
+        stride = rng.randrange(n // 2, n) if n > 2 else 1
+        while math.gcd(stride, n) != 1:
+            stride += 1
+        self.stride = stride
+
+    def __call__(self, rank: int) -> int:
+        return ((rank - 1) * self.stride + self.offset) % self.n + 1
+
+def status_names(count: int) -> List[str]:
+    if count <= len(STATUS_NAMES):
+        return [*STATUS_NAMES[:count - 1], STATUS_NAMES[-1]] if count > 1 else [STATUS_NAMES[0]]
+    middle = [f"{STATUS_NAMES[2]} {n}" for n in range(1, count - len(STATUS_NAMES) + 2)]
+    return [*STATUS_NAMES[:2], *middle, *STATUS_NAMES[3:]]
+
+def ticket_status(column: int, columns: int) -> str:
+    if column == 0:
+        return "open"
+    return "done" if column == columns - 1 else "in_progress"
+
+class DatasetGenerator:
+    """
+    Rows of a synthetic dataset, as dicts ready for bulk inserts, generated lazily.
+
+    The same spec and first ids always give the same rows. Tickets get created_at spread
+    over spec.days in id order, and their history falls between creation and now.
+    """
+    def __init__(self, spec: DatasetSpec, first_ids: Optional[Dict[str, int]] = None,
+                 now: Optional[datetime.datetime] = None):
+        self.spec = spec
+        first_ids = first_ids or {}
+        self.first_board = first_ids.get("boards", 1)
+        self.first_status = first_ids.get("statuses", 1)
+        self.first_project = first_ids.get("projects", 1)
+        self.first_ticket = first_ids.get("tickets", 1)
+        # Timestamps are stored as naive UTC; the default keeps datasets reproducible
+        self.now = now or datetime.datetime(2026, 1, 1)
+        self.start = self.now - datetime.timedelta(days=spec.days)
+        self.names = status_names(spec.statuses_per_board)
+
+    def _rng(self, table: str) -> random.Random:
+        # One stream per table, so a table's rows do not depend on the size of the others
+        return random.Random(f"{self.spec.seed}:{table}")
+
+    def status_id(self, board: int, column: int) -> int:
+        return self.first_status + board * self.spec.statuses_per_board + column
+
+    def project_board(self, project: int) -> int:
+        return project % self.spec.boards
+
+    def ticket_created_at(self, ticket: int) -> datetime.datetime:
+        return self.start + (self.now - self.start) * (ticket / max(1, self.spec.tickets))
+
+    def _column(self, zipf: Zipf, rng: random.Random) -> int:
+        # Rank 1 is the last column (Done), where most tickets end up
+        return self.spec.statuses_per_board - zipf.rank(rng)
+
+    def boards(self) -> Iterator[Dict[str, Any]]:
+        for board in range(self.spec.boards):
+            yield {"id": self.first_board + board, "name": f"Board {board + 1}",
+                   "description": f"Synthetic board {board + 1}", "created_at": self.start, "updated_at": self.start}
+
+    def statuses(self) -> Iterator[Dict[str, Any]]:
+        for board in range(self.spec.boards):
+            for column, name in enumerate(self.names):
+                yield {"id": self.status_id(board, column), "name": name, "description": f"{name} column",
+                       "board_id": self.first_board + board, "created_at": self.start, "updated_at": self.start}
+
+    def projects(self) -> Iterator[Dict[str, Any]]:
+        for project in range(self.spec.projects):
+            yield {"id": self.first_project + project, "name": f"Project {project + 1}",
+                   "description": f"Synthetic project {project + 1}",
+                   "kanban_board_id": self.first_board + self.project_board(project),
+                   "created_at": self.start, "updated_at": self.start}
+
+    def tickets(self) -> Iterator[Dict[str, Any]]:
+        spec = self.spec
+        rng = self._rng("tickets")
+        hot_projects = Zipf(spec.projects, spec.project_skew)
+        project_for_rank = Scatter(spec.projects, rng)
+        columns = Zipf(spec.statuses_per_board, spec.status_skew)
+        for ticket in range(spec.tickets):
+            project = project_for_rank(hot_projects.rank(rng)) - 1
+            column = self._column(columns, rng)
+            created_at = self.ticket_created_at(ticket)
+            yield {
+                "id": self.first_ticket + ticket,
+                "title": f"Ticket {ticket + 1}",
+                "description": f"Synthetic ticket {ticket + 1} of project {project + 1}",
+                "status": ticket_status(column, spec.statuses_per_board),
+                "priority": rng.choice(TICKET_PRIORITIES),
+                "project_id": self.first_project + project,
+                "kanban_status_id": self.status_id(self.project_board(project), column),
+                "created_at": created_at,
+                "updated_at": created_at + (self.now - created_at) * rng.random(),
+            }
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        spec = self.spec
+        if spec.tickets == 0:
+            return
+        rng = self._rng("history")
+        hot_tickets = Zipf(spec.tickets, spec.history_skew)
+        ticket_for_rank = Scatter(spec.tickets, rng)
+        columns = Zipf(spec.statuses_per_board, spec.status_skew)
+        change_types = [change_type for change_type, _ in HISTORY_CHANGE_TYPES]
+        weights = [weight for _, weight in HISTORY_CHANGE_TYPES]
+        for _ in range(spec.history):
+            ticket = ticket_for_rank(hot_tickets.rank(rng)) - 1
+            created_at = self.ticket_created_at(ticket)
+            change_type = rng.choices(change_types, weights)[0]
+            if change_type == "status_change":
+                details = f"Status changed to {self.names[self._column(columns, rng)]}"
+            else:
+                details = f"Synthetic {change_type}"
+            yield {
+                "entity_type": "ticket",
+                "entity_id": self.first_ticket + ticket,
+                "change_type": change_type,
+                "timestamp": created_at + (self.now - created_at) * rng.random(),
+                "user_id": rng.randint(1, 50),
+                "details": details,
+            }
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+@contextmanager
+def _indexes_built_after_load(db: Session, model) -> Iterator[None]:
+    """
+    Drop the secondary indexes of an empty table, and on SQLite the trigger feeding the ticket
+    search index, while it is loaded; they are built once at the end, several times faster
+    than updated row by row. Tables that already hold rows keep their indexes.
+    """
+    if db.scalar(select(model.id).limit(1)) is not None:
+        yield
+        return
+    search_trigger = model is Ticket and db.get_bind().dialect.name == "sqlite"
+    trigger_ddl = next(statement for statement in TICKET_SEARCH_SQLITE_DDL if "tickets_fts_ai" in statement)
+    with UnitOfWork(db):
+        for index in model.__table__.indexes:
+            index.drop(db.connection(), checkfirst=True)
+        if search_trigger:
+            db.execute(text("DROP TRIGGER IF EXISTS tickets_fts_ai"))
+    try:
+        yield
+    finally:
+        started = time.perf_counter()
+        with UnitOfWork(db):
+            for index in model.__table__.indexes:
+                index.create(db.connection(), checkfirst=True)
+            if search_trigger:
+                db.execute(text(trigger_ddl))
+                db.execute(text(f"INSERT INTO {TICKET_SEARCH_TABLE}({TICKET_SEARCH_TABLE}) VALUES ('rebuild')"))
+        logger.info(f"Indexed {model.__tablename__} in {time.perf_counter() - started:.1f}s")
+
+def _insert(db: Session, model, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    started = time.perf_counter()
+    count = 0
+    with _indexes_built_after_load(db, model):
+        for batch in _batches(rows, batch_size):
+            with UnitOfWork(db):
+                db.execute(insert(model.__table__), batch)
+            count += len(batch)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Seeded {count} rows into {model.__tablename__} in {elapsed:.1f}s "
+                f"({count / elapsed if elapsed else 0:.0f} rows/s)")
+    return count
+
+def seed_dataset(db: Session, spec: DatasetSpec) -> Dict[str, int]:
+    """
+    Insert a synthetic dataset after the rows already in the database.
+
+    Rows are written with bulk Core inserts, spec.batch_size per transaction, into tables
+    whose indexes are built after the load when they start empty. Then the ticket
+    counters are rebuilt and (on Postgres) the id sequences moved past the new ids.
+
+    Args:
+        db (Session): The database session.
+        spec (DatasetSpec): Counts and skews of the rows to generate.
+
+    Returns:
+        Dict[str, int]: The number of rows inserted, by table.
+
+    Raises:
+        ValueError: If the spec asks for rows without the rows they belong to.
+    """
+    if spec.statuses_per_board < 1 or (spec.projects and not spec.boards) or (spec.tickets and not spec.projects) \
+            or (spec.history and not spec.tickets):
+        raise ValueError("Projects need boards, tickets need projects, history needs tickets, boards need statuses")
+    first_ids = {
+        name: (db.scalar(select(func.max(model.id))) or 0) + 1
+        for name, model in (("boards", KanbanBoard), ("statuses", KanbanStatus), ("projects", Project),
+                            ("tickets", Ticket))
+    }
+    generator = DatasetGenerator(spec, first_ids)
+    counts = {
+        "kanban_boards": _insert(db, KanbanBoard, generator.boards(), spec.batch_size),
+        "kanban_statuses": _insert(db, KanbanStatus, generator.statuses(), spec.batch_size),
+        "projects": _insert(db, Project, generator.projects(), spec.batch_size),
+        "tickets": _insert(db, Ticket, generator.tickets(), spec.batch_size),
+        "history": _insert(db, History, generator.history(), spec.batch_size),
+    }
+    TicketCounterCRUD(db).rebuild()
+    import_crud = ImportCRUD(db)
+    with import_crud.session_scope():
+        for model in (KanbanBoard, KanbanStatus, Project, Ticket):
+            import_crud.sync_id_sequence(model)
+    return counts
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description="Seed the database with a synthetic dataset.")
+    for spec_field in fields(DatasetSpec):
+        parser.add_argument(f"--{spec_field.name.replace('_', '-')}", type=type(getattr(defaults, spec_field.name)),
+                            default=getattr(defaults, spec_field.name), help=f"Default: {getattr(defaults, spec_field.name)}")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(**{spec_field.name: getattr(args, spec_field.name) for spec_field in fields(DatasetSpec)})
+    db = SessionLocal()
+    try:
+        counts = seed_dataset(db, spec)
+        logger.info(f"Dataset seeded: {counts}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.crud.async_crud import AsyncTicketCRUD
+from app.db_models.session import AnySession
 import logging
 
 def configure_logger():
@@ -10,7 +10,7 @@ def configure_logger():
 
 logger = configure_logger()
 
-def update_ticket_status(ticket_id: int, new_status: str, user_id: int, db: Session) -> bool:
+async def update_ticket_status(ticket_id: int, new_status: str, user_id: int, db: AnySession) -> bool:
     """
     Update the status of a ticket.
 
@@ -18,14 +18,14 @@ def update_ticket_status(ticket_id: int, new_status: str, user_id: int, db: Sess
         ticket_id (int): The ID of the ticket.
         new_status (str): The new status of the ticket.
         user_id (int): The ID of the user making the update.
-        db (Session): The database session.
+        db (AnySession): The database session, sync or async.
 
     Returns:
         bool: True if the update was successful, False otherwise.
     """
     try:
-        ticket_crud = TicketCRUD(db)
-        result = ticket_crud.update_status(ticket_id, new_status, user_id)
+        ticket_crud = AsyncTicketCRUD(db)
+        result = await ticket_crud.update_status(ticket_id, new_status, user_id)
         logger.info(f"Ticket {ticket_id} status updated to {new_status} by user {user_id}")
         return result
     except Exception as e:
@@ -0,0 +1,241 @@
+"""
+Time the CRUD layer on SQLite databases of growing size, to see which paths degrade with the tables.
+
+Each --rows size gets a database of that many tickets and as many history entries
+(plus projects, boards and statuses), built once in --data-dir and reused by later runs.
+Every operation is measured:
+
+- warm: --samples calls on one session, after --warmup unmeasured calls.
+- cold: --cold-samples calls, each on a new engine (empty SQLite page cache) with the
+  model caches cleared. The OS page cache is not dropped.
+- memory: the peak of Python allocations (tracemalloc) over --memory-samples calls.
+
+Writes run in a transaction that is rolled back, so the databases stay as seeded; their
+timings leave out the commit itself.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_crud --rows 10000,1000000,10000000 --output crud.json
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from sqlalchemy.orm import Session
+from app.core.config import get_app_settings
+from app.db_models.base import Base, Ticket
+from app.db_models.crud.base_crud import BaseCRUD
+from app.db_models.crud.cache import get_cache_backend
+from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.crud.kanban_status_crud import KanbanStatusCRUD
+from app.db_models.crud.project_crud import ProjectCRUD
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.session import create_db_engine
+from app.services.seed_service import DatasetSpec, seed_dataset
+from benchmarks.bench_http import TICKET_PRIORITIES, TICKET_STATUSES, Dataset, load_dataset
+
+PAGE_SIZE = 50
+
+
+@dataclass
+class Operation:
+    name: str
+    run: Callable[[Session, Dataset, random.Random], Any]
+
+
+def _ticket(data: Dataset, rng: random.Random) -> Dict[str, Any]:
+    project_id = rng.choice(data.project_ids)
+    return {
+        "project_id": project_id,
+        "title": "Benchmark ticket",
+        "description": "Created by the CRUD benchmark",
+        "status": rng.choice(TICKET_STATUSES),
+        "priority": rng.choice(TICKET_PRIORITIES),
+        "kanban_status_id": rng.choice(data.statuses_by_board[data.project_boards[project_id]]),
+    }
+
+
+def _deep_skip(data: Dataset, rng: random.Random) -> int:
+    return rng.randint(0, max(0, data.max_ticket_id - data.min_ticket_id + 1 - PAGE_SIZE))
+
+
+OPERATIONS = [
+    Operation("BaseCRUD.get", lambda db, data, rng: BaseCRUD(db, Ticket).get(data.ticket_id(rng))),
+    Operation("TicketCRUD.get_all(skip)", lambda db, data, rng: TicketCRUD(db).get_all(
+        skip=_deep_skip(data, rng), limit=PAGE_SIZE)),
+    Operation("TicketCRUD.get_all(cursor)", lambda db, data, rng: TicketCRUD(db).get_all(
+        cursor=TicketCRUD.cursor_for(Ticket(id=data.ticket_id(rng))), limit=PAGE_SIZE)),
+    Operation("TicketCRUD.get_all(project_id)", lambda db, data, rng: TicketCRUD(db).get_all(
+        project_id=rng.choice(data.project_ids), limit=PAGE_SIZE)),
+    Operation("TicketCRUD.create", lambda db, data, rng: TicketCRUD(db).create(**_ticket(data, rng))),
+    Operation("TicketCRUD.update_status", lambda db, data, rng: TicketCRUD(db).update_status(
+        data.ticket_id(rng), rng.choice(TICKET_STATUSES), 1)),
+    Operation("ProjectCRUD.get", lambda db, data, rng: ProjectCRUD(db).get(rng.choice(data.project_ids))),
+    Operation("ProjectCRUD.get_all(skip)", lambda db, data, rng: ProjectCRUD(db).get_all(
+        skip=rng.randint(0, max(0, len(data.project_ids) - PAGE_SIZE)), limit=PAGE_SIZE)),
+    Operation("ProjectCRUD.update_status", lambda db, data, rng: ProjectCRUD(db).update_status(
+        rng.choice(data.project_ids), "active", 1)),
+    Operation("HistoryCRUD.get_by_entity_id", lambda db, data, rng: HistoryCRUD(db).get_by_entity_id(
+        "ticket", data.ticket_id(rng), limit=20)),
+    Operation("KanbanStatusCRUD.get", lambda db, data, rng: KanbanStatusCRUD(db).get(
+        rng.choice(data.statuses_by_board[rng.choice(data.board_ids)]))),
+    Operation("KanbanStatusCRUD.get_all", lambda db, data, rng: KanbanStatusCRUD(db).get_all(limit=PAGE_SIZE)),
+]
+
+
+class RolledBackSession:
+    """
+    Session on a connection whose transaction is rolled back on exit. The commits of the
+    CRUD classes only flush, so they leave the database unchanged.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self) -> Session:
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        self.db = Session(bind=self.connection, join_transaction_mode="rollback_only",
+                          autoflush=False, expire_on_commit=False)
+        return self.db
+
+    def __exit__(self, *exc_info) -> None:
+        self.db.close()
+        if self.transaction.is_active:
+            self.transaction.rollback()
+        self.connection.close()
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    ordered = sorted(seconds)
+    pick = lambda pct: ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+    return {
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "p50_ms": round(pick(50) * 1000, 4),
+        "p95_ms": round(pick(95) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def measure_warm(engine, operation: Operation, data: Dataset, rng: random.Random, warmup: int,
+                 samples: int) -> List[float]:
+    timings = []
+    with RolledBackSession(engine) as db:
+        for _ in range(warmup):
+            operation.run(db, data, rng)
+        for _ in range(samples):
+            start = time.perf_counter()
+            operation.run(db, data, rng)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_cold(settings, operation: Operation, data: Dataset, rng: random.Random, samples: int) -> List[float]:
+    timings = []
+    for _ in range(samples):
+        engine = create_db_engine(settings)
+        get_cache_backend().clear()
+        try:
+            with RolledBackSession(engine) as db:
+                start = time.perf_counter()
+                operation.run(db, data, rng)
+                timings.append(time.perf_counter() - start)
+        finally:
+            engine.dispose()
+    return timings
+
+
+def measure_memory(engine, operation: Operation, data: Dataset, rng: random.Random, samples: int) -> int:
+    with RolledBackSession(engine) as db:
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for _ in range(samples):
+                operation.run(db, data, rng)
+            return tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+
+
+def prepare_database(path: str, rows: int, seed: int):
+    """
+    Engine on the benchmark database of the given size, seeding it when it does not exist yet.
+    """
+    settings = get_app_settings().model_copy(update={"database_url": f"sqlite:///{path}", "metrics_enabled": False,
+                                                     "sql_instrumentation": False})
+    engine = create_db_engine(settings)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        started = time.perf_counter()
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed_dataset(db, DatasetSpec(boards=10, projects=max(10, rows // 1000), tickets=rows, history=rows, seed=seed))
+        print(f"Seeded {path} with {rows} tickets in {time.perf_counter() - started:.1f}s")
+    return settings, engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CRUD operations at growing table sizes.")
+    parser.add_argument("--rows", default="10000", help="Comma-separated numbers of tickets (and history entries)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "alfred-bench"),
+                        help="Directory keeping the seeded databases between runs")
+    parser.add_argument("--operations", help="Comma-separated operation names (default: all)")
+    parser.add_argument("--samples", type=int, default=200, help="Measured warm calls per operation")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured calls before the warm ones")
+    parser.add_argument("--cold-samples", type=int, default=20, help="Measured calls on a new engine each")
+    parser.add_argument("--memory-samples", type=int, default=20, help="Calls traced for the allocation peak")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+    # The info records of the CRUD classes would be timed along with them
+    logging.getLogger().setLevel(logging.WARNING)
+    operations = OPERATIONS
+    if args.operations:
+        names = {name.strip() for name in args.operations.split(",")}
+        operations = [operation for operation in OPERATIONS if operation.name in names]
+        unknown = names - {operation.name for operation in operations}
+        if unknown:
+            parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    results = []
+    for rows in (int(size) for size in args.rows.split(",")):
+        settings, engine = prepare_database(os.path.join(args.data_dir, f"crud-{rows}.db"), rows, args.seed)
+        data = load_dataset(engine)
+        print(f"\n{rows} tickets: {'operation':<32} {'warm p50':>10} {'warm p95':>10} {'cold p50':>10} {'peak alloc':>12}")
+        for operation in operations:
+            rng = random.Random(args.seed)
+            warm = summarize(measure_warm(engine, operation, data, rng, args.warmup, args.samples))
+            cold = summarize(measure_cold(settings, operation, data, rng, args.cold_samples))
+            peak = measure_memory(engine, operation, data, rng, args.memory_samples)
+            results.append({"rows": rows, "operation": operation.name, "warm": warm, "cold": cold,
+                            "peak_alloc_kib": round(peak / 1024, 1)})
+            print(f"{'':<{len(str(rows)) + 10}}{operation.name:<32} {warm['p50_ms']:>8.3f}ms {warm['p95_ms']:>8.3f}ms "
+                  f"{cold['p50_ms']:>8.3f}ms {peak / 1024:>9.1f}KiB")
+        engine.dispose()
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            # ru_maxrss is in KiB on Linux
+            "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Load-test the HTTP API: scripted scenarios against the app served by an in-process uvicorn.
+
+The app runs on its own thread and event loop, on a SQLite database seeded by
+app.services.seed_service, and is driven by httpx.AsyncClient workers. Each scenario runs
+for --duration seconds at each of the --concurrency levels, after --warmup seconds that
+are not measured. The report is JSON: requests per second, latency percentiles (ms) and
+error rates per scenario and level, so runs can be kept and compared.
+
+Scenarios:
+
+- board_polling: board views and board stats, as open kanban boards refresh.
+- ticket_churn: tickets created, updated and deleted.
+- status_moves: single ticket status changes, each recording history.
+- history_reads: history pages of tickets.
+
+Needs httpx, from requirements-dev.txt. Run from the repository root:
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.bench_http --tickets 100000 --concurrency 1,8,32 --output run.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+TICKET_STATUSES = ("open", "in_progress", "review", "done")
+TICKET_PRIORITIES = ("low", "medium", "high")
+
+
+@dataclass
+class Dataset:
+    """
+    Ids of the seeded rows the scenarios pick from.
+    """
+    board_ids: List[int]
+    statuses_by_board: Dict[int, List[int]]
+    project_boards: Dict[int, int]
+    min_ticket_id: int
+    max_ticket_id: int
+    project_ids: List[int] = field(init=False)
+
+    def __post_init__(self):
+        self.project_ids = sorted(self.project_boards)
+
+    def ticket_id(self, rng: random.Random) -> int:
+        return rng.randint(self.min_ticket_id, self.max_ticket_id)
+
+
+@dataclass
+class WorkerState:
+    rng: random.Random
+    # Tickets created by the worker, which only it updates and deletes
+    created: List[int] = field(default_factory=list)
+
+
+Scenario = Callable[[httpx.AsyncClient, Dataset, WorkerState], Awaitable[httpx.Response]]
+
+
+async def board_polling(client: httpx.AsyncClient, data: Dataset, state: WorkerState) -> httpx.Response:
+    board_id = state.rng.choice(data.board_ids)
+    if state.rng.random() < 0.7:
+        return await client.get(f"/api/kanbanboard/{board_id}/view")
+    return await client.get(f"/api/kanbanboard/{board_id}/stats")
+
+
+async def ticket_churn(client: httpx.AsyncClient, data: Dataset, state: WorkerState) -> httpx.Response:
+    rng = state.rng
+    action = rng.random()
+    if state.created and action < 0.3:
+        return await client.delete(f"/api/tickets/{state.created.pop()}")
+    project_id = rng.choice(data.project_ids)
+    ticket = {
+        "project_id": project_id,
+        "title": f"Load test ticket {rng.getrandbits(32):08x}",
+        "description": "Created by the HTTP benchmark",
+        "status": rng.choice(TICKET_STATUSES),
+        "priority": rng.choice(TICKET_PRIORITIES),
+        "kanban_status_id": rng.choice(data.statuses_by_board[data.project_boards[project_id]]),
+    }
+    if state.created and action < 0.6:
+        return await client.put(f"/api/tickets/{rng.choice(state.created)}", json=ticket)
+    response = await client.post("/api/tickets/", json=ticket)
+    if response.status_code == 201:
+        state.created.append(response.json()["id"])
+    return response
+
+
+async def status_moves(client: httpx.AsyncClient, data: Dataset, state: WorkerState) -> httpx.Response:
+    return await client.put(f"/api/tickets/{data.ticket_id(state.rng)}/status",
+                            params={"new_status": state.rng.choice(TICKET_STATUSES), "user_id": 1})
+
+
+async def history_reads(client: httpx.AsyncClient, data: Dataset, state: WorkerState) -> httpx.Response:
+    return await client.get(f"/history/ticket/{data.ticket_id(state.rng)}", params={"limit": 50})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "board_polling": board_polling,
+    "ticket_churn": ticket_churn,
+    "status_moves": status_moves,
+    "history_reads": history_reads,
+}
+
+
+def load_dataset(engine) -> Dataset:
+    from sqlalchemy import func, select
+    from app.db_models.base import KanbanStatus, Project, Ticket
+
+    with engine.connect() as connection:
+        statuses_by_board: Dict[int, List[int]] = {}
+        for status_id, board_id in connection.execute(select(KanbanStatus.id, KanbanStatus.board_id)):
+            statuses_by_board.setdefault(board_id, []).append(status_id)
+        project_boards = dict(connection.execute(select(Project.id, Project.kanban_board_id)).all())
+        min_ticket_id, max_ticket_id = connection.execute(select(func.min(Ticket.id), func.max(Ticket.id))).one()
+    if not project_boards or min_ticket_id is None:
+        raise SystemExit("The database holds no projects or tickets to load-test against")
+    return Dataset(sorted(statuses_by_board), statuses_by_board, project_boards, min_ticket_id, max_ticket_id)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+async def run_level(base_url: str, scenario: Scenario, data: Dataset, concurrency: int, duration: float,
+                    warmup: float, seed: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker(number: int, until: float, measure: bool) -> None:
+            state = WorkerState(random.Random(seed * 1000 + number))
+            while time.perf_counter() < until:
+                start = time.perf_counter()
+                try:
+                    status = str((await scenario(client, data, state)).status_code)
+                except httpx.HTTPError as exc:
+                    status = type(exc).__name__
+                if measure:
+                    latencies.append(time.perf_counter() - start)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+        if warmup > 0:
+            until = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(n, until, False) for n in range(concurrency)))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n, started + duration, True) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+        "statuses": statuses,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the HTTP API with scripted scenarios.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario and level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each measurement")
+    parser.add_argument("--database", help="SQLite file to use; seeded when it does not exist (default: a temporary file)")
+    parser.add_argument("--boards", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--history", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the dataset and of the scenarios")
+    parser.add_argument("--async-database", action="store_true", help="Serve requests from AsyncSessions")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+    scenarios = [name.strip() for name in args.scenarios.split(",")]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database or os.path.join(tmp, "bench.db"))
+        seeded = os.path.exists(path)
+        # The settings are read when the app is imported
+        os.environ.update(DATABASE_URL=f"sqlite:///{path}", ASYNC_DATABASE=str(args.async_database).lower(),
+                          CREATE_DEFAULTS="false", LOGGING_LEVEL="30")
+        import uvicorn
+        from app.db_models.schema import ensure_schema
+        from app.db_models.session import SessionLocal, engine
+        from app.main import app
+        from app.services.seed_service import DatasetSpec, seed_dataset
+
+        if not seeded:
+            ensure_schema(engine)
+            with SessionLocal() as db:
+                seed_dataset(db, DatasetSpec(boards=args.boards, projects=args.projects, tickets=args.tickets,
+                                             history=args.history, seed=args.seed))
+        data = load_dataset(engine)
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                               access_log=False, lifespan="on"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise SystemExit("The server failed to start")
+            time.sleep(0.01)
+        try:
+            results = []
+            for name in scenarios:
+                for concurrency in levels:
+                    result = asyncio.run(run_level(f"http://127.0.0.1:{port}", SCENARIOS[name], data, concurrency,
+                                                   args.duration, args.warmup, args.seed))
+                    results.append({"scenario": name, **result})
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "async_database": args.async_database,
+        "dataset": {"boards": len(data.board_ids), "projects": len(data.project_boards),
+                    "tickets": data.max_ticket_id - data.min_ticket_id + 1},
+        "duration": args.duration,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare the two ways a list route can turn a page of ORM rows into a JSON body.
+
+- validated: what FastAPI does with response_model=list[Schema]: validate the rows into
+  models (from attributes), dump them in JSON mode and encode with the stdlib encoder.
+- fast: app.api.fast_json, which reads the rows straight into dicts and encodes them
+  with orjson.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_list_serialization --rows 1000 --repeat 200
+"""
+import argparse
+import datetime
+import json
+import timeit
+from typing import List
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse, Response
+from app.api.fast_json import fast_list_response, orjson
+from app.db_models.base import History, Project, Ticket
+from app.schemas.history import HistoryResponse
+from app.schemas.project import ProjectResponse
+from app.schemas.ticket import TicketResponse
+
+
+def make_rows(model, count: int):
+    now = datetime.datetime(2026, 1, 1, 12, 0, 0, 123456)
+    if model is Ticket:
+        return [Ticket(id=i, title=f"Ticket {i}", description="Lorem ipsum dolor sit amet " * 4, status="open",
+                       priority="high", project_id=1, kanban_status_id=2, created_at=now, updated_at=now)
+                for i in range(count)]
+    if model is Project:
+        return [Project(id=i, name=f"Project {i}", description="Lorem ipsum", kanban_board_id=1,
+                        created_at=now, updated_at=now) for i in range(count)]
+    return [History(id=i, entity_type="ticket", entity_id=i, change_type="status_change", timestamp=now,
+                    user_id=1, details="Status changed to done") for i in range(count)]
+
+
+def validated_body(adapter: TypeAdapter, rows) -> bytes:
+    models = adapter.validate_python(rows, from_attributes=True)
+    return JSONResponse(adapter.dump_python(models, mode="json")).body
+
+
+def fast_body(schema, rows) -> bytes:
+    return fast_list_response(rows, schema, Response()).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="Pages serialized per measurement")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows per page, orjson {'installed' if orjson is not None else 'missing, stdlib fallback'}")
+    for model, schema in ((Ticket, TicketResponse), (Project, ProjectResponse), (History, HistoryResponse)):
+        rows = make_rows(model, args.rows)
+        adapter = TypeAdapter(List[schema])
+        assert json.loads(validated_body(adapter, rows)) == json.loads(fast_body(schema, rows))
+        validated = min(timeit.repeat(lambda: validated_body(adapter, rows), number=args.repeat, repeat=3)) / args.repeat
+        fast = min(timeit.repeat(lambda: fast_body(schema, rows), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{schema.__name__:<16} validated {validated * 1000:7.2f} ms/page   fast {fast * 1000:7.2f} ms/page   "
+              f"x{validated / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,13 @@ import pytest
 import logging
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
 from app.db_models.base import Base, KanbanBoard
 from app.api.dependencies import get_db
+from app.db_models.crud.cache import MemoryCacheBackend, set_cache_backend
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +22,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Configured like AsyncSessionLocal; no pool, as every TestClient runs its own event loop
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 Base.metadata.create_all(bind=engine)
 
@@ -29,13 +35,23 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
 
-@pytest.fixture(scope="module")
-def client():
-    logger.info("Creating TestClient fixture")
-    with TestClient(app) as c:
-        yield c
+# Route tests run against both kinds of session get_db can yield
+@pytest.fixture(scope="module", params=["sync", "async"])
+def client(request):
+    logger.info(f"Creating TestClient fixture with {request.param} sessions")
+    if request.param == "async":
+        app.dependency_overrides[get_db] = override_get_async_db
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
     logger.info("TestClient fixture closed")
 
 # Ensure the database schema is reset before each test
@@ -44,6 +60,7 @@ def reset_database():
     logger.info("Resetting database schema")
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    set_cache_backend(MemoryCacheBackend())
     logger.info("Database schema reset")
 
 # Create a new database session for each test
@@ -0,0 +1,37 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from app.db_models.crud.async_crud import AsyncTicketCRUD, AsyncHistoryCRUD
+
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+ticket_data = {"title": "Test Ticket", "description": "Test Description", "status": "open", "priority": "low", "project_id": 1, "kanban_status_id": 1}
+
+def test_async_ticket_crud_with_async_session():
+    async def scenario():
+        engine = create_async_engine(ASYNC_DATABASE_URL)
+        try:
+            async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+                ticket_crud = AsyncTicketCRUD(db)
+                ticket = await ticket_crud.create(**ticket_data)
+                fetched_ticket = await ticket_crud.get(ticket.id)
+                tickets = await ticket_crud.get_all(limit=5)
+                return ticket, fetched_ticket, tickets
+        finally:
+            await engine.dispose()
+
+    ticket, fetched_ticket, tickets = asyncio.run(scenario())
+    assert ticket.id is not None
+    assert fetched_ticket.title == "Test Ticket"
+    assert [t.id for t in tickets] == [ticket.id]
+
+def test_async_crud_with_sync_session(db_session: Session):
+    async def scenario():
+        ticket = await AsyncTicketCRUD(db_session).create(**ticket_data)
+        title = (await AsyncTicketCRUD(db_session).get(ticket.id)).title
+        await AsyncHistoryCRUD(db_session).create(entity_type="ticket", entity_id=1, change_type="create", user_id=1)
+        return title, await AsyncHistoryCRUD(db_session).get_by_entity_id("ticket", 1)
+
+    title, history = asyncio.run(scenario())
+    assert title == "Test Ticket"
+    assert len(history) == 1
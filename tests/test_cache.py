@@ -0,0 +1,125 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.db_models.crud.cache import MemoryCacheBackend
+from app.db_models.crud.kanban_board_crud import KanbanBoardCRUD
+from app.db_models.crud.kanban_status_crud import KanbanStatusCRUD
+from app.db_models.crud.unit_of_work import UnitOfWork
+from tests.conftest import TestingSessionLocal
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def count_selects(db_session: Session):
+    statements = []
+
+    def before_execute(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(clauseelement)
+
+    event.listen(db_session.get_bind(), "before_execute", before_execute)
+    return statements, lambda: event.remove(db_session.get_bind(), "before_execute", before_execute)
+
+def test_memory_backend_ttl():
+    clock = FakeClock()
+    backend = MemoryCacheBackend(ttl=10, clock=clock)
+    backend.set("a", 1)
+    assert backend.get("a") == 1
+    clock.now = 10
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+def test_memory_backend_lru_eviction():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+
+def test_memory_backend_clear_prefix():
+    backend = MemoryCacheBackend()
+    backend.set("kanban_status:id:1", 1)
+    backend.set("kanban_board:id:1", 2)
+    backend.clear("kanban_status:")
+    assert backend.get("kanban_status:id:1") is None
+    assert backend.get("kanban_board:id:1") == 2
+
+def test_kanban_status_get_is_cached(db_session: Session):
+    kanban_status_crud = KanbanStatusCRUD(db_session)
+    kanban_status = kanban_status_crud.create(name="To Do", board_id=1)
+    hits, misses = kanban_status_crud.cache.hits, kanban_status_crud.cache.misses
+
+    assert kanban_status_crud.get(kanban_status.id).name == "To Do"
+    statements, stop = count_selects(db_session)
+    try:
+        fetched = kanban_status_crud.get(kanban_status.id)
+        statuses = kanban_status_crud.get_all()
+        statuses = kanban_status_crud.get_all()
+    finally:
+        stop()
+
+    assert fetched.name == "To Do"
+    assert [status.name for status in statuses] == ["To Do"]
+    assert len(statements) == 1
+    assert kanban_status_crud.cache.hits - hits == 2
+    assert kanban_status_crud.cache.misses - misses == 2
+
+def test_kanban_status_writes_invalidate(db_session: Session):
+    kanban_status_crud = KanbanStatusCRUD(db_session)
+    kanban_status = kanban_status_crud.create(name="To Do", board_id=1)
+    assert [status.name for status in kanban_status_crud.get_all()] == ["To Do"]
+    assert kanban_status_crud.get(kanban_status.id).name == "To Do"
+
+    kanban_status_crud.update(kanban_status.id, name="Doing")
+    assert kanban_status_crud.get(kanban_status.id).name == "Doing"
+    kanban_status_crud.create(name="Done", board_id=1)
+    assert [status.name for status in kanban_status_crud.get_all()] == ["Doing", "Done"]
+    kanban_status_crud.delete(kanban_status.id)
+    assert kanban_status_crud.get(kanban_status.id) is None
+
+def test_kanban_board_writes_invalidate(db_session: Session):
+    kanban_board_crud = KanbanBoardCRUD(db_session)
+    assert kanban_board_crud.get(1).name == "Test Board"
+    kanban_board_crud.update(1, name="Renamed")
+    assert kanban_board_crud.get(1).name == "Renamed"
+    assert [board.name for board in kanban_board_crud.get_all()] == ["Renamed"]
+
+def test_kanban_board_version_is_cached(db_session: Session):
+    kanban_board_crud = KanbanBoardCRUD(db_session)
+    version = kanban_board_crud.version()
+    statements, stop = count_selects(db_session)
+    try:
+        assert kanban_board_crud.version() == version
+        kanban_board_crud.get_all()
+        assert kanban_board_crud.get_all()[0].name == "Test Board"
+    finally:
+        stop()
+    assert len(statements) == 1
+
+    kanban_board_crud.update(1, name="Renamed")
+    assert kanban_board_crud.version()[0] == version[0] + 1
+
+def test_invalidation_waits_for_the_enclosing_commit(db_session: Session):
+    kanban_board_crud = KanbanBoardCRUD(db_session)
+    with UnitOfWork(db_session):
+        kanban_board_crud.update(1, name="Renamed")
+        # A concurrent reader caches the committed row before the write commits
+        with TestingSessionLocal() as other:
+            assert KanbanBoardCRUD(other).get(1).name == "Test Board"
+    assert kanban_board_crud.get(1).name == "Renamed"
+
+    kanban_board_crud.cache.invalidate()
+    try:
+        with UnitOfWork(db_session):
+            kanban_board_crud.update(1, name="Rolled back")
+            # Cached from inside the transaction, and dropped when it rolls back
+            assert kanban_board_crud.get(1).name == "Rolled back"
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+    assert kanban_board_crud.get(1).name == "Renamed"
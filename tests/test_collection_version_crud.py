@@ -0,0 +1,49 @@
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from app.db_models.crud.collection_version_crud import CollectionVersionCRUD
+from app.db_models.crud.project_crud import ProjectCRUD
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.base import KanbanStatus, Project, Ticket
+from app.db_models.query_stats import explain
+
+def test_versions_follow_committed_writes(db_session: Session):
+    versions = CollectionVersionCRUD(db_session)
+    project_crud = ProjectCRUD(db_session)
+    assert versions.get("projects") == (0, None)
+
+    project = project_crud.create(name="P", description="D", kanban_board_id=1)
+    assert versions.get("projects")[0] == 1
+    project_crud.update(project.id, name="P2")
+    assert versions.get("projects")[0] == 2
+
+    db_session.add(KanbanStatus(name="To Do", board_id=1))
+    db_session.commit()
+    ticket_crud = TicketCRUD(db_session)
+    ticket = ticket_crud.create(title="T", description="D", status="open", priority="low",
+                                project_id=project.id, kanban_status_id=1)
+    assert versions.get("tickets")[0] == 1
+    assert ticket_crud.bulk_update_status("done", user_id=1, ticket_ids=[ticket.id]) == 1
+    assert versions.get("tickets")[0] == 2
+    ticket_crud.delete(ticket.id)
+    assert versions.get("tickets")[0] == 3
+    assert versions.get("projects")[0] == 2
+
+def test_statement_writes_bump_once_per_transaction(db_session: Session):
+    versions = CollectionVersionCRUD(db_session)
+    db_session.execute(insert(Project), [{"name": "A", "description": "D", "kanban_board_id": 1},
+                                         {"name": "B", "description": "D", "kanban_board_id": 1}])
+    db_session.execute(update(Project).values(description="E"))
+    db_session.commit()
+    assert versions.get("projects")[0] == 1
+
+    db_session.execute(update(Project).values(description="F"))
+    db_session.rollback()
+    assert versions.get("projects")[0] == 1
+
+def test_version_query_does_not_scan_the_table(db_session: Session):
+    connection = db_session.connection()
+    statement = CollectionVersionCRUD.version_query(Ticket.__tablename__).compile(connection)
+    plan = explain(connection, str(statement), tuple(statement.params.values()))
+    assert "collection_versions" in plan
+    assert "SCAN" not in plan
+    assert "tickets" not in plan
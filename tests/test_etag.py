@@ -0,0 +1,52 @@
+from app.api.etag import etag_matches, make_etag
+
+def test_etag_matches():
+    etag = make_etag("Ticket", 1, "2026-01-01")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag[2:], etag)
+    assert etag_matches(f'W/"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"other"', etag)
+    assert not etag_matches(None, etag)
+
+def test_conditional_ticket_requests(client):
+    board = client.post("/api/kanbanboard/", json={"name": "Board"}).json()
+    status = client.post("/api/kanbanstatus/", json={"name": "To Do", "board_id": board["id"]}).json()
+    project = client.post("/api/projects/", json={"name": "P", "description": "D", "kanban_board_id": board["id"]}).json()
+    ticket = client.post("/api/tickets/", json={"title": "T", "description": "D", "status": "open", "priority": "low",
+                                                "project_id": project["id"], "kanban_status_id": status["id"]}).json()
+
+    response = client.get(f"/api/tickets/{ticket['id']}")
+    etag = response.headers["ETag"]
+    response = client.get(f"/api/tickets/{ticket['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    update = {key: ticket[key] for key in ("title", "description", "status", "priority", "project_id", "kanban_status_id")}
+    response = client.put(f"/api/tickets/{ticket['id']}", json={**update, "title": "T2"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    response = client.put(f"/api/tickets/{ticket['id']}", json={**update, "title": "T3"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert client.get(f"/api/tickets/{ticket['id']}", headers={"If-None-Match": etag}).json()["title"] == "T2"
+
+    response = client.get("/api/tickets/")
+    etag = response.headers["ETag"]
+    assert client.get("/api/tickets/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/tickets/?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+def test_conditional_list_requests(client):
+    board = client.post("/api/kanbanboard/", json={"name": "Board"}).json()
+    client.post("/api/projects/", json={"name": "P", "description": "D", "kanban_board_id": board["id"]})
+    for path in ("/api/projects/", "/api/kanbanboard/"):
+        etag = client.get(path).headers["ETag"]
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    etags = {path: client.get(path).headers["ETag"] for path in ("/api/projects/", "/api/kanbanboard/")}
+    client.put(f"/api/kanbanboard/{board['id']}", json={"name": "Renamed"})
+    client.post("/api/projects/", json={"name": "Q", "description": "D", "kanban_board_id": board["id"]})
+    for path, etag in etags.items():
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -0,0 +1,48 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+from sqlalchemy.orm import Session
+from app.db_models.base import History, Ticket
+from app.services.export_service import ExportEncoder, export_rows
+from app.db_models.crud.history_crud import HistoryCRUD
+from app.db_models.crud.ticket_crud import TicketCRUD
+
+def test_export_encoder_ndjson_and_csv():
+    rows = [(1, "a,b", datetime.datetime(2026, 1, 2, 3, 4, 5)), (2, None, None)]
+    encoder = ExportEncoder(["id", "title", "updated_at"])
+    lines = (encoder.start() + encoder.encode(rows) + encoder.finish()).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "title": "a,b", "updated_at": "2026-01-02T03:04:05"},
+        {"id": 2, "title": None, "updated_at": None},
+    ]
+
+    encoder = ExportEncoder(["id", "title", "updated_at"], "csv", compress=True)
+    body = encoder.start() + encoder.encode(rows[:1]) + encoder.encode(rows[1:]) + encoder.finish()
+    assert list(csv.reader(io.StringIO(gzip.decompress(body).decode()))) == [
+        ["id", "title", "updated_at"], ["1", "a,b", "2026-01-02T03:04:05"], ["2", "", ""]]
+
+def test_export_rows_in_batches(db_session: Session):
+    for i in range(7):
+        db_session.add(Ticket(title=f"Ticket {i}", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1))
+    db_session.add(History(entity_type="ticket", entity_id=1, change_type="create", user_id=1,
+                           timestamp=datetime.datetime(2020, 1, 1)))
+    db_session.add(History(entity_type="ticket", entity_id=2, change_type="create", user_id=1))
+    db_session.commit()
+
+    chunks = list(export_rows(db_session, TicketCRUD.export_query(), batch_size=3))
+    # start, three batches, finish
+    assert len(chunks) == 5
+    assert [json.loads(line)["title"] for line in b"".join(chunks).decode().splitlines()] == [f"Ticket {i}" for i in range(7)]
+
+    since = datetime.datetime(2021, 1, 1)
+    lines = b"".join(export_rows(db_session, HistoryCRUD.export_query(since))).decode().splitlines()
+    assert [json.loads(line)["entity_id"] for line in lines] == [2]
+
+def test_export_endpoint(client):
+    response = client.get("/api/tickets/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("id,title")
+    assert client.get("/history/export", params={"format": "xml"}).status_code == 422
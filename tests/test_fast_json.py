@@ -0,0 +1,43 @@
+from loguru import logger
+from app.api import fast_json
+from app.core.config import get_app_settings
+
+def test_fast_list_responses_match_validated_ones(client):
+    board = client.post("/api/kanbanboard/", json={"name": "Board"}).json()
+    status = client.post("/api/kanbanstatus/", json={"name": "To Do", "board_id": board["id"]}).json()
+    project = client.post("/api/projects/", json={"name": "P", "description": "D", "kanban_board_id": board["id"]}).json()
+    for i in range(3):
+        client.post("/api/tickets/", json={"title": f"T{i}", "description": "D", "status": "open", "priority": "low",
+                                           "project_id": project["id"], "kanban_status_id": status["id"]})
+    paths = ["/api/tickets/?limit=2", "/api/projects/", "/api/kanbanboard/", "/api/kanbanstatus/", f"/history/project/{project['id']}"]
+    validated = {path: client.get(path) for path in paths}
+
+    settings = get_app_settings()
+    settings.fast_json_responses = True
+    try:
+        for path in paths:
+            response = client.get(path)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert response.json() == validated[path].json()
+            assert response.headers.get("etag") == validated[path].headers.get("etag")
+            assert response.headers.get("x-next-cursor") == validated[path].headers.get("x-next-cursor")
+            # Only the history routes take an `after` cursor to page backwards
+            if not path.startswith("/history"):
+                assert "x-prev-cursor" not in response.headers
+    finally:
+        settings.fast_json_responses = False
+
+def test_stdlib_fallback_is_logged_once(monkeypatch):
+    content = [{"id": 1, "name": "Bo\u00efte"}]
+    expected = fast_json.dumps(content)
+    monkeypatch.setattr(fast_json, "orjson", None)
+    monkeypatch.setattr(fast_json, "_fallback_logged", False)
+    messages = []
+    sink = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        assert fast_json.dumps(content) == expected
+        assert fast_json.dumps(content) == expected
+    finally:
+        logger.remove(sink)
+    assert len([message for message in messages if "orjson" in message]) == 1
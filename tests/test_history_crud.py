@@ -1,8 +1,11 @@
+import datetime
 import pytest
 import logging
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.db_models.crud.history_crud import HistoryCRUD
-from app.db_models.base import History  # Ensure History model is imported
+from app.db_models.crud.cache import get_cache_backend
+from app.db_models.crud.history_crud import ARCHIVE_WATERMARK_KEY, HistoryCRUD
+from app.db_models.base import History, HistoryArchive  # Ensure History model is imported
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -136,3 +139,82 @@ def test_delete_nonexistent_history_entry(history_crud: HistoryCRUD, db_session:
     with pytest.raises(ValueError):
         history_crud.delete(id=9999)  # Nonexistent ID
     logger.info("Finished test_delete_nonexistent_history_entry")
+
+def test_get_history_by_entity_keyset_pagination(history_crud: HistoryCRUD, db_session: Session):
+    logger.info("Starting test_get_history_by_entity_keyset_pagination")
+    for i in range(5):
+        history_crud.create(
+            entity_type="ticket",
+            entity_id=7,
+            change_type="status_change",
+            user_id=123,
+            details=f"Change {i}"
+        )
+    db_session.commit()
+
+    first_page = history_crud.get_by_entity_id("ticket", 7, limit=2)
+    assert [entry.details for entry in first_page] == ["Change 4", "Change 3"]
+
+    second_page = history_crud.get_by_entity_id("ticket", 7, limit=2, before=HistoryCRUD.cursor_for(first_page[-1]))
+    assert [entry.details for entry in second_page] == ["Change 2", "Change 1"]
+
+    previous_page = history_crud.get_by_entity_id("ticket", 7, limit=2, after=HistoryCRUD.cursor_for(second_page[0]))
+    assert [entry.details for entry in previous_page] == ["Change 4", "Change 3"]
+
+    with pytest.raises(ValueError):
+        history_crud.get_by_entity_id("ticket", 7, before="not-a-cursor")
+    logger.info("Finished test_get_history_by_entity_keyset_pagination")
+
+def test_archive_and_read_across_archive(history_crud: HistoryCRUD, db_session: Session):
+    for day in range(1, 7):
+        db_session.add(History(entity_type="ticket", entity_id=1, change_type="comment", user_id=1,
+                               timestamp=datetime.datetime(2026, 1, day)))
+    db_session.commit()
+    assert history_crud.archive_watermark() is None
+
+    assert history_crud.archive(datetime.datetime(2026, 1, 4), batch_size=2) == 3
+    assert db_session.scalar(select(func.count()).select_from(History)) == 3
+    assert history_crud.archive_watermark() == datetime.datetime(2026, 1, 3)
+
+    # A recent page is served by the history table alone
+    recent = history_crud.get_by_entity_id("ticket", 1, limit=2)
+    assert [entry.timestamp.day for entry in recent] == [6, 5]
+    older = history_crud.get_by_entity_id("ticket", 1, limit=3, before=HistoryCRUD.cursor_for(recent[-1]))
+    assert [entry.timestamp.day for entry in older] == [4, 3, 2]
+    assert isinstance(older[-1], HistoryArchive)
+    newer = history_crud.get_by_entity_id("ticket", 1, limit=2, after=HistoryCRUD.cursor_for(older[-1]))
+    assert [entry.timestamp.day for entry in newer] == [4, 3]
+    assert [entry.timestamp.day for entry in history_crud.get_by_entity_id("ticket", 1, skip=2, limit=2)] == [4, 3]
+    assert history_crud.get(older[-1].id).timestamp.day == 2
+    assert len(db_session.execute(HistoryCRUD.export_query()).all()) == 6
+
+def test_archive_reads_see_entries_archived_by_another_worker(history_crud: HistoryCRUD, db_session: Session):
+    for day in range(1, 4):
+        db_session.add(History(entity_type="ticket", entity_id=1, change_type="comment", user_id=1,
+                               timestamp=datetime.datetime(2026, 1, day)))
+    db_session.commit()
+    assert history_crud.archive_watermark() is None
+    first_id = history_crud.get_by_entity_id("ticket", 1, limit=3)[-1].id
+
+    history_crud.archive(datetime.datetime(2026, 1, 3))
+    # This worker still caches the watermark from before the archive run
+    get_cache_backend().set(ARCHIVE_WATERMARK_KEY, {"watermark": None})
+    assert [entry.timestamp.day for entry in history_crud.get_by_entity_id("ticket", 1, limit=3)] == [3, 2, 1]
+    get_cache_backend().set(ARCHIVE_WATERMARK_KEY, {"watermark": None})
+    assert history_crud.get(first_id).timestamp.day == 1
+
+def test_status_changes_are_read_back_through_the_routes(client):
+    board = client.post("/api/kanbanboard/", json={"name": "Board"}).json()
+    status = client.post("/api/kanbanstatus/", json={"name": "To Do", "board_id": board["id"]}).json()
+    project = client.post("/api/projects/", json={"name": "P", "description": "D", "kanban_board_id": board["id"]}).json()
+    ticket = client.post("/api/tickets/", json={"title": "T", "description": "D", "status": "open", "priority": "low",
+                                                "project_id": project["id"], "kanban_status_id": status["id"]}).json()
+
+    response = client.put(f"/api/tickets/{ticket['id']}/status", params={"new_status": "in progress", "user_id": 1})
+    assert response.json()["status"] == "in progress"
+    response = client.put("/api/tickets/status/bulk", json={"new_status": "done", "user_id": 1, "ticket_ids": [ticket["id"]]})
+    assert response.json() == {"updated": 1}
+
+    history = client.get(f"/api/tickets/{ticket['id']}/history").json()["history"]
+    assert [entry["change_type"] for entry in history] == ["status_change", "status_change"]
+    assert client.get(f"/history/ticket/{ticket['id']}").json() == history
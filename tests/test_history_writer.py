@@ -0,0 +1,113 @@
+import json
+import time
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from app.db_models.base import History, Ticket
+from app.db_models.crud.history_writer import HistoryWriter, SpoolHistoryBuffer, set_history_writer
+from app.db_models.crud.ticket_crud import TicketCRUD
+
+@pytest.fixture
+def writer(db_session: Session):
+    writer = HistoryWriter(db_session.get_bind(), batch_size=3, flush_interval=60)
+    set_history_writer(writer)
+    yield writer
+    set_history_writer(None)
+    writer.stop()
+
+def history_count(db_session: Session) -> int:
+    return db_session.scalar(select(func.count()).select_from(History))
+
+def entry(entity_id=1):
+    return {"entity_type": "ticket", "entity_id": entity_id, "change_type": "status_change", "user_id": 1}
+
+def test_history_is_written_behind_after_commit(db_session: Session, writer: HistoryWriter):
+    db_session.add(Ticket(title="T", description="D", status="open", priority="low", project_id=1, kanban_status_id=1))
+    db_session.commit()
+    ticket_crud = TicketCRUD(db_session)
+    ticket_crud.update_status(1, "closed", user_id=1)
+    assert history_count(db_session) == 0
+    assert writer.stats()["pending"] == 1
+
+    with pytest.raises(RuntimeError):
+        with ticket_crud.session_scope():
+            ticket_crud.history_crud.record(**entry())
+            raise RuntimeError()
+    assert writer.stats()["pending"] == 1
+
+    assert writer.flush() == 1
+    assert history_count(db_session) == 1
+    assert writer.stats()["pending"] == 0
+
+def test_writer_flushes_full_batches_in_background(db_session: Session, writer: HistoryWriter):
+    writer.start()
+    writer.submit([entry(i) for i in range(3)])
+    deadline = time.monotonic() + 5
+    while writer.stats()["written"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert history_count(db_session) == 3
+    assert writer.stats()["flushes"] == 1
+
+def test_writer_spills_when_full(db_session: Session, tmp_path):
+    spill_path = tmp_path / "history.spill"
+    writer = HistoryWriter(db_session.get_bind(), max_pending=2, spill_path=str(spill_path))
+    writer.submit([entry(1), entry(2)])
+    writer.submit([entry(3)])
+    assert writer.stats()["spilled"] == 1
+    assert history_count(db_session) == 0
+    assert [json.loads(line)["entity_id"] for line in spill_path.read_text().splitlines()] == [3]
+    writer.stop()
+    assert history_count(db_session) == 2
+
+    writer = HistoryWriter(db_session.get_bind(), max_pending=0)
+    writer.submit([entry(4)])
+    assert writer.stats()["dropped"] == 1
+
+def test_transient_errors_are_retried_and_bad_batches_spilled(db_session: Session, tmp_path):
+    spill_path = tmp_path / "history.spill"
+    # No history table: every insert fails with an OperationalError, which is retried
+    writer = HistoryWriter(create_engine("sqlite://"), batch_size=2, spill_path=str(spill_path))
+    writer.submit([entry(1), entry(2)])
+    for _ in range(5):
+        assert writer.flush() == 0
+    assert writer.stats()["pending"] == 2
+    assert writer.stats()["spilled"] == 0
+    assert writer.retry_delay() > writer.flush_interval
+
+    # An entry that breaks a constraint can never be written: its batch is spilled
+    writer = HistoryWriter(db_session.get_bind(), batch_size=2, spill_path=str(spill_path))
+    writer.submit([entry(1), {**entry(2), "user_id": None}, entry(3)])
+    assert writer.flush() == 0
+    assert writer.stats()["spilled"] == 2
+    assert writer.flush() == 1
+    assert history_count(db_session) == 1
+    assert [json.loads(line)["entity_id"] for line in spill_path.read_text().splitlines()] == [1, 2]
+
+def test_spool_hands_out_batches_and_keeps_the_rest(db_session: Session, tmp_path):
+    path = str(tmp_path / "history.spool")
+    writer = HistoryWriter(create_engine("sqlite://"), SpoolHistoryBuffer(path), batch_size=2)
+    writer.submit([entry(i) for i in range(5)])
+    assert writer.flush() == 0
+    writer.buffer.close()
+
+    # The failed batch is still spooled, and is written two entries at a time
+    writer = HistoryWriter(db_session.get_bind(), SpoolHistoryBuffer(path), batch_size=2)
+    assert writer.flush() == 2
+    assert writer.stats()["pending"] == 3
+    writer.buffer.close()
+    writer = HistoryWriter(db_session.get_bind(), SpoolHistoryBuffer(path), batch_size=2)
+    assert writer.stats()["pending"] == 3
+    writer.stop()
+    assert sorted(db_session.scalars(select(History.entity_id))) == [0, 1, 2, 3, 4]
+
+def test_spooled_entries_survive_a_restart(db_session: Session, tmp_path):
+    path = str(tmp_path / "history.spool")
+    buffer = SpoolHistoryBuffer(path)
+    HistoryWriter(db_session.get_bind(), buffer).submit([entry(1), entry(2)])
+    buffer.close()
+
+    writer = HistoryWriter(db_session.get_bind(), SpoolHistoryBuffer(path))
+    assert writer.stats()["pending"] == 2
+    writer.stop()
+    assert history_count(db_session) == 2
+    assert writer.stats()["pending"] == 0
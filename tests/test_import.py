@@ -0,0 +1,74 @@
+import io
+import json
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db_models.base import History, KanbanStatus, Project, Ticket, TicketCounter
+from app.db_models.crud.import_crud import ImportCRUD
+from app.services.import_service import ImportFailed, import_records, read_records
+
+@pytest.fixture
+def board(db_session: Session):
+    db_session.add(KanbanStatus(name="To Do", board_id=1))
+    db_session.add(Project(name="A", description="A", kanban_board_id=1))
+    db_session.commit()
+
+def ndjson(records):
+    return io.BytesIO("".join(json.dumps(record) + "\n" for record in records).encode())
+
+def ticket_record(i, project_id=1):
+    return {"title": f"Ticket {i}", "description": "Test", "status": "open", "priority": "low",
+            "project_id": project_id, "kanban_status_id": 1}
+
+def test_read_records_ndjson_and_csv():
+    assert list(read_records(io.StringIO('{"a": 1}\n\n{"a": 2}\n'))) == [(1, {"a": 1}), (3, {"a": 2})]
+    assert list(read_records(io.BytesIO(b"a,b\n1,\n2,x\n"), "csv")) == [(2, {"a": "1"}), (3, {"a": "2", "b": "x"})]
+    with pytest.raises(ImportFailed) as e:
+        list(read_records(io.StringIO('{"a": 1}\n[1]\n')))
+    assert e.value.line == 2
+
+def test_import_tickets_in_chunks(db_session: Session, board):
+    result = import_records(db_session, "tickets", ndjson([ticket_record(i) for i in range(7)]), chunk_size=3)
+    assert (result.chunks, result.rows_imported, result.rows_committed) == (3, 7, 7)
+    assert db_session.scalar(select(func.count()).select_from(Ticket)) == 7
+    assert db_session.scalar(select(TicketCounter.ticket_count)) == 7
+
+def test_import_resumes_after_last_committed_chunk(db_session: Session, board):
+    records = [ticket_record(i) for i in range(7)]
+    records[4]["project_id"] = 99
+    with pytest.raises(ImportFailed) as e:
+        import_records(db_session, "tickets", ndjson(records), chunk_size=3, job="tickets")
+    assert (e.value.line, e.value.rows_committed) == (5, 3)
+    assert ImportCRUD(db_session).rows_committed("tickets") == 3
+
+    records[4]["project_id"] = 1
+    result = import_records(db_session, "tickets", ndjson(records), chunk_size=3, job="tickets")
+    assert (result.resumed_from, result.rows_imported, result.rows_committed) == (3, 4, 7)
+    titles = db_session.scalars(select(Ticket.title).order_by(Ticket.id)).all()
+    assert titles == [f"Ticket {i}" for i in range(7)]
+
+def test_import_keeps_source_ids_and_new_references(db_session: Session):
+    projects = io.StringIO("id,name,description,kanban_board_id\n10,A,First,1\n11,B,Second,1\n")
+    import_records(db_session, "projects", projects, "csv")
+    assert db_session.scalars(select(Project.id).order_by(Project.id)).all() == [10, 11]
+
+    history = [{"entity_type": "project", "entity_id": 10, "change_type": "create", "user_id": 1,
+                "id": 5, "timestamp": "2020-01-01T00:00:00"}]
+    import_records(db_session, "history", ndjson(history))
+    assert db_session.get(History, 5).timestamp.year == 2020
+
+    with pytest.raises(ImportFailed) as e:
+        import_records(db_session, "projects", ndjson([{"name": "C", "kanban_board_id": 1}]))
+    assert "description" in str(e.value)
+
+def test_import_endpoint(client):
+    client.post("/api/kanbanboard/", json={"name": "Board"})
+    body = '{"name": "A", "description": "A", "kanban_board_id": 1}\n' * 3
+    response = client.post("/api/import/projects", params={"chunk_size": 2, "job": "projects"}, content=body)
+    assert response.status_code == 200
+    assert response.json()["chunks"] == 2
+    assert client.get("/api/import/jobs/projects").json()["rows_committed"] == 3
+
+    response = client.post("/api/import/tickets", content=json.dumps(ticket_record(1, project_id=42)))
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["rows_committed"] == 0
@@ -1,7 +1,8 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.db_models.crud.kanban_board_crud import KanbanBoardCRUD
-from app.db_models.base import KanbanBoard
+from app.db_models.base import KanbanBoard, KanbanStatus, Ticket
 
 def test_create_kanban_board(db_session: Session):
     kanban_board_crud = KanbanBoardCRUD(db_session)
@@ -30,3 +31,30 @@ def test_delete_kanban_board(db_session: Session):
     kanban_board = kanban_board_crud.create(**kanban_board_data)
     kanban_board_crud.delete(kanban_board.id)
     assert kanban_board_crud.get(kanban_board.id) is None
+
+def test_get_view(db_session: Session):
+    db_session.add_all([KanbanStatus(name="To Do", board_id=1), KanbanStatus(name="Done", board_id=1)])
+    db_session.add(KanbanStatus(name="Other board", board_id=2))
+    for i in range(7):
+        db_session.add(Ticket(title=f"Ticket {i}", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1 if i < 5 else 2))
+    db_session.commit()
+    kanban_board_crud = KanbanBoardCRUD(db_session)
+
+    statements = []
+
+    def before_execute(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(clauseelement)
+
+    event.listen(db_session.get_bind(), "before_execute", before_execute)
+    try:
+        view = kanban_board_crud.get_view(1, tickets_per_column=3)
+    finally:
+        event.remove(db_session.get_bind(), "before_execute", before_execute)
+
+    assert len(statements) == 3
+    assert view["board"].id == 1
+    assert [column["status"].name for column in view["columns"]] == ["To Do", "Done"]
+    assert [[ticket.title for ticket in column["tickets"]] for column in view["columns"]] == [
+        ["Ticket 0", "Ticket 1", "Ticket 2"], ["Ticket 5", "Ticket 6"]]
+    assert [column["ticket_count"] for column in view["columns"]] == [5, 2]
+    assert kanban_board_crud.get_view(99) is None
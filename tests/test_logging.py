@@ -0,0 +1,42 @@
+import json
+from types import SimpleNamespace
+from loguru import logger
+from app.core.logging import RequestLogSampler, add_request_id, json_formatter, request_id_var, request_scope_var
+
+def record(level: str):
+    return {"level": logger.level(level)}
+
+def test_request_log_sampler_decides_once_per_request():
+    sampler = RequestLogSampler(0.0, {"/api/tickets/": 1.0})
+    assert sampler(record("INFO"))  # outside a request
+
+    scope = {"route": SimpleNamespace(path="/api/projects/")}
+    token = request_scope_var.set(scope)
+    try:
+        assert not sampler(record("INFO"))
+        assert sampler(record("ERROR"))
+        assert scope[RequestLogSampler.SCOPE_KEY] is False
+        scope.update({"route": SimpleNamespace(path="/api/tickets/"), RequestLogSampler.SCOPE_KEY: None})
+        assert sampler(record("DEBUG"))
+    finally:
+        request_scope_var.reset(token)
+
+def test_json_log_lines_carry_the_request_id():
+    lines = []
+    handler_id = logger.add(lines.append, format=json_formatter)
+    token = request_id_var.set("abc")
+    try:
+        logger.patch(add_request_id).bind(ticket_id=7).info("Hello {}", "world")
+    finally:
+        request_id_var.reset(token)
+        logger.remove(handler_id)
+    entry = json.loads(lines[0])
+    assert entry["message"] == "Hello world"
+    assert entry["request_id"] == "abc"
+    assert entry["ticket_id"] == 7
+
+def test_request_id_header(client):
+    response = client.get("/api/ping/ping")
+    assert len(response.headers["x-request-id"]) == 32
+    response = client.get("/api/ping/ping", headers={"X-Request-ID": "trace-1"})
+    assert response.headers["x-request-id"] == "trace-1"
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+from app.core.config import get_app_settings
+from app.core.metrics import Histogram, Metrics, metrics
+from app.main import app, get_application
+
+def test_histogram_buckets_are_cumulative_when_rendered():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert list(histogram.render("latency", 'route="/"')) == [
+        'latency_bucket{route="/",le="0.1"} 2',
+        'latency_bucket{route="/",le="1.0"} 3',
+        'latency_bucket{route="/",le="+Inf"} 4',
+        'latency_sum{route="/"} 3.65',
+        'latency_count{route="/"} 4',
+    ]
+
+def test_requests_are_labelled_with_their_route_template():
+    registry = Metrics()
+    registry.observe_request("GET", "/api/tickets/{id}", 200, 0.02)
+    registry.observe_request("GET", "/api/tickets/{id}", 200, 0.03)
+    registry.observe_request("GET", "/api/tickets/{id}", 500, 0.01)
+    assert set(registry.latency) == {("GET", "/api/tickets/{id}", "200"), ("GET", "/api/tickets/{id}", "500")}
+    lines = registry.render()
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/tickets/{id}",status="200"} 2' in lines
+    assert 'http_request_errors_total{method="GET",route="/api/tickets/{id}"} 1' in lines
+
+def test_metrics_endpoint():
+    settings = get_app_settings()
+    settings.metrics_enabled = True
+    try:
+        metrics_app = get_application()
+    finally:
+        settings.metrics_enabled = False
+    metrics_app.dependency_overrides = app.dependency_overrides
+    with TestClient(metrics_app) as client:
+        client.get("/api/tickets/999999")
+        client.get("/no/such/path")
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/tickets/{id}",status="404"}' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+    assert "http_requests_in_flight 1" in response.text
+    assert metrics.in_flight == 0
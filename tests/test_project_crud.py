@@ -30,3 +30,12 @@ def test_delete_project(db_session: Session):
     project = project_crud.create(**project_data)
     project_crud.delete(project.id)
     assert project_crud.get(project.id) is None
+
+def test_get_all_projects_cursor_pagination(db_session: Session):
+    project_crud = ProjectCRUD(db_session)
+    for i in range(5):
+        project_crud.create(name=f"Project {i}", description="Test Description", kanban_board_id=1)
+
+    first_page = project_crud.get_all(limit=3)
+    second_page = project_crud.get_all(limit=3, cursor=ProjectCRUD.cursor_for(first_page[-1]))
+    assert [project.name for project in second_page] == ["Project 3", "Project 4"]
@@ -0,0 +1,57 @@
+import logging
+from loguru import logger
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.api.dependencies import get_db
+from app.core.config import get_app_settings
+from app.db_models.query_stats import QueryStats, install_query_instrumentation, query_stats_var
+from app.main import get_application
+
+def test_statements_are_counted_and_slow_ones_logged_with_their_plan(caplog):
+    engine = create_engine("sqlite://")
+    install_query_instrumentation(engine, slow_query_threshold=0.0)
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    try:
+        with engine.connect() as connection, caplog.at_level(logging.WARNING, logger="app.db_models.query_stats"):
+            connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+            for i in range(3):
+                connection.execute(text("SELECT id FROM item WHERE id = :id"), {"id": i})
+    finally:
+        query_stats_var.reset(token)
+    assert stats.count == 4
+    assert stats.repeated(3) == [("SELECT id FROM item WHERE id = ?", 3)]
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert len(slow) == 4
+    assert "Parameters: (2,)" in slow[-1]
+    assert "Plan:" in slow[-1] and "item" in slow[-1].split("Plan:")[1]
+
+def test_debug_responses_carry_query_counts():
+    engine = create_engine("sqlite:///./test.db", connect_args={"check_same_thread": False})
+    install_query_instrumentation(engine, slow_query_threshold=None)
+    TestingSessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+    def override_get_db():
+        with TestingSessionLocal() as db:
+            yield db
+
+    settings = get_app_settings()
+    settings.sql_instrumentation, settings.debug, settings.sql_n_plus_one_threshold = True, True, 1
+    try:
+        app = get_application()
+    finally:
+        settings.sql_instrumentation, settings.debug, settings.sql_n_plus_one_threshold = False, False, 5
+    app.dependency_overrides[get_db] = override_get_db
+    # get_application routes stdlib logging to loguru
+    messages = []
+    handler_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        with TestClient(app) as client:
+            response = client.get("/api/projects/")
+    finally:
+        logger.remove(handler_id)
+    assert response.status_code == 200
+    assert int(response.headers["x-db-query-count"]) >= 1
+    assert float(response.headers["x-db-query-time"]) >= 0
+    assert any("Possible N+1 in GET /api/projects/" in message for message in messages)
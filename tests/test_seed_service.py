@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.orm import Session
+from app.db_models.base import Base, History, KanbanStatus, Project, Ticket, TicketCounter
+from app.services.seed_service import DatasetGenerator, DatasetSpec, Zipf, seed_dataset
+
+SPEC = DatasetSpec(boards=2, statuses_per_board=4, projects=20, tickets=2000, history=5000, batch_size=700)
+
+def test_generated_rows_are_reproducible():
+    first, second = DatasetGenerator(SPEC), DatasetGenerator(SPEC)
+    assert list(first.tickets()) == list(second.tickets())
+    assert list(first.history()) == list(second.history())
+    other_seed = DatasetGenerator(DatasetSpec(**{**SPEC.__dict__, "seed": 2}))
+    assert list(other_seed.tickets()) != list(first.tickets())
+
+def test_zipf_ranks_are_skewed():
+    rng = random.Random(1)
+    counts = Counter(Zipf(100, 1.1).rank(rng) for _ in range(10000))
+    assert set(counts) <= set(range(1, 101))
+    assert counts[1] > counts[10] > counts[100]
+    assert Counter(Zipf(4, 0).rank(rng) for _ in range(4000))[4] > 800
+
+def test_seed_dataset(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        counts = seed_dataset(db, SPEC)
+        assert counts == {"kanban_boards": 2, "kanban_statuses": 8, "projects": 20, "tickets": 2000, "history": 5000}
+        per_project = db.execute(select(Ticket.project_id, func.count()).group_by(Ticket.project_id)
+                                 .order_by(func.count().desc())).all()
+        assert per_project[0][1] > 5 * per_project[-1][1]
+        # Tickets use the statuses of their project's board
+        assert db.scalar(select(func.count()).select_from(Ticket).join(Project, Ticket.project_id == Project.id)
+                         .join(KanbanStatus, Ticket.kanban_status_id == KanbanStatus.id)
+                         .where(KanbanStatus.board_id == Project.kanban_board_id)) == 2000
+        assert db.scalar(select(func.sum(TicketCounter.ticket_count))) == 2000
+        assert db.scalar(select(func.count()).select_from(History).where(History.entity_id > 2000)) == 0
+        # Indexes and the search index are rebuilt after the load
+        assert db.scalar(text("SELECT count(*) FROM tickets_fts WHERE tickets_fts MATCH 'synthetic'")) == 2000
+        assert {index["name"] for index in inspect(engine).get_indexes("tickets")} >= {
+            index.name for index in Ticket.__table__.indexes}
+
+        # A second dataset goes after the first
+        seed_dataset(db, DatasetSpec(boards=1, projects=2, tickets=10, history=10))
+        assert db.scalar(select(func.max(Ticket.id))) == 2010
+        assert db.scalar(text("SELECT count(*) FROM tickets_fts WHERE tickets_fts MATCH 'synthetic'")) == 2010
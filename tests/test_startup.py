@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.orm import Session
+from app.core.config import get_app_settings
+from app.core.events import DEFAULT_STATUS_NAMES, create_kanban_defaults
+from app.db_models.base import History, KanbanBoard, KanbanStatus
+from alembic import command
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.schema import SchemaOutOfDate, alembic_config, current_revision, ensure_schema, head_revision
+from app.db_models.session import create_db_engine
+
+def test_schema_is_created_once_and_checked_on_restart(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    assert ensure_schema(engine) == "created"
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+    assert ensure_schema(engine) == "current"
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE alembic_version SET version_num = 'e81f4b6a2c07'"))
+    with pytest.raises(SchemaOutOfDate):
+        ensure_schema(engine)
+    assert ensure_schema(engine, auto_migrate=True) == "upgraded"
+    assert ensure_schema(engine) == "current"
+
+def test_database_created_before_migrations_is_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    # The tables create_all made before revisions were tracked, with a ticket and no alembic_version row
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "1f0e5b7c9a20")
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(text("INSERT INTO kanban_boards (id, name) VALUES (1, 'Board')"))
+        connection.execute(text("INSERT INTO kanban_statuses (id, name, board_id) VALUES (1, 'To Do', 1)"))
+        connection.execute(text("INSERT INTO projects (id, name, description, kanban_board_id) VALUES (1, 'P', 'D', 1)"))
+        connection.execute(text("INSERT INTO tickets (title, description, status, priority, project_id, kanban_status_id) "
+                                "VALUES ('Login page crashes', 'D', 'open', 'low', 1, 1)"))
+    with pytest.raises(SchemaOutOfDate):
+        ensure_schema(engine)
+    assert ensure_schema(engine, auto_migrate=True) == "upgraded"
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+        assert "ix_history_entity_timestamp" in {index["name"] for index in inspect(connection).get_indexes("history")}
+    with Session(engine) as db:
+        assert [row.Ticket.title for row in TicketCRUD(db).search("crashes")] == ["Login page crashes"]
+        assert TicketCounterCRUD(db).project_stats(1)["ticket_count"] == 1
+    engine.dispose()
+
+def test_kanban_defaults_are_only_created_when_missing(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'defaults.db'}")
+    ensure_schema(engine)
+    with Session(engine) as db:
+        assert create_kanban_defaults(db) == 1 + len(DEFAULT_STATUS_NAMES)
+        assert create_kanban_defaults(db) == 0
+        db.execute(text("DELETE FROM kanban_statuses WHERE name = 'Done'"))
+        db.commit()
+        assert create_kanban_defaults(db) == 1
+        assert db.scalar(select(func.count()).select_from(KanbanBoard)) == 1
+        assert db.scalar(select(func.count()).select_from(KanbanStatus)) == len(DEFAULT_STATUS_NAMES)
+        assert db.scalar(select(func.count()).select_from(History)) == 2 + len(DEFAULT_STATUS_NAMES)
+
+def test_archive_table_is_created_in_the_archive_database(tmp_path):
+    archive_path = tmp_path / "archive.db"
+    settings = get_app_settings().model_copy(update={"database_url": f"sqlite:///{tmp_path / 'main.db'}",
+                                                     "history_archive_path": str(archive_path)})
+    engine = create_db_engine(settings)
+    assert ensure_schema(engine) == "created"
+    with engine.connect() as connection:
+        assert not inspect(connection).has_table("history_archive")
+        assert inspect(connection).has_table("history_archive", schema="archive")
+
+    # An archive file configured later is created on a database already at the head
+    archive_path.unlink()
+    engine.dispose()
+    assert ensure_schema(engine) == "current"
+    with engine.connect() as connection:
+        assert inspect(connection).has_table("history_archive", schema="archive")
+    engine.dispose()
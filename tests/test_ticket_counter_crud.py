@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.db_models.crud.ticket_crud import TicketCRUD
+from app.db_models.crud.ticket_counter_crud import TicketCounterCRUD
+from app.db_models.base import KanbanStatus, Project, Ticket, TicketCounter
+
+def counters(db_session: Session):
+    rows = db_session.execute(select(TicketCounter.project_id, TicketCounter.kanban_status_id, TicketCounter.ticket_count)).all()
+    return {(project_id, kanban_status_id): count for project_id, kanban_status_id, count in rows if count}
+
+@pytest.fixture
+def board(db_session: Session):
+    db_session.add_all([KanbanStatus(name="To Do", board_id=1), KanbanStatus(name="Done", board_id=1)])
+    db_session.add_all([Project(name="A", description="A", kanban_board_id=1), Project(name="B", description="B", kanban_board_id=1)])
+    db_session.commit()
+
+def ticket_data(project_id=1, kanban_status_id=1):
+    return {"title": "Ticket", "description": "Test", "status": "open", "priority": "low", "project_id": project_id, "kanban_status_id": kanban_status_id}
+
+def test_counters_follow_ticket_writes(db_session: Session, board):
+    ticket_crud = TicketCRUD(db_session)
+    first = ticket_crud.create(**ticket_data())
+    ticket_crud.create(**ticket_data())
+    ticket_crud.bulk_create([ticket_data(2, 1), ticket_data(2, 2), ticket_data(2, 2)])
+    assert counters(db_session) == {(1, 1): 2, (2, 1): 1, (2, 2): 2}
+
+    ticket_crud.update(first.id, kanban_status_id=2)
+    assert counters(db_session) == {(1, 1): 1, (1, 2): 1, (2, 1): 1, (2, 2): 2}
+
+    assert ticket_crud.bulk_update_status("done", user_id=1, kanban_status_id=1, new_kanban_status_id=2) == 2
+    assert counters(db_session) == {(1, 2): 2, (2, 2): 3}
+
+    ticket_crud.delete(first.id)
+    assert counters(db_session) == {(1, 2): 1, (2, 2): 3}
+
+def test_stats(db_session: Session, board):
+    ticket_crud = TicketCRUD(db_session)
+    ticket_crud.bulk_create([ticket_data(1, 1), ticket_data(1, 2), ticket_data(1, 2), ticket_data(2, 2)])
+    counter_crud = TicketCounterCRUD(db_session)
+
+    stats = counter_crud.project_stats(1)
+    assert stats["ticket_count"] == 3
+    assert [(status["name"], status["ticket_count"]) for status in stats["statuses"]] == [("To Do", 1), ("Done", 2)]
+
+    stats = counter_crud.board_stats(1)
+    assert stats["ticket_count"] == 4
+    assert [(status["name"], status["ticket_count"]) for status in stats["statuses"]] == [("To Do", 1), ("Done", 3)]
+
+def test_rebuild(db_session: Session, board):
+    # Writes that bypass TicketCRUD leave the counters behind until they are rebuilt
+    db_session.execute(insert(Ticket), [ticket_data(1, 1), ticket_data(1, 1), ticket_data(2, 2)])
+    db_session.commit()
+    assert counters(db_session) == {}
+
+    counter_crud = TicketCounterCRUD(db_session)
+    assert counter_crud.rebuild() == 2
+    assert counters(db_session) == {(1, 1): 2, (2, 2): 1}
+
+    db_session.execute(insert(Ticket), [ticket_data(2, 1)])
+    db_session.commit()
+    assert counter_crud.rebuild(project_id=2) == 2
+    assert counters(db_session) == {(1, 1): 2, (2, 1): 1, (2, 2): 1}
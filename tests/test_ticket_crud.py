@@ -1,7 +1,9 @@
 import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from app.db_models.crud.ticket_crud import TicketCRUD
-from app.db_models.base import Ticket
+from app.db_models.base import Ticket, Project, KanbanStatus, History
 
 def test_get_all_tickets(db_session: Session):
     ticket_crud = TicketCRUD(db_session)
@@ -48,3 +50,166 @@ def test_delete_ticket(db_session: Session):
     ticket = ticket_crud.create(**ticket_data)
     ticket_crud.delete(ticket.id)
     assert ticket_crud.get(ticket.id) is None
+
+def test_get_all_tickets_cursor_pagination(db_session: Session):
+    ticket_crud = TicketCRUD(db_session)
+
+    for i in range(15):
+        ticket = Ticket(title=f"Ticket {i}", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1)
+        db_session.add(ticket)
+    db_session.commit()
+
+    first_page = ticket_crud.get_all(limit=10)
+    second_page = ticket_crud.get_all(limit=10, cursor=TicketCRUD.cursor_for(first_page[-1]))
+    assert len(second_page) == 5
+    assert second_page[0].title == "Ticket 10"
+
+    with pytest.raises(ValueError):
+        ticket_crud.get_all(cursor="not-a-cursor")
+
+def test_bulk_create_tickets(db_session: Session):
+    db_session.add_all([Project(name="Test Project", description="Test", kanban_board_id=1), KanbanStatus(name="To Do", board_id=1)])
+    db_session.commit()
+    ticket_crud = TicketCRUD(db_session)
+    tickets_data = [
+        {"title": f"Ticket {i}", "description": "Test", "status": "open", "priority": "low", "project_id": 1, "kanban_status_id": 1}
+        for i in range(25)
+    ]
+    tickets = ticket_crud.bulk_create(tickets_data)
+    assert [ticket.title for ticket in tickets] == [f"Ticket {i}" for i in range(25)]
+    assert all(ticket.id is not None and ticket.created_at is not None for ticket in tickets)
+    assert len(ticket_crud.get_all(limit=100)) == 25
+
+def test_bulk_create_tickets_unknown_reference(db_session: Session):
+    ticket_crud = TicketCRUD(db_session)
+    tickets_data = [{"title": "Ticket", "description": "Test", "status": "open", "priority": "low", "project_id": 42, "kanban_status_id": 1}]
+    with pytest.raises(ValueError):
+        ticket_crud.bulk_create(tickets_data)
+    assert ticket_crud.get_all() == []
+
+def test_bulk_update_status(db_session: Session):
+    db_session.add_all([KanbanStatus(name="To Do", board_id=1), KanbanStatus(name="Done", board_id=1)])
+    for i in range(6):
+        db_session.add(Ticket(title=f"Ticket {i}", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1 + i % 2))
+    db_session.commit()
+    ticket_crud = TicketCRUD(db_session)
+
+    updated = ticket_crud.bulk_update_status("done", user_id=7, kanban_status_id=1, new_kanban_status_id=2)
+    assert updated == 3
+    tickets = ticket_crud.get_all()
+    assert [ticket.status for ticket in tickets] == ["done", "open"] * 3
+    assert all(ticket.kanban_status_id == 2 for ticket in tickets)
+    assert len(db_session.query(History).filter(History.entity_type == "ticket", History.user_id == 7).all()) == 3
+
+    assert ticket_crud.bulk_update_status("closed", user_id=7, ticket_ids=[2, 4]) == 2
+    with pytest.raises(ValueError):
+        ticket_crud.bulk_update_status("closed", user_id=7)
+
+def test_update_status_commits_once(db_session: Session):
+    ticket_crud = TicketCRUD(db_session)
+    ticket = ticket_crud.create(title="Test Ticket", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1)
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", count_commit)
+    try:
+        updated = ticket_crud.update_status(ticket.id, "done", user_id=3)
+    finally:
+        event.remove(db_session, "after_commit", count_commit)
+
+    assert len(commits) == 1
+    assert updated.status == "done"
+    assert db_session.is_active
+    entries = db_session.query(History).filter(History.entity_type == "ticket", History.entity_id == ticket.id).all()
+    assert [entry.details for entry in entries] == ["Status changed to done"]
+
+def test_update_status_rolls_back_together(db_session: Session):
+    ticket_crud = TicketCRUD(db_session)
+    ticket = ticket_crud.create(title="Test Ticket", description="Test", status="open", priority="low", project_id=1, kanban_status_id=1)
+    with pytest.raises(SQLAlchemyError):
+        with ticket_crud.session_scope():
+            ticket_crud.update_status(ticket.id, "done", user_id=3)
+            raise SQLAlchemyError("boom")
+
+    assert ticket_crud.get(ticket.id).status == "open"
+    assert db_session.query(History).filter(History.entity_type == "ticket", History.entity_id == ticket.id).count() == 0
+
+def test_search_tickets(db_session: Session):
+    ticket_crud = TicketCRUD(db_session)
+    ticket_crud.create(title="Login page crashes", description="Users cannot log in", status="open", priority="high", project_id=1, kanban_status_id=1)
+    ticket_crud.create(title="Add logging", description="Structured logs for the API", status="open", priority="low", project_id=1, kanban_status_id=1)
+    other = ticket_crud.create(title="Dark mode", description="Theme switcher", status="open", priority="low", project_id=1, kanban_status_id=1)
+    db_session.execute(insert(Ticket), [{"title": "Crash on logout", "description": None, "status": "open", "priority": "low", "project_id": 1, "kanban_status_id": 1}])
+    db_session.commit()
+
+    rows = ticket_crud.search("crash")
+    assert sorted(row.Ticket.title for row in rows) == ["Crash on logout", "Login page crashes"]
+    assert all("<mark>" in row.snippet for row in rows)
+    assert rows[0].score >= rows[1].score
+
+    first = ticket_crud.search("log", limit=2)
+    second = ticket_crud.search("log", limit=2, cursor=TicketCRUD.search_cursor_for(first[-1]))
+    assert len(first) == 2
+    titles = [row.Ticket.title for row in first + second]
+    assert sorted(titles) == ["Add logging", "Crash on logout", "Login page crashes"]
+
+    ticket_crud.update(other.id, title="Dark mode crash")
+    assert "Dark mode crash" in [row.Ticket.title for row in ticket_crud.search("crash")]
+    ticket_crud.delete(other.id)
+    assert "Dark mode crash" not in [row.Ticket.title for row in ticket_crud.search("crash")]
+    with pytest.raises(ValueError):
+        ticket_crud.search('"*')
+
+def test_get_all_tickets_filters_and_sort(db_session: Session):
+    for i in range(12):
+        db_session.add(Ticket(title=f"Ticket {i}", description="Test", status="open" if i % 2 else "done",
+                              priority="high" if i % 3 == 0 else "low", project_id=1 + i % 2, kanban_status_id=1 + i % 4))
+    db_session.commit()
+    ticket_crud = TicketCRUD(db_session)
+
+    tickets = ticket_crud.get_all(limit=20, project_id=2, kanban_status_id=2)
+    assert [ticket.title for ticket in tickets] == ["Ticket 1", "Ticket 5", "Ticket 9"]
+    tickets = ticket_crud.get_all(limit=20, status="done", priority="high")
+    assert [ticket.title for ticket in tickets] == ["Ticket 0", "Ticket 6"]
+
+    first = ticket_crud.get_all(limit=2, project_id=1, sort="-id")
+    assert [ticket.title for ticket in first] == ["Ticket 10", "Ticket 8"]
+    second = ticket_crud.get_all(limit=2, project_id=1, sort="-id", cursor=TicketCRUD.cursor_for(first[-1], "-id"))
+    assert [ticket.title for ticket in second] == ["Ticket 6", "Ticket 4"]
+
+    ticket_crud.update(4, title="Touched")
+    first = ticket_crud.get_all(limit=1, sort="-updated_at")
+    assert [ticket.title for ticket in first] == ["Touched"]
+    second = ticket_crud.get_all(limit=1, sort="-updated_at", cursor=TicketCRUD.cursor_for(first[-1], "-updated_at"))
+    assert second[0].id != 4
+
+    with pytest.raises(ValueError):
+        ticket_crud.get_all(sort="title")
+
+@pytest.mark.parametrize("filters", [
+    {"project_id": 1},
+    {"project_id": 1, "kanban_status_id": 1},
+    {"kanban_status_id": 1},
+    {"status": "open"},
+    {"priority": "high"},
+])
+def test_get_all_tickets_filters_use_indexes(db_session: Session, filters):
+    ticket_crud = TicketCRUD(db_session)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    try:
+        ticket_crud.get_all(**filters)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", before_cursor_execute)
+
+    statement, parameters = statements[-1]
+    plan = [row[-1] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    assert any(step.startswith("SEARCH tickets USING INDEX ix_tickets_") for step in plan), plan
+    assert not any(step.startswith("SCAN tickets") for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan